@@ -0,0 +1,210 @@
+"""
+Scanner benchmark'ı: model yükleme (açılış), tahmin gecikmesi ve AST'den
+özellik çıkarma.
+
+sklearn yolu (`load_model(..., flat=False)`, joblib + predict_proba) ile düz
+dizili FlatForest yolu karşılaştırılır. Açılış süreleri her seferinde yeni
+bir Python sürecinde ölçülür (sklearn import'u dahil). Her satır sayısı için
+iki yolun olasılıklarının bire bir aynı olduğu da kontrol edilir.
+
+Özellik çıkarma, üretilmiş büyük dosyalarda CodeFeatureExtractor ile aynı
+ağaç üzerinde boş bir ast.NodeVisitor gezintisinin (özyinelemeli gezinmenin
+alt sınırı) karşılaştırılmasıyla ölçülür. Model gerekmez (`--extract-only`).
+
+Örnek:
+    python bench_scanner.py
+    python bench_scanner.py --model syntax_sherlock_model.pkl --rows 1,10,100 --repeat 200
+    python bench_scanner.py --extract-only --extract-lines 10000,100000
+"""
+import argparse
+import ast
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import scanner
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(SCRIPT_DIR, "syntax_sherlock_model.pkl")
+
+_STARTUP_SNIPPET = """
+import sys, time
+sys.path.insert(0, {dir!r})
+t = time.perf_counter()
+import scanner
+scanner.load_model({path!r}, flat={flat!r})
+print(time.perf_counter() - t)
+"""
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _startup(model_path, flat):
+    snippet = _STARTUP_SNIPPET.format(dir=SCRIPT_DIR, path=model_path, flat=flat)
+    out = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return statistics.median(samples)
+
+
+def bench_startup(model_path, runs):
+    cache_path = scanner.flat_cache_path(model_path)
+    print("\n⏱️  Açılış (yeni süreç, import + load_model), medyan:")
+    rows = []
+    rows.append(("sklearn (flat=False)", statistics.median(_startup(model_path, False) for _ in range(runs))))
+    cold = []
+    for _ in range(runs):
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        cold.append(_startup(model_path, True))
+    rows.append(("flat, önbellek yok", statistics.median(cold)))
+    rows.append(("flat, önbellekten", statistics.median(_startup(model_path, True) for _ in range(runs))))
+    for label, seconds in rows:
+        print(f"   {label:<24} {seconds * 1000:9.1f} ms")
+
+
+def bench_predict(model_path, row_counts, repeat):
+    sk = scanner.load_model(model_path, flat=False)
+    flat = scanner.load_model(model_path)
+    if flat["forest"] is None:
+        print("⚠️ Model is not a RandomForest; flat evaluator is not used.")
+        return
+    actual_model, feature_cols = scanner._resolve_model(sk)
+    patterns = scanner.reachable_patterns()
+    rng = np.random.default_rng(0)
+
+    print("\n⏱️  Çağrı başına tahmin gecikmesi, medyan:")
+    print(f"   {'satır':>6} {'sklearn':>12} {'flat':>12} {'hızlanma':>9}")
+    for n in row_counts:
+        features = patterns[rng.integers(0, len(patterns), n)]
+        X = scanner._model_input(features, feature_cols)
+        expected = actual_model.predict_proba(X)
+        if not np.array_equal(expected, flat["forest"].predict_proba(features)):
+            raise SystemExit(f"❌ FlatForest probabilities differ from sklearn for {n} rows")
+        t_sk = _timed(lambda: actual_model.predict_proba(X), max(1, repeat // 10))
+        t_flat = _timed(lambda: flat["forest"].predict_proba(features), repeat)
+        print(f"   {n:>6} {t_sk * 1000:>9.3f} ms {t_flat * 1000:>9.3f} ms {t_sk / t_flat:>8.1f}x")
+
+
+# ---- Özellik çıkarma ----
+def synthetic_source(lines, seed=0):
+    """Bölme, indeks, döngü, if/try koruması ve fonksiyonlar içeren yaklaşık `lines` satırlık kod üretir."""
+    rng = random.Random(seed)
+    names = ("a", "b", "i", "n", "total", "count", "items", "idx")
+    out = []
+
+    def expr():
+        v, w = rng.choice(names), rng.choice(names)
+        return rng.choice((
+            f"{v} / {w}", f"{v} / {rng.choice((0, 1, 2))}", f"{v}[{w}]", f"data[{rng.randint(-6, 6)}]",
+            f"({v} + {w}) / len({w})", f"{v}[{w}][{rng.randint(0, 3)}]", f"{v} * {w} + 1",
+        ))
+
+    def block(indent, depth):
+        pad = "    " * indent
+        kind = rng.randrange(8) if depth < 4 else 0
+        if kind in (0, 1):
+            out.append(f"{pad}{rng.choice(names)} = {expr()}")
+        elif kind == 2:
+            out.append(f"{pad}for {rng.choice(names)} in range(len(items)):")
+            block(indent + 1, depth + 1)
+            block(indent + 1, depth + 1)
+        elif kind == 3:
+            out.append(f"{pad}while {rng.choice(names)} > 0:")
+            block(indent + 1, depth + 1)
+        elif kind == 4:
+            v = rng.choice(names)
+            out.append(f"{pad}if {v} {rng.choice(('!= 0', '< len(items)', '> 3'))}:")
+            block(indent + 1, depth + 1)
+        elif kind == 5:
+            out.append(f"{pad}try:")
+            block(indent + 1, depth + 1)
+            out.append(f"{pad}except (ZeroDivisionError, IndexError):")
+            out.append(f"{pad}    pass")
+        elif kind == 6:
+            out.append(f"{pad}def f_{len(out)}({', '.join(rng.sample(names, 2))}):")
+            block(indent + 1, depth + 1)
+            out.append(f"{pad}    return {expr()}")
+        else:
+            out.append(f"{pad}data = [{', '.join(str(k) for k in range(rng.randrange(6)))}]")
+
+    while len(out) < lines:
+        block(0, 0)
+    return "\n".join(out) + "\n"
+
+
+def _empty_visit(tree):
+    ast.NodeVisitor().visit(tree)
+
+
+def _extract(tree):
+    extractor = scanner.CodeFeatureExtractor("<bench>")
+    extractor.visit(tree)
+    return extractor.count
+
+
+def bench_extract(line_counts, repeat):
+    print("\n⏱️  Özellik çıkarma (aynı ağaç), medyan:")
+    print(f"   {'satır':>7} {'işlem':>7} {'ast.parse':>11} {'NodeVisitor':>12} {'extractor':>11} {'oran':>6}")
+    for lines in line_counts:
+        source = synthetic_source(lines)
+        tree = ast.parse(source)
+        rows = _extract(tree)
+        runs = max(1, repeat // max(1, lines // 1000))
+        t_parse = _timed(lambda: ast.parse(source), runs)
+        t_visit = _timed(lambda: _empty_visit(tree), runs)
+        t_extract = _timed(lambda: _extract(tree), runs)
+        print(
+            f"   {lines:>7} {rows:>7} {t_parse * 1000:>8.1f} ms {t_visit * 1000:>9.1f} ms "
+            f"{t_extract * 1000:>8.1f} ms {t_visit / t_extract:>5.1f}x"
+        )
+
+    # Özyinelemeli gezinmenin RecursionError verdiği derinlikte çalışmalı.
+    chain = "x = " + " / ".join(f"v{k}" for k in range(2000)) + "\n"
+    tree = ast.parse(chain)
+    try:
+        _empty_visit(tree)
+        recursive = "tamam"
+    except RecursionError:
+        recursive = "RecursionError"
+    print(f"\n   2000 terimli bölme zinciri: NodeVisitor {recursive}, extractor {_extract(tree)} işlem")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="SyntaxSherlock scanner benchmark.")
+    parser.add_argument("--model", default=MODEL_PATH, help="eğitilmiş model dosyası (train.py çıktısı)")
+    parser.add_argument("--rows", type=_int_list, default=[1, 5, 20, 100, 1000], help="virgülle ayrılmış satır sayıları")
+    parser.add_argument("--repeat", type=int, default=100, help="ölçüm başına tekrar")
+    parser.add_argument("--startup-runs", type=int, default=3, help="açılış ölçümü başına süreç sayısı")
+    parser.add_argument("--extract-lines", type=_int_list, default=[1000, 10000, 50000], help="özellik çıkarma için üretilecek dosya boyutları (satır)")
+    parser.add_argument("--extract-only", action="store_true", help="yalnızca özellik çıkarmayı ölç (model gerekmez)")
+    args = parser.parse_args(argv)
+
+    bench_extract(args.extract_lines, args.repeat // 10 or 1)
+    if args.extract_only:
+        return
+
+    if not os.path.exists(args.model):
+        print(f"❌ {args.model} bulunamadı. Lütfen önce 'python train.py' çalıştırın.")
+        sys.exit(1)
+
+    bench_startup(args.model, args.startup_runs)
+    bench_predict(args.model, args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,124 @@
+"""
+RandomForestClassifier için düz dizili değerlendirici.
+
+Eğitilmiş ormanın tüm ağaçları tek bir düğüm uzayında birleştirilir: her
+düğüm için feature, threshold, left, right ve value dizileri. Tahmin,
+bütün ağaçlar ve örnekler için aynı anda ilerleyen vektörel bir gezinti ile
+yapılır; sklearn'ün girdi doğrulaması, joblib dağıtımı ve ağaç başına
+Python çağrıları atlanır.
+
+Sonuçlar sklearn'ün `predict_proba`'sı ile aynıdır: yaprak olasılıkları
+ağaç sırasıyla toplanıp ağaç sayısına bölünür (n_jobs=1 ile aynı sıra).
+sklearn < 1.4 `tree_.value` içinde olasılık yerine ağırlıklı sınıf
+sayılarını tutar; bu durumda yapraklar dönüştürme sırasında, sklearn'ün
+tahmin anında yaptığı gibi satır toplamına bölünür.
+
+Diziler `save` ile .npz olarak yazılabilir; `load` sklearn'ü import etmeden
+(servis açılışında en pahalı adım) ormanı geri yükler.
+"""
+import numpy as np
+
+# sklearn'de yaprak düğümlerin çocuk indeksi
+_TREE_LEAF = -1
+
+_ARRAYS = ("feature", "threshold", "left", "right", "value", "roots", "classes_")
+
+
+def _leaf_proba(value):
+    """Sınıf sayılarını (sklearn < 1.4) olasılığa çevirir; zaten olasılıksa dokunmaz."""
+    normalizer = value.sum(axis=1)[:, None]
+    if np.allclose(normalizer[normalizer != 0], 1.0):
+        return value
+    # sklearn 1.3 DecisionTreeClassifier.predict_proba ile aynı: boş satırlar 0 kalır.
+    normalizer[normalizer == 0.0] = 1.0
+    return value / normalizer
+
+
+class FlatForest:
+    def __init__(self, feature, threshold, left, right, value, roots, depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.classes_ = classes
+
+    @classmethod
+    def from_sklearn(cls, model, columns=None):
+        """
+        Eğitilmiş ormanı düz dizilere dönüştürür. `columns[i]`, modelin i.
+        özelliğinin tahmin girdisindeki sütunudur (verilmezse aynı sıra).
+        """
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("FlatForest only supports single-output forests")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        column_map = np.arange(model.n_features_in_) if columns is None else np.asarray(columns)
+        offset = 0
+        depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == _TREE_LEAF
+            # Yapraklar kendilerini gösterir ve her zaman sola gider; böylece
+            # sığ ağaçlar gezinti sonuna kadar yaprakta kalır.
+            features.append(np.where(leaf, 0, column_map[np.maximum(tree.feature, 0)]))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+            values.append(_leaf_proba(tree.value[:, 0, :]))
+            roots.append(offset)
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.array(roots, dtype=np.intp),
+            depth=depth,
+            classes=model.classes_,
+        )
+
+    def save(self, path, **extra):
+        """Dizileri (ve `extra` ile verilen ek dizileri) sıkıştırmadan .npz dosyasına yazar."""
+        arrays = {name: getattr(self, name) for name in _ARRAYS}
+        np.savez(path, depth=self.depth, **arrays, **extra)
+
+    @classmethod
+    def load(cls, path):
+        """(FlatForest, ek diziler sözlüğü) döner."""
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        forest = cls(
+            feature=arrays.pop("feature"),
+            threshold=arrays.pop("threshold"),
+            left=arrays.pop("left"),
+            right=arrays.pop("right"),
+            value=arrays.pop("value"),
+            roots=arrays.pop("roots"),
+            depth=int(arrays.pop("depth")),
+            classes=arrays.pop("classes_"),
+        )
+        return forest, arrays
+
+    def predict_proba(self, X):
+        """(n_samples, n_classes) olasılık matrisi döner."""
+        # sklearn gibi girdiyi float32'ye çevirip float64 eşiklerle karşılaştırır.
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = np.arange(n) * n_features
+        # nodes[t, i]: t. ağaçta i. örneğin bulunduğu düğüm (global indeks).
+        nodes = np.repeat(self.roots[:, None], n, axis=1)
+        for _ in range(self.depth):
+            go_left = flat_X.take(row_offsets + self.feature.take(nodes)) <= self.threshold.take(nodes)
+            nodes = np.where(go_left, self.left.take(nodes), self.right.take(nodes))
+        # Ağaç ekseni üzerinde toplama ağaç sırasıyla yapılır (sklearn'deki out += ile aynı).
+        proba = np.add.reduce(self.value[nodes], axis=0)
+        proba /= len(self.roots)
+        return proba
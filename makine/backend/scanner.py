@@ -1,15 +1,103 @@
 import ast
-import pandas as pd
+import importlib.metadata
+import numpy as np
 import joblib
 import os
+import tempfile
 import warnings
+import zipfile
+
+from flat_forest import FlatForest
 
 warnings.filterwarnings("ignore")
 
-class CodeFeatureExtractor(ast.NodeVisitor):
+# Modelin beklediği özellikler; sütun sırası train.py'deki FEATURES ile aynıdır.
+FEATURES = (
+    "is_division",
+    "is_index",
+    "inside_loop",
+    "inside_function",
+    "try_guard",
+    "divisor_is_const_zero",
+    "divisor_is_const_nonzero",
+    "divisor_is_name",
+    "divisor_is_param",
+    "divisor_is_loop_var",
+    "divisor_guarded",
+    "index_is_const",
+    "index_is_name",
+    "index_is_loop_var",
+    "index_is_param",
+    "container_is_literal",
+    "idx_oob_literal",
+    "index_guarded",
+    "index_strong_guard",
+)
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURES)}
+
+(
+    _IS_DIVISION, _IS_INDEX, _INSIDE_LOOP, _INSIDE_FUNCTION, _TRY_GUARD,
+    _DIVISOR_IS_CONST_ZERO, _DIVISOR_IS_CONST_NONZERO, _DIVISOR_IS_NAME,
+    _DIVISOR_IS_PARAM, _DIVISOR_IS_LOOP_VAR, _DIVISOR_GUARDED,
+    _INDEX_IS_CONST, _INDEX_IS_NAME, _INDEX_IS_LOOP_VAR, _INDEX_IS_PARAM,
+    _CONTAINER_IS_LITERAL, _IDX_OOB_LITERAL, _INDEX_GUARDED, _INDEX_STRONG_GUARD,
+) = range(len(FEATURES))
+
+# Desen paketleme ağırlıkları: özellik i, tamsayının i. biti.
+_BIT_WEIGHTS = 1 << np.arange(len(FEATURES), dtype=np.int32)
+
+# Sonuç etiketleri; analyze_code'da satır kodlarıyla indekslenir.
+_TYPE_LABELS = np.array(["Unknown", "Division", "Index"], dtype=object)
+_MESSAGES = np.array([
+    ", ".join(
+        ([f"KESİN ({'ZeroDivisionError' if code & 4 else 'IndexError'})"] if code & 2 else [])
+        + (["Korumasız"] if code & 1 else [])
+    )
+    for code in range(8)
+], dtype=object)
+
+# Özellik matrisi bu kadar satırla başlar, dolunca iki katına büyür.
+_INITIAL_ROWS = 64
+
+def _concrete_types(*bases):
+    types = set()
+    pending = list(bases)
+    while pending:
+        cls = pending.pop()
+        types.add(cls)
+        pending.extend(cls.__subclasses__())
+    return types
+
+
+# Altında bölme/indeks bulunamayan ve extractor durumunu değiştirmeyen düğümler;
+# gezinti bunlara hiç inmez (Name/Constant ve operatör/bağlam düğümleri ağacın çoğunu oluşturur).
+_SKIP_TYPES = frozenset(_concrete_types(
+    ast.Name, ast.Constant, ast.expr_context, ast.operator, ast.unaryop, ast.cmpop,
+    ast.boolop, ast.alias, ast.Pass, ast.Break, ast.Continue, ast.Global,
+    ast.Nonlocal, ast.Import, ast.ImportFrom,
+))
+
+
+class CodeFeatureExtractor:
+    """
+    AST'yi açık bir yığınla gezer ve her bölme/indeks işlemi için bir satır üretir.
+
+    Düğümler tiplerine göre `_enter_*` işleyicilerine sözlükle dağıtılır;
+    kapsam açan düğümler (döngü, fonksiyon, if, try) çocuklarından sonra
+    çalışacak `_leave_*` adımını yığına koyar. Ziyaret sırası ve durum
+    geçişleri ast.NodeVisitor ile aynıdır, ama özyineleme olmadığı için
+    derin iç içe kodda RecursionError oluşmaz.
+    """
+
     def __init__(self, filename):
         self.filename = filename
-        self.rows = []
+
+        # Her bölme/indeks işlemi bir satır: uint8 özellik matrisi ve paralel diziler.
+        self.count = 0
+        self.features = np.zeros((_INITIAL_ROWS, len(FEATURES)), dtype=np.uint8)
+        self.linenos = np.zeros(_INITIAL_ROWS, dtype=np.int32)
+        self.definite = np.zeros(_INITIAL_ROWS, dtype=bool)
+        self.safe = np.zeros(_INITIAL_ROWS, dtype=bool)
 
         self.inside_loop = 0
         self.inside_function = 0
@@ -21,31 +109,80 @@ class CodeFeatureExtractor(ast.NodeVisitor):
         self.loop_vars = set()
         self.function_params = set()
 
+        self._stack = []
+        self._handlers = {
+            ast.For: self._enter_For,
+            ast.While: self._enter_While,
+            ast.FunctionDef: self._enter_FunctionDef,
+            ast.If: self._enter_If,
+            ast.Try: self._enter_Try,
+            ast.Assign: self._enter_Assign,
+            ast.Subscript: self._enter_Subscript,
+            ast.BinOp: self._enter_BinOp,
+        }
 
-    def visit_For(self, node):
+    def visit(self, tree):
+        stack = self._stack
+        stack.append(tree)
+        handlers = self._handlers
+        skip = _SKIP_TYPES
+        AST = ast.AST
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+            if node_type is tuple:
+                # (_leave_* adımı, düğüm): düğümün bütün çocukları işlendi.
+                leave, node = node
+                leave(node)
+                continue
+            handler = handlers.get(node_type)
+            if handler is not None:
+                handler(node)
+
+            # Çocuklar alan sırasıyla işlensin diye yığına ters sırada konur.
+            children = []
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if type(value) is list:
+                    for item in value:
+                        if isinstance(item, AST) and type(item) not in skip:
+                            children.append(item)
+                elif isinstance(value, AST) and type(value) not in skip:
+                    children.append(value)
+            children.reverse()
+            stack.extend(children)
+
+    # ---- Kapsam açan düğümler ----
+    def _enter_For(self, node):
         self.inside_loop = 1
         if isinstance(node.target, ast.Name):
             self.loop_vars.add(node.target.id)
-        self.generic_visit(node)
+        self._stack.append((self._leave_For, node))
+
+    def _leave_For(self, node):
         if isinstance(node.target, ast.Name):
             self.loop_vars.discard(node.target.id)
         self.inside_loop = 0
 
-    def visit_While(self, node):
+    def _enter_While(self, node):
         self.inside_loop = 1
-        self.generic_visit(node)
+        self._stack.append((self._leave_While, node))
+
+    def _leave_While(self, node):
         self.inside_loop = 0
 
-    def visit_FunctionDef(self, node):
+    def _enter_FunctionDef(self, node):
         self.inside_function = 1
         for arg in node.args.args:
             self.function_params.add(arg.arg)
-        self.generic_visit(node)
+        self._stack.append((self._leave_FunctionDef, node))
+
+    def _leave_FunctionDef(self, node):
         for arg in node.args.args:
             self.function_params.discard(arg.arg)
         self.inside_function = 0
 
-    def visit_If(self, node):
+    def _enter_If(self, node):
         if isinstance(node.test, ast.Compare):
             left = node.test.left
             if (
@@ -56,7 +193,7 @@ class CodeFeatureExtractor(ast.NodeVisitor):
                 and isinstance(node.test.ops[0], ast.NotEq)
             ):
                 self.zero_guards.add(left.id)
-            
+
             if (isinstance(node.test.ops[0], (ast.Lt, ast.LtE)) and
                 isinstance(node.test.comparators[0], ast.Call) and
                 isinstance(node.test.comparators[0].func, ast.Name) and
@@ -64,286 +201,343 @@ class CodeFeatureExtractor(ast.NodeVisitor):
                 if isinstance(left, ast.Name):
                     self.len_guards.add(left.id)
 
-        self.generic_visit(node)
+        self._stack.append((self._leave_If, node))
 
+    def _leave_If(self, node):
         if isinstance(node.test, ast.Compare):
             if isinstance(node.test.left, ast.Name):
                 self.zero_guards.discard(node.test.left.id)
                 self.len_guards.discard(node.test.left.id)
 
-    def visit_Try(self, node):
+    def _enter_Try(self, node):
         self.try_guard = 1
-        self.generic_visit(node)
-        self.try_guard = 0
+        self._stack.append((self._leave_Try, node))
 
+    def _leave_Try(self, node):
+        self.try_guard = 0
 
-    def visit_Assign(self, node):
+    def _enter_Assign(self, node):
         if isinstance(node.value, ast.List):
             for t in node.targets:
                 if isinstance(t, ast.Name):
                     self.known_lists[t.id] = len(node.value.elts)
-        self.generic_visit(node)
-
 
-    def visit_Subscript(self, node):
+    def _new_row(self, kind_col, lineno):
+        """Matrise yeni bir satır ekler ve satırın (sıfırlanmış) görünümünü döner."""
+        if self.count == len(self.linenos):
+            self._grow()
+        i = self.count
+        self.count += 1
+        self.linenos[i] = lineno
+        row = self.features[i]
+        row[kind_col] = 1
+        row[_INSIDE_LOOP] = self.inside_loop
+        row[_INSIDE_FUNCTION] = self.inside_function
+        row[_TRY_GUARD] = self.try_guard
+        return row
+
+    def _grow(self):
+        capacity = 2 * len(self.linenos)
+        features = np.zeros((capacity, len(FEATURES)), dtype=np.uint8)
+        features[:self.count] = self.features[:self.count]
+        self.features = features
+        for name in ("linenos", "definite", "safe"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:self.count] = old[:self.count]
+            setattr(self, name, grown)
+
+    # ---- Satır üreten düğümler ----
+    def _enter_Subscript(self, node):
         # Index özellikleri
-        index_is_const = 0
-        index_is_name = 0
-        index_is_loop_var = 0
-        index_is_param = 0
-        container_is_literal = 0
-        idx_oob_literal = 0
-        index_guarded = 0
-        index_strong_guard = 0
-        definite_error = False
+        row = self._new_row(_IS_INDEX, node.lineno)
+        i = self.count - 1
 
         if isinstance(node.slice, ast.Constant):
-            index_is_const = 1
+            row[_INDEX_IS_CONST] = 1
         elif isinstance(node.slice, ast.Name):
             idx_name = node.slice.id
             if idx_name in self.loop_vars:
-                index_is_loop_var = 1
+                row[_INDEX_IS_LOOP_VAR] = 1
             elif idx_name in self.function_params:
-                index_is_param = 1
+                row[_INDEX_IS_PARAM] = 1
             else:
-                index_is_name = 1
-            
+                row[_INDEX_IS_NAME] = 1
+
             if idx_name in self.len_guards:
-                index_guarded = 1
-                index_strong_guard = 1
+                row[_INDEX_GUARDED] = 1
+                row[_INDEX_STRONG_GUARD] = 1
 
         if isinstance(node.value, ast.Name) and node.value.id in self.known_lists:
-            container_is_literal = 1
+            row[_CONTAINER_IS_LITERAL] = 1
             size = self.known_lists[node.value.id]
-            
+
             if isinstance(node.slice, ast.Constant):
                 idx = node.slice.value
                 if isinstance(idx, int) and (idx >= size or idx < -size):
-                    idx_oob_literal = 1
-                    definite_error = True
-
-        self.rows.append(self._make_index_row(
-            lineno=node.lineno,
-            index_is_const=index_is_const,
-            index_is_name=index_is_name,
-            index_is_loop_var=index_is_loop_var,
-            index_is_param=index_is_param,
-            container_is_literal=container_is_literal,
-            idx_oob_literal=idx_oob_literal,
-            index_guarded=index_guarded,
-            index_strong_guard=index_strong_guard,
-            definite_error=definite_error
-        ))
-
-        self.generic_visit(node)
-
-
-    def visit_BinOp(self, node):
+                    row[_IDX_OOB_LITERAL] = 1
+                    self.definite[i] = True
+
+    def _enter_BinOp(self, node):
         if isinstance(node.op, ast.Div):
             # Division özellikleri
-            divisor_is_const_zero = 0
-            divisor_is_const_nonzero = 0
-            divisor_is_name = 0
-            divisor_is_param = 0
-            divisor_is_loop_var = 0
-            divisor_guarded = 0
-            definite_error = False
-            safe = False
+            row = self._new_row(_IS_DIVISION, node.lineno)
+            i = self.count - 1
 
             if isinstance(node.right, ast.Constant):
                 if node.right.value == 0:
-                    divisor_is_const_zero = 1
-                    definite_error = True
+                    row[_DIVISOR_IS_CONST_ZERO] = 1
+                    self.definite[i] = True
                 else:
-                    divisor_is_const_nonzero = 1
-                    divisor_guarded = 1
-                    safe = True
+                    row[_DIVISOR_IS_CONST_NONZERO] = 1
+                    row[_DIVISOR_GUARDED] = 1
+                    self.safe[i] = True
             elif isinstance(node.right, ast.Name):
                 div_name = node.right.id
                 if div_name in self.loop_vars:
-                    divisor_is_loop_var = 1
+                    row[_DIVISOR_IS_LOOP_VAR] = 1
                 elif div_name in self.function_params:
-                    divisor_is_param = 1
+                    row[_DIVISOR_IS_PARAM] = 1
                 else:
-                    divisor_is_name = 1
-                
+                    row[_DIVISOR_IS_NAME] = 1
+
                 if div_name in self.zero_guards:
-                    divisor_guarded = 1
-                    safe = True
-
-            self.rows.append(self._make_division_row(
-                lineno=node.lineno,
-                divisor_is_const_zero=divisor_is_const_zero,
-                divisor_is_const_nonzero=divisor_is_const_nonzero,
-                divisor_is_name=divisor_is_name,
-                divisor_is_param=divisor_is_param,
-                divisor_is_loop_var=divisor_is_loop_var,
-                divisor_guarded=divisor_guarded,
-                definite_error=definite_error,
-                safe=safe
-            ))
-
-        self.generic_visit(node)
-
-
-    def _make_division_row(
-        self,
-        lineno,
-        divisor_is_const_zero,
-        divisor_is_const_nonzero,
-        divisor_is_name,
-        divisor_is_param,
-        divisor_is_loop_var,
-        divisor_guarded,
-        definite_error=False,
-        safe=False
-    ):
-        return {
-            "lineno": lineno,
-
-            "is_division": 1,
-            "is_index": 0,
-            "inside_loop": self.inside_loop,
-            "inside_function": self.inside_function,
-            "try_guard": self.try_guard,
-            
-            "divisor_is_const_zero": divisor_is_const_zero,
-            "divisor_is_const_nonzero": divisor_is_const_nonzero,
-            "divisor_is_name": divisor_is_name,
-            "divisor_is_param": divisor_is_param,
-            "divisor_is_loop_var": divisor_is_loop_var,
-            "divisor_guarded": divisor_guarded,
-            
-            "index_is_const": 0,
-            "index_is_name": 0,
-            "index_is_loop_var": 0,
-            "index_is_param": 0,
-            "container_is_literal": 0,
-            "idx_oob_literal": 0,
-            "index_guarded": 0,
-            "index_strong_guard": 0,
-
-            "__definite_error": definite_error,
-            "__error_type": "ZeroDivisionError" if definite_error else None,
-            "__safe": safe
-        }
+                    row[_DIVISOR_GUARDED] = 1
+                    self.safe[i] = True
+
+    def matrix(self):
+        """(özellikler, satır numaraları, kesin hata, güvenli) dizilerini dolu satırlarla döner."""
+        n = self.count
+        return self.features[:n], self.linenos[:n], self.definite[:n], self.safe[:n]
+
+def reachable_patterns():
+    """
+    Extractor'ın üretebileceği tüm özellik vektörlerini (FEATURES sırasıyla)
+    döner. Bağlam bitleri (döngü, fonksiyon, try) serbesttir; bölme ve indeks
+    özellikleri ise visit_BinOp/visit_Subscript'teki dallara göre birbirini dışlar.
+    """
+    division_options = [
+        (),
+        (_DIVISOR_IS_CONST_ZERO,),
+        (_DIVISOR_IS_CONST_NONZERO, _DIVISOR_GUARDED),
+    ]
+    index_options = []
+    for kind in (_DIVISOR_IS_NAME, _DIVISOR_IS_PARAM, _DIVISOR_IS_LOOP_VAR):
+        division_options += [(kind,), (kind, _DIVISOR_GUARDED)]
+    for literal in ((), (_CONTAINER_IS_LITERAL,)):
+        index_options += [literal, (_INDEX_IS_CONST,) + literal]
+        for kind in (_INDEX_IS_NAME, _INDEX_IS_PARAM, _INDEX_IS_LOOP_VAR):
+            index_options += [(kind,) + literal, (kind, _INDEX_GUARDED, _INDEX_STRONG_GUARD) + literal]
+    index_options.append((_INDEX_IS_CONST, _CONTAINER_IS_LITERAL, _IDX_OOB_LITERAL))
+
+    rows = []
+    for kind_col, options in ((_IS_DIVISION, division_options), (_IS_INDEX, index_options)):
+        for context in range(8):
+            for option in options:
+                row = np.zeros(len(FEATURES), dtype=np.uint8)
+                row[kind_col] = 1
+                row[_INSIDE_LOOP] = context & 1
+                row[_INSIDE_FUNCTION] = (context >> 1) & 1
+                row[_TRY_GUARD] = (context >> 2) & 1
+                row[list(option)] = 1
+                rows.append(row)
+    return np.array(rows)
+
+
+def pack_patterns(features):
+    """Her satırın 0/1 özelliklerini tek bir tamsayıya paketler (bit i = FEATURES[i])."""
+    return features.dot(_BIT_WEIGHTS)
+
+
+def _resolve_model(model):
+    """(sklearn modeli, modelin beklediği özellik sırası) döner."""
+    if isinstance(model, dict):
+        actual_model = model.get("model", model)
+        feature_cols = model.get("features", list(actual_model.feature_names_in_))
+    else:
+        actual_model = model
+        feature_cols = list(model.feature_names_in_)
+    return actual_model, feature_cols
+
+
+def _model_input(features, feature_cols):
+    columns = [FEATURE_INDEX[c] for c in feature_cols]
+    return features if columns == list(range(len(FEATURES))) else features[:, columns]
 
-    def _make_index_row(
-        self,
-        lineno,
-        index_is_const,
-        index_is_name,
-        index_is_loop_var,
-        index_is_param,
-        container_is_literal,
-        idx_oob_literal,
-        index_guarded,
-        index_strong_guard,
-        definite_error=False
-    ):
-        return {
-            "lineno": lineno,
-
-            "is_division": 0,
-            "is_index": 1,
-            "inside_loop": self.inside_loop,
-            "inside_function": self.inside_function,
-            "try_guard": self.try_guard,
-            
-            "divisor_is_const_zero": 0,
-            "divisor_is_const_nonzero": 0,
-            "divisor_is_name": 0,
-            "divisor_is_param": 0,
-            "divisor_is_loop_var": 0,
-            "divisor_guarded": 0,
-            
-            "index_is_const": index_is_const,
-            "index_is_name": index_is_name,
-            "index_is_loop_var": index_is_loop_var,
-            "index_is_param": index_is_param,
-            "container_is_literal": container_is_literal,
-            "idx_oob_literal": idx_oob_literal,
-            "index_guarded": index_guarded,
-            "index_strong_guard": index_strong_guard,
-
-            "__definite_error": definite_error,
-            "__error_type": "IndexError" if definite_error else None,
-            "__safe": False
-        }
 
-def load_model(model_path: str):
-    """Model dosyasını yükler"""
+def build_flat_forest(model):
+    """
+    Modeli extractor sütun sırasıyla çalışan bir FlatForest'a dönüştürür.
+    Model bir RandomForest değilse None döner (tahminler sklearn ile yapılır).
+    """
+    actual_model, feature_cols = _resolve_model(model)
+    if not hasattr(actual_model, "estimators_"):
+        return None
+    return FlatForest.from_sklearn(actual_model, [FEATURE_INDEX[c] for c in feature_cols])
+
+
+def _predict(model, features):
+    """Satırların pozitif sınıf (hata) olasılıklarını döner."""
+    forest = model.get("forest") if isinstance(model, dict) else None
+    if forest is not None:
+        return forest.predict_proba(features)[:, 1]
+    actual_model, feature_cols = _resolve_model(model)
+    return actual_model.predict_proba(_model_input(features, feature_cols))[:, 1]
+
+
+def build_prediction_table(model):
+    """
+    Modeli erişilebilir her desen için bir kez çalıştırır ve olasılıkları
+    paketlenmiş desen tamsayısıyla indekslenen yoğun bir tabloya yazar.
+    Erişilemeyen desenler NaN kalır; analyze_code onlar için modele düşer.
+    """
+    patterns = reachable_patterns()
+    table = np.full(1 << len(FEATURES), np.nan)
+    table[pack_patterns(patterns)] = _predict(model, patterns)
+    return table
+
+
+def flat_cache_path(model_path: str) -> str:
+    return os.path.splitext(model_path)[0] + ".flat.npz"
+
+
+def _cache_key(model_path: str):
+    """Önbelleği model dosyasına ve (yaprak değerlerinin anlamı sürüme bağlı olduğu için) sklearn sürümüne bağlar."""
+    st = os.stat(model_path)
+    try:
+        sklearn_version = importlib.metadata.version("scikit-learn")
+    except importlib.metadata.PackageNotFoundError:
+        sklearn_version = ""
+    return [st.st_size, st.st_mtime_ns], sklearn_version
+
+
+def _load_flat_cache(model_path: str):
+    """Model dosyasıyla eşleşen düz dizi önbelleği varsa {"features", "forest"} döner."""
+    cache_path = flat_cache_path(model_path)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        forest, extra = FlatForest.load(cache_path)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"⚠️ Flat model cache could not be read: {e}")
+        return None
+    source, sklearn_version = _cache_key(model_path)
+    if extra.get("source") is None or extra["source"].tolist() != source:
+        return None
+    if extra.get("sklearn") is None or extra["sklearn"].item() != sklearn_version:
+        return None
+    return {"model": None, "features": extra["features"].tolist(), "forest": forest}
+
+
+def _save_flat_cache(model_path: str, model):
+    source, sklearn_version = _cache_key(model_path)
+    cache_path = flat_cache_path(model_path)
+    try:
+        # Aynı anda açılan başka bir süreç yarım dosya okumasın diye atomik yazılır.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                model["forest"].save(
+                    f,
+                    features=np.array(model["features"]),
+                    source=np.array(source, dtype=np.int64),
+                    sklearn=np.array(sklearn_version)
+                )
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"⚠️ Flat model cache could not be written: {e}")
+
+
+def load_model(model_path: str, flat: bool = True):
+    """
+    Model dosyasını yükler; ormanı düz dizilere dönüştürür ve tahmin
+    tablosunu hazırlar. Dönen sözlük {"model", "features", "forest", "table"}
+    alanlarını taşır.
+
+    Düz diziler modelin yanına `<model>.flat.npz` olarak yazılır; model
+    dosyası değişmediği sürece sonraki yüklemeler sklearn'ü hiç import etmez
+    ("model" alanı None olur). `flat=False` eski yolu (joblib + sklearn) kullanır.
+    """
     if not os.path.exists(model_path):
         raise FileNotFoundError(f"Model file not found: {model_path}")
-    return joblib.load(model_path)
+    model = _load_flat_cache(model_path) if flat else None
+    if model is None:
+        loaded = joblib.load(model_path)
+        actual_model, feature_cols = _resolve_model(loaded)
+        model = dict(loaded) if isinstance(loaded, dict) else {}
+        model.update({"model": actual_model, "features": list(feature_cols)})
+        if flat and model.get("forest") is None:
+            model["forest"] = build_flat_forest(model)
+            if model["forest"] is not None:
+                _save_flat_cache(model_path, model)
+    if model.get("table") is None:
+        model["table"] = build_prediction_table(model)
+    return model
 
 def analyze_code(source_code: str, model):
     """
     Python kodunu analiz eder ve risk listesi döner.
-    model: joblib.load() ile yüklenmiş model (dict veya direkt model objesi)
+    model: load_model() ile yüklenmiş model (tahmin tablosu ile) ya da
+    joblib.load() ile yüklenmiş model (dict veya direkt model objesi)
     """
     try:
         tree = ast.parse(source_code)
     except SyntaxError as e:
         return [{"error": str(e), "lineno": e.lineno or 0}]
+    except RecursionError:
+        # Çok derin iç içe kodu Python'un parser'ı da ağaca çeviremez.
+        return [{"error": "Code is nested too deeply to parse", "lineno": 0}]
 
     code_lines = source_code.split('\n')
 
     extractor = CodeFeatureExtractor("<memory>")
     extractor.visit(tree)
 
-    if not extractor.rows:
+    if not extractor.count:
         return []
 
-    df = pd.DataFrame(extractor.rows)
+    features, linenos, definite, safe = extractor.matrix()
 
-    if isinstance(model, dict):
-        actual_model = model.get("model", model)
-        feature_cols = model.get("features", list(actual_model.feature_names_in_))
-    else:
-        actual_model = model
-        feature_cols = list(model.feature_names_in_)
-    
-    X = df[feature_cols]
-    probs = actual_model.predict_proba(X)[:, 1]
-
-    results = []
-
-    for i, prob in enumerate(probs):
-        row = df.iloc[i]
-        line = row["lineno"]
+    table = model.get("table") if isinstance(model, dict) else None
 
-        risk = prob
+    if table is not None:
+        probs = table[pack_patterns(features)]
+        unseen = np.isnan(probs)
+        if unseen.any():
+            probs[unseen] = _predict(model, features[unseen])
+    else:
+        probs = _predict(model, features)
 
-        if row["__definite_error"]:
-            risk = 1.0
-        elif row["__safe"]:
-            risk = 0.0
+    risks = np.where(definite, 1.0, np.where(safe, 0.0, probs))
 
-        if row["is_division"]:
-            error_type = "Division"
-        elif row["is_index"]:
-            error_type = "Index"
-        else:
-            error_type = "Unknown"
+    # Tür: 1 = bölme, 2 = indeks (ikisi de değilse 0 → "Unknown").
+    kinds = features[:, _IS_DIVISION] + 2 * features[:, _IS_INDEX]
+    types = _TYPE_LABELS[kinds]
 
-        code_snippet = code_lines[line - 1].strip() if line <= len(code_lines) else ""
+    # Mesaj kodu: bit 0 korumasız, bit 1 kesin hata, bit 2 bölme (hata türü için).
+    unprotected = (features[:, _TRY_GUARD] == 0) & ~safe
+    codes = unprotected + 2 * definite + 4 * features[:, _IS_DIVISION]
+    messages = _MESSAGES[codes]
 
-        message_parts = []
-        if row["__definite_error"]:
-            message_parts.append(f"KESİN ({row['__error_type']})")
-        if row["try_guard"] == 0 and not row["__safe"]:
-            message_parts.append("Korumasız")
-        
-        message = ", ".join(message_parts) if message_parts else ""
+    line_list = linenos.tolist()
+    snippets = {
+        line: code_lines[line - 1].strip() if line <= len(code_lines) else ""
+        for line in set(line_list)
+    }
 
-        results.append({
+    return [
+        {
             "lineno": line,
             "risk_score": risk,
             "type": error_type,
-            "code": code_snippet,
+            "code": snippets[line],
             "message": message,
-            "definite_error": row["__definite_error"]
-        })
-
-    return results
+            "definite_error": is_definite
+        }
+        for line, risk, error_type, message, is_definite in zip(
+            line_list, risks.tolist(), types.tolist(), messages.tolist(), definite.tolist()
+        )
+    ]
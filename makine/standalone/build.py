@@ -29,13 +29,14 @@ def main():
     print("🔍 SyntaxSherlock Build Script")
     print("=" * 60)
     
-    # 1. Scanner.py'yi kopyala
-    print("\n📋 Step 1: Copying scanner.py...")
-    shutil.copy(
-        os.path.join(BACKEND_DIR, "scanner.py"),
-        os.path.join(STANDALONE_DIR, "scanner.py")
-    )
-    print("✅ scanner.py copied")
+    # 1. Scanner modüllerini kopyala
+    print("\n📋 Step 1: Copying scanner.py and flat_forest.py...")
+    for module in ("scanner.py", "flat_forest.py"):
+        shutil.copy(
+            os.path.join(BACKEND_DIR, module),
+            os.path.join(STANDALONE_DIR, module)
+        )
+    print("✅ scanner modules copied")
     
     # 2. Frontend build
     print("\n📋 Step 2: Building frontend...")
@@ -83,6 +84,7 @@ def main():
         f'--icon "{os.path.join(STANDALONE_DIR, "icon.ico")}" '
         f'--add-data "static;static" '
         f'--add-data "scanner.py;." '
+        f'--add-data "flat_forest.py;." '
         f'--add-data "syntax_sherlock_model.pkl;." '
         f'--hidden-import "sklearn.ensemble._forest" '
         f'--hidden-import "sklearn.tree._classes" '
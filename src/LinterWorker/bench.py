@@ -0,0 +1,294 @@
+"""
+LinterWorker için sentetik yük üreteci ve throughput benchmark'ı.
+
+Canlı RabbitMQ gerekmez: mesajlar fake_broker üzerinden `process_message`
+(ya da pool / asyncio tüketicisi) ile işlenir. Gerçekçi bir dosya karışımı
+(boyut ve hata yoğunluğu) üretilir, her PREFETCH_COUNT / pool boyutu
+kombinasyonu için throughput ve p50/p95/p99 gecikme raporlanır.
+
+Örnek:
+    python bench.py --messages 300 --prefetch 1,8 --pool-sizes 0,2,4
+    python bench.py --mode asyncio --rate 50 --json results.json
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Benchmark tekrarlarında aynı dosyalar önbellekten ya da dedupe dizininden gelmesin;
+# sonuçlar storage'a yazılmadan event içinde kalsın.
+os.environ.setdefault("LINT_CACHE_SIZE", "0")
+os.environ.setdefault("LINT_CACHE_DIR", "")
+os.environ.setdefault("DEDUPE_DB", "")
+os.environ.setdefault("CLAIM_CHECK_BYTES", "0")
+
+import main  # noqa: E402
+from event_codec import decode_event  # noqa: E402
+from fake_broker import FakeBroker  # noqa: E402
+
+# (oran, satır aralığı) — çoğu gönderim küçük, az sayıda büyük dosya.
+SIZE_MIX = (
+    (0.6, (20, 120)),
+    (0.3, (200, 800)),
+    (0.1, (2000, 5000)),
+)
+# (oran, satır başına hata olasılığı)
+ERROR_MIX = (
+    (0.3, 0.0),
+    (0.5, 0.05),
+    (0.2, 0.4),
+)
+
+
+# ---- Sentetik dosya üretimi ----
+def _pick(rng, mix):
+    r = rng.random()
+    for share, value in mix:
+        if r < share:
+            return value
+        r -= share
+    return mix[-1][1]
+
+
+def _clean_statement(rng, i):
+    return rng.choice((
+        [f"    total_{i} = compute(value_{i % 7}, {rng.randint(0, 99)})"],
+        [f"    if value_{i % 5} > {rng.randint(0, 9)}:", f"        items.append(value_{i % 5})"],
+        [f"    result_{i} = [x * {rng.randint(1, 9)} for x in items]"],
+        [f"    for item_{i} in items:", f"        total += item_{i}"],
+    ))
+
+
+def _noisy_statement(rng, i):
+    return rng.choice((
+        [f"    total_{i}=compute(value_{i % 7},{rng.randint(0, 99)})"],
+        [f"    text_{i} = {'a' * rng.randint(80, 160)!r}"],
+        [f"    y_{i} = undefined_name_{i}   "],
+        ["    import os"],
+        [f"    if value_{i % 5}==None : items.append(1)"],
+        ["    l = [1,2,3 ]", ""],
+    ))
+
+
+def generate_source(rng, lines: int, error_rate: float) -> str:
+    """Sözdizimi geçerli, satır başına yaklaşık `error_rate` oranında ihlal içeren kaynak üretir."""
+    out = ["def compute(a, b):", "    return a + b", "", ""]
+    i = 0
+    while len(out) < lines:
+        out.append(f"def function_{i}(value_0, value_1, value_2, value_3, value_4, value_5, value_6, items):")
+        out.append("    total = 0")
+        for _ in range(rng.randint(3, 12)):
+            noisy = rng.random() < error_rate
+            out.extend(_noisy_statement(rng, i) if noisy else _clean_statement(rng, i))
+            i += 1
+        out.extend(["    return total", "", ""])
+    return "\n".join(out) + "\n"
+
+
+def generate_corpus(directory: str, count: int, seed: int = 0):
+    """`count` adet benzersiz .py dosyası üretir ve yollarını döner."""
+    rng = random.Random(seed)
+    paths = []
+    for n in range(count):
+        low, high = _pick(rng, SIZE_MIX)
+        source = generate_source(rng, rng.randint(low, high), _pick(rng, ERROR_MIX))
+        path = os.path.join(directory, f"submission_{n:05d}.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# {n}\n{source}")
+        paths.append(path)
+    return paths
+
+
+# ---- Ölçüm ----
+class TimedBroker(FakeBroker):
+    """Her `lint.completed` yayınının zamanını ve event'ini submissionId ile kaydeder."""
+
+    def __init__(self):
+        super().__init__()
+        self.completed_at = {}
+        self.events = {}
+
+    def publish(self, exchange, routing_key, body, properties=None):
+        super().publish(exchange, routing_key, body, properties)
+        if routing_key == main.OUTPUT_ROUTING_KEY:
+            event = decode_event(body, properties.content_type, properties.content_encoding)
+            self.completed_at[event["submissionId"]] = time.perf_counter()
+            self.events[event["submissionId"]] = event
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank yüzdelik."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def build_schedule(paths, rate: float = 0):
+    """
+    Dosya yollarından (gönderim anı saniyesi, submissionId, mesaj) listesi üretir.
+    `rate` mesaj/sn geliş hızıdır; 0 ise hepsi baştan kuyruktadır.
+    """
+    return [
+        (i / rate if rate else 0.0, f"bench-{i}",
+         {"SubmissionId": f"bench-{i}", "FilePath": path, "Language": "python"})
+        for i, path in enumerate(paths)
+    ]
+
+
+def _enqueue_due(broker, pending, sent_at, started):
+    """Gönderim anı gelmiş mesajları kuyruğa koyar."""
+    elapsed = time.perf_counter() - started
+    while pending and pending[0][0] <= elapsed:
+        _, submission_id, msg = pending.pop(0)
+        msg = dict(msg, SubmittedAtUtc=datetime.now(timezone.utc).isoformat())
+        sent_at[submission_id] = time.perf_counter()
+        broker.enqueue(main.INPUT_QUEUE, json.dumps(msg).encode("utf-8"))
+
+
+def _run_blocking(broker, messages, prefetch, pool_size, timeout):
+    connection = broker.connection()
+    channel = connection.channel()
+    channel.queue_declare(queue=main.INPUT_QUEUE)
+    if pool_size > 0:
+        on_message = functools.partial(main.process_message_pooled, connection)
+        main.get_lint_pool()
+    elif main.READ_AHEAD_THREADS > 0 and prefetch > 1:
+        on_message = main.ReadAheadConsumer(connection).on_message
+    else:
+        on_message = main.process_message
+    channel.basic_qos(prefetch_count=prefetch)
+    channel.basic_consume(queue=main.INPUT_QUEUE, on_message_callback=on_message, auto_ack=False)
+
+    pending = sorted(messages, key=lambda m: m[0])
+    sent_at = {}
+    started = time.perf_counter()
+    deadline = started + timeout
+    while len(broker.completed_at) < len(messages) and time.perf_counter() < deadline:
+        _enqueue_due(broker, pending, sent_at, started)
+        connection.process_data_events(time_limit=0.01)
+    return sent_at, started
+
+
+async def _run_asyncio(broker, messages, prefetch, pool_size, timeout):
+    loop = asyncio.get_running_loop()
+    connection = broker.connection(loop=loop)
+    channel = await main._amqp_call(connection.channel, callback_name="on_open_callback")
+    consumer = main.AsyncLinterConsumer(channel, main._get_lint_executor(), prefetch)
+    await consumer.start()
+
+    pending = sorted(messages, key=lambda m: m[0])
+    sent_at = {}
+    started = time.perf_counter()
+    deadline = started + timeout
+    while len(broker.completed_at) < len(messages) and time.perf_counter() < deadline:
+        _enqueue_due(broker, pending, sent_at, started)
+        # Doğrudan kuyruğa konan mesajlar için teslimatı dürt (broker publish'i bunu yapmaz).
+        channel._schedule_dispatch()
+        await asyncio.sleep(0.001)
+    await consumer.drain()
+    return sent_at, started
+
+
+def run_schedule(messages, prefetch: int, pool_size: int, mode: str = "blocking", timeout: float = 600):
+    """
+    (gönderim anı, submissionId, mesaj) listesini fake broker üzerinden worker'a
+    verir; (ölçümler, TimedBroker) döner. Yayınlanan event'ler `broker.events`'tedir.
+    """
+    main.PREFETCH_COUNT = prefetch
+    main.LINT_POOL_SIZE = pool_size
+    main._reset_lint_pool()
+    main._reset_read_ahead()
+    broker = TimedBroker()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if mode == "asyncio":
+            sent_at, started = asyncio.run(_run_asyncio(broker, messages, prefetch, pool_size, timeout))
+        else:
+            sent_at, started = _run_blocking(broker, messages, prefetch, pool_size, timeout)
+    main._reset_lint_pool()
+
+    done = broker.completed_at
+    latencies = [done[sid] - sent_at[sid] for sid in done if sid in sent_at]
+    elapsed = (max(done.values()) - started) if done else 0.0
+    return {
+        "mode": mode,
+        "prefetch": prefetch,
+        "pool_size": pool_size,
+        "messages": len(messages),
+        "completed": len(done),
+        "seconds": round(elapsed, 3),
+        "msgs_per_sec": round(len(done) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }, broker
+
+
+def run_scenario(paths, prefetch: int, pool_size: int, mode: str = "blocking",
+                 rate: float = 0, timeout: float = 600) -> dict:
+    """Tek bir ayar kombinasyonunu çalıştırır ve ölçümleri döner."""
+    result, _ = run_schedule(build_schedule(paths, rate), prefetch, pool_size, mode, timeout)
+    result["rate"] = rate
+    return result
+
+
+def _int_list(value: str):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="LinterWorker throughput benchmark (fake broker).")
+    parser.add_argument("--messages", type=int, default=200, help="scenario başına mesaj sayısı")
+    parser.add_argument("--prefetch", type=_int_list, default=[1, 8], help="virgülle ayrılmış PREFETCH_COUNT değerleri")
+    parser.add_argument("--pool-sizes", type=_int_list, default=[0, 2], help="virgülle ayrılmış LINT_POOL_SIZE değerleri")
+    parser.add_argument("--mode", choices=("blocking", "asyncio"), default="blocking")
+    parser.add_argument("--rate", type=float, default=0, help="mesaj/sn geliş hızı (0 = hepsi baştan kuyrukta)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", help="üretilmiş dosyalar yerine bu dizindeki .py dosyalarını kullan")
+    parser.add_argument("--json", dest="json_path", help="sonuçları bu dosyaya JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    workdir = None
+    if args.corpus:
+        paths = sorted(
+            os.path.join(root, name)
+            for root, _, files in os.walk(args.corpus) for name in files if name.endswith(".py")
+        )
+        paths = (paths * (args.messages // max(1, len(paths)) + 1))[:args.messages]
+    else:
+        workdir = tempfile.mkdtemp(prefix="linterworker-bench-")
+        paths = generate_corpus(workdir, args.messages, args.seed)
+
+    results = []
+    try:
+        print(f"{'mode':<9} {'prefetch':>8} {'pool':>5} {'done':>6} {'sec':>8} {'msg/s':>8} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for pool_size in args.pool_sizes:
+            for prefetch in args.prefetch:
+                r = run_scenario(paths, prefetch, pool_size, args.mode, args.rate)
+                results.append(r)
+                print(f"{r['mode']:<9} {r['prefetch']:>8} {r['pool_size']:>5} {r['completed']:>6} "
+                      f"{r['seconds']:>8} {r['msgs_per_sec']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+                      f"{r['p99_ms']:>8}")
+    finally:
+        main._reset_lint_pool()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main_cli()
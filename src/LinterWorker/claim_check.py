@@ -0,0 +1,120 @@
+"""
+Büyük lint sonuçları için claim-check.
+
+Event'in ayrıntı alanları (`results`, `issueGroups`) JSON olarak eşik
+değerini aşarsa içerik adresli bir gzip blob olarak storage altına yazılır.
+Yayınlanan event'te yalnızca özet sayaçlar ve blob'u gösteren `resultsRef`
+kalır; issue ayrıntısına ihtiyaç duyan tüketiciler `load_details` ile blob'u
+tembel olarak okur.
+
+    "resultsRef": {
+        "path": "/app/storage/lint-results/ab/ab12….json.gz",
+        "key": "ab/ab12….json.gz",
+        "sha256": "ab12…",            # sıkıştırılmamış JSON'un özeti
+        "size": 1843211,              # sıkıştırılmamış bayt
+        "contentType": "application/json",
+        "contentEncoding": "gzip"
+    }
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+RESULTS_REF = "resultsRef"
+DETAIL_FIELDS = ("results", "issueGroups")
+_SEPARATORS = (",", ":")
+# Boyut tahmini için serileştirilen en fazla issue sayısı (listeye eşit aralıklarla yayılır).
+_SAMPLE_ISSUES = 32
+
+
+class ResultStore:
+    """`directory` altında sha256 ile adreslenen, yazıldıktan sonra değişmeyen blob'lar."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def key_for(self, digest: str) -> str:
+        return f"{digest[:2]}/{digest}.json.gz"
+
+    def put(self, payload: bytes) -> dict:
+        """Payload'ı (yoksa) yazar ve `resultsRef` sözlüğünü döner."""
+        digest = hashlib.sha256(payload).hexdigest()
+        key = self.key_for(digest)
+        path = os.path.abspath(os.path.join(self.directory, key))
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Aynı volume'ü okuyan tüketiciler yarım dosya görmesin diye atomik yazılır.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(gzip.compress(payload, compresslevel=6, mtime=0))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        return {
+            "path": path,
+            "key": key,
+            "sha256": digest,
+            "size": len(payload),
+            "contentType": "application/json",
+            "contentEncoding": "gzip",
+        }
+
+
+def estimate_details_size(event: dict) -> int:
+    """
+    Ayrıntı alanlarının JSON boyutunu tahmin eder: issue'ların yalnızca bir
+    örneği serileştirilir ve ortalaması issue sayısıyla çarpılır. Böylece
+    eşiğin altında kalan (çoğu) event için liste ikinci kez serileştirilmez.
+    """
+    size = len(json.dumps(event.get("issueGroups") or [], separators=_SEPARATORS))
+    results = event.get("results") or []
+    if results:
+        step = max(1, len(results) // _SAMPLE_ISSUES)
+        sample = results[::step][:_SAMPLE_ISSUES]
+        per_issue = len(json.dumps(sample, separators=_SEPARATORS)) / len(sample)
+        size += int(per_issue * len(results))
+    return size
+
+
+def check_out(event: dict, store: ResultStore, threshold: int) -> dict:
+    """
+    Ayrıntılar (tahminen) `threshold` baytı aşarsa blob'a yazılmış ve `resultsRef` taşıyan
+    bir kopya döner; aşmıyorsa (ya da event zaten referanslıysa) event'in kendisi.
+    """
+    if not threshold or RESULTS_REF in event or estimate_details_size(event) <= threshold:
+        return event
+    details = {k: event[k] for k in DETAIL_FIELDS if k in event}
+    payload = json.dumps(details, separators=_SEPARATORS).encode("utf-8")
+    slim = {k: v for k, v in event.items() if k not in DETAIL_FIELDS}
+    slim[RESULTS_REF] = store.put(payload)
+    return slim
+
+
+def load_details(event: dict, base_dir: str = None) -> dict:
+    """
+    Event'in ayrıntı alanlarını ({"results": [...], "issueGroups": [...]}) döner.
+    Referans varsa blob okunup özeti doğrulanır. Storage tüketicide başka bir
+    yere bağlıysa `base_dir` (blob dizini) verilir ve `key` ona göre çözülür.
+    """
+    ref = event.get(RESULTS_REF)
+    if ref is None:
+        return {k: event[k] for k in DETAIL_FIELDS if k in event}
+    path = os.path.join(base_dir, ref["key"]) if base_dir else ref["path"]
+    with open(path, "rb") as f:
+        payload = gzip.decompress(f.read())
+    if hashlib.sha256(payload).hexdigest() != ref["sha256"]:
+        raise ValueError(f"Claim-check blob does not match its digest: {path}")
+    return json.loads(payload)
+
+
+def resolve(event: dict, base_dir: str = None) -> dict:
+    """Referanslı event'in ayrıntıları yerine konmuş kopyasını döner (araçlar ve testler için)."""
+    if RESULTS_REF not in event:
+        return event
+    resolved = {k: v for k, v in event.items() if k != RESULTS_REF}
+    resolved.update(load_details(event, base_dir))
+    return resolved
@@ -0,0 +1,116 @@
+"""
+Yeniden teslim edilen ve tekrar gönderilen mesajlar için kalıcı dedupe dizini.
+
+Yeniden bağlanmadan sonra ack'lenmemiş mesajlar tekrar gelir; istemci
+yeniden denemeleri de aynı submissionId'yi yeniden gönderir. Dizin,
+(submissionId, lint motoru parmak izi, dosya yolu, içerik imzası) anahtarıyla
+yayınlanmış `lint.completed` event'ini saklar; aynı anahtar tekrar gelirse
+lint yapılmadan saklanan sonuç yayınlanır.
+
+Kayıtlar sqlite'ta (WAL, synchronous=NORMAL) tutulur: container yeniden
+başlasa da korunur, aynı dosyayı kullanan süreçler (pool) arasında paylaşılır.
+Dosya yerel diskte olmalıdır; ağ dosya sistemlerinde WAL ve kilitler
+çalışmaz. Yazmalar commit başına fsync beklemez; işletim sistemi çökerse son
+kayıtlar kaybolabilir, bu da yalnızca bir mesajın yeniden lint edilmesidir. `ttl_sec`
+süresini aşan kayıtlar geçersizdir; kayıt sayısı `max_entries`'i aşarsa en
+eskiler silinir.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Süresi dolmuş/fazla kayıtlar her put'ta değil bu kadar put'ta bir temizlenir.
+_EVICT_EVERY = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outcomes (
+    key TEXT PRIMARY KEY,
+    submission_id TEXT NOT NULL,
+    created REAL NOT NULL,
+    event BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outcomes_created ON outcomes (created);
+"""
+
+
+def make_dedupe_key(*parts) -> str:
+    """Parçaları (submissionId, parmak izi, dosya yolu, içerik imzası…) tek bir özete indirger."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class DedupeIndex:
+    def __init__(self, path: str, max_entries: int = 100_000, ttl_sec: float = 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._puts = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        # fork ile kopyalanan bağlantı kullanılamaz; her süreç kendi bağlantısını açar.
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, key: str):
+        """Süresi dolmamış kayıt varsa saklanan event'i döner, yoksa None."""
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT created, event FROM outcomes WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Dedupe index lookup failed: {e}")
+            return None
+        if row is None or (self.ttl_sec and row[0] < time.time() - self.ttl_sec):
+            return None
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(self, key: str, submission_id: str, event: dict):
+        blob = zlib.compress(json.dumps(event).encode("utf-8"), 1)
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO outcomes (key, submission_id, created, event) VALUES (?, ?, ?, ?)",
+                    (key, submission_id, time.time(), blob)
+                )
+                self._puts += 1
+                if self._puts % _EVICT_EVERY == 0:
+                    self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not persist dedupe entry for {submission_id}: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        if self.ttl_sec:
+            conn.execute("DELETE FROM outcomes WHERE created < ?", (time.time() - self.ttl_sec,))
+        if self.max_entries:
+            (count,) = conn.execute("SELECT COUNT(*) FROM outcomes").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM outcomes WHERE key IN (SELECT key FROM outcomes ORDER BY created LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -0,0 +1,111 @@
+"""
+`lint.completed` event'leri için tel formatları.
+
+Varsayılan format düz JSON'dur (`application/json`). Kompakt formatta
+`results` listesi sütunlara çevrilir: dosya adı, kod, mesaj ve severity
+değerleri tek bir string tablosunda tutulur (interning), satırlar yalnızca
+bu tablodaki indeksleri taşır. Kompakt payload msgpack ile ya da gzip'li
+JSON olarak kodlanır; hangisinin kullanıldığı AMQP `content_type` /
+`content_encoding` özelliklerinden anlaşılır. Tüketiciler `decode_event`
+ile her iki formatı da olağan event sözlüğüne geri çevirebilir.
+
+`results` taşımayan event'lerde (ör. claim-check ile ayrıntısı `resultsRef`'e
+taşınmış) sütun bloğu yazılmaz; boş blok "0 issue" gibi okunurdu.
+"""
+import gzip
+import json
+
+try:
+    import msgpack
+except ImportError:  # msgpack isteğe bağlıdır; yalnızca msgpack formatı için gerekir.
+    msgpack = None
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_COMPACT_JSON = "application/vnd.linterworker.compact+json"
+CONTENT_TYPE_COMPACT_MSGPACK = "application/vnd.linterworker.compact+msgpack"
+CONTENT_TYPES = (CONTENT_TYPE_JSON, CONTENT_TYPE_COMPACT_JSON, CONTENT_TYPE_COMPACT_MSGPACK)
+
+COLUMNAR_FORMAT = "columnar-v1"
+_STRING_FIELDS = ("file", "code", "message", "severity")
+_INT_FIELDS = ("line", "column")
+
+
+def to_columnar(results) -> dict:
+    """Issue sözlüklerini string tablosu + sütun dizilerine çevirir."""
+    strings = []
+    index = {}
+    columns = {name: [] for name in _STRING_FIELDS + _INT_FIELDS}
+
+    for issue in results:
+        for name in _STRING_FIELDS:
+            value = issue.get(name) or ""
+            i = index.get(value)
+            if i is None:
+                i = index[value] = len(strings)
+                strings.append(value)
+            columns[name].append(i)
+        for name in _INT_FIELDS:
+            columns[name].append(issue.get(name) or 0)
+
+    return {"format": COLUMNAR_FORMAT, "strings": strings, **columns}
+
+
+def from_columnar(table: dict):
+    """`to_columnar` çıktısını issue sözlüklerinin listesine geri çevirir."""
+    if table.get("format") != COLUMNAR_FORMAT:
+        raise ValueError(f"Unsupported results format: {table.get('format')}")
+    strings = table["strings"]
+    string_columns = [(name, table[name]) for name in _STRING_FIELDS]
+    return [
+        {
+            **{name: strings[column[row]] for name, column in string_columns},
+            "line": table["line"][row],
+            "column": table["column"][row],
+        }
+        for row in range(len(table["code"]))
+    ]
+
+
+def check_content_type(content_type: str) -> str:
+    """Desteklenmeyen formatı ve eksik msgpack bağımlılığını erkenden bildirir."""
+    if content_type not in CONTENT_TYPES:
+        raise ValueError(f"Unsupported event content type: {content_type}")
+    if content_type == CONTENT_TYPE_COMPACT_MSGPACK and msgpack is None:
+        raise RuntimeError(f"{content_type} requires the 'msgpack' package")
+    return content_type
+
+
+def encode_event(event: dict, content_type: str = CONTENT_TYPE_JSON):
+    """
+    Event'i istenen formatta kodlar; (body, content_type, content_encoding)
+    döner. content_encoding yalnızca gzip'li JSON için "gzip"tir.
+    """
+    if content_type == CONTENT_TYPE_JSON:
+        return json.dumps(event).encode("utf-8"), content_type, None
+
+    check_content_type(content_type)
+    compact = dict(event)
+    if "results" in event:
+        compact["results"] = to_columnar(event["results"])
+    if content_type == CONTENT_TYPE_COMPACT_MSGPACK:
+        return msgpack.packb(compact, use_bin_type=True), content_type, None
+    payload = json.dumps(compact, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return gzip.compress(payload, compresslevel=1, mtime=0), content_type, "gzip"
+
+
+def decode_event(body: bytes, content_type: str = CONTENT_TYPE_JSON, content_encoding: str = None) -> dict:
+    """Herhangi bir formattaki `lint.completed` gövdesini olağan event sözlüğüne çevirir."""
+    if content_encoding == "gzip":
+        body = gzip.decompress(body)
+
+    if content_type in (None, "", CONTENT_TYPE_JSON):
+        return json.loads(body)
+
+    check_content_type(content_type)
+    if content_type == CONTENT_TYPE_COMPACT_MSGPACK:
+        event = msgpack.unpackb(body, raw=False)
+    else:
+        event = json.loads(body)
+    if "results" in event:
+        event["results"] = from_columnar(event["results"])
+    return event
@@ -0,0 +1,282 @@
+"""
+RabbitMQ yerine kullanılabilen süreç içi AMQP taklidi.
+
+Worker'ın kullandığı pika kanal/bağlantı yüzeyini (declare, qos, consume,
+publish, ack/nack, confirm, add_callback_threadsafe, call_later) canlı broker
+olmadan sağlar. Prefetch sınırı, redelivery ve publisher confirm davranışı
+gerçek broker'a benzer şekilde uygulanır; testler ve benchmark'lar için
+tasarlanmıştır.
+"""
+import itertools
+import queue
+import time
+from collections import deque
+from types import SimpleNamespace
+
+
+class FakeMessage:
+    __slots__ = ("body", "properties", "routing_key", "redelivered")
+
+    def __init__(self, body, properties=None, routing_key=""):
+        self.body = body
+        self.properties = properties
+        self.routing_key = routing_key
+        self.redelivered = False
+
+
+class FakeBroker:
+    """Kuyrukları, binding'leri ve yayınlanan mesajları tutan broker durumu."""
+
+    def __init__(self):
+        self.queues = {}
+        self.bindings = {}
+        self.published = []
+
+    def declare_queue(self, name: str):
+        return self.queues.setdefault(name, deque())
+
+    def bind(self, exchange: str, queue_name: str, routing_key: str):
+        self.declare_queue(queue_name)
+        targets = self.bindings.setdefault((exchange, routing_key), [])
+        if queue_name not in targets:
+            targets.append(queue_name)
+
+    def publish(self, exchange: str, routing_key: str, body, properties=None):
+        """Mesajı bağlı kuyruklara yönlendirir ve `published` listesine kaydeder."""
+        self.published.append(SimpleNamespace(
+            exchange=exchange, routing_key=routing_key, body=body, properties=properties
+        ))
+        for queue_name in self.bindings.get((exchange, routing_key), ()):
+            self.queues[queue_name].append(FakeMessage(body, properties, routing_key))
+
+    def enqueue(self, queue_name: str, body, properties=None):
+        """Mesajı doğrudan bir kuyruğa koyar (üretici taklidi)."""
+        self.declare_queue(queue_name).append(FakeMessage(body, properties))
+
+    def connection(self, loop=None):
+        return FakeConnection(self, loop=loop)
+
+
+class FakeChannel:
+    """
+    pika Channel/BlockingChannel yüzeyinin taklidi.
+
+    `loop` verilirse teslimatlar asyncio döngüsünde `call_soon` ile yapılır
+    (AsyncioConnection davranışı); verilmezse `FakeConnection.process_data_events`
+    çağrıldıkça yapılır (BlockingConnection davranışı).
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.broker = connection.broker
+        self.is_open = True
+        self.prefetch_count = 0
+        self.confirming = False
+        self._consumers = {}
+        self._unacked = {}
+        self._tags = itertools.count(1)
+        self._publish_seq = itertools.count(1)
+        self._confirm_callback = None
+        self._close_callbacks = []
+        self._dispatch_scheduled = False
+
+    # ---- topology ----
+    def exchange_declare(self, exchange, exchange_type="topic", durable=False, callback=None, **_):
+        self._reply(callback, SimpleNamespace(method=SimpleNamespace(NAME="Exchange.DeclareOk")))
+
+    def queue_declare(self, queue, durable=False, passive=False, callback=None, arguments=None, **_):
+        q = self.broker.declare_queue(queue)
+        frame = SimpleNamespace(method=SimpleNamespace(queue=queue, message_count=len(q), consumer_count=0))
+        return self._reply(callback, frame)
+
+    def queue_bind(self, queue, exchange, routing_key=None, callback=None, **_):
+        self.broker.bind(exchange, queue, routing_key)
+        self._reply(callback, SimpleNamespace(method=SimpleNamespace(NAME="Queue.BindOk")))
+
+    def basic_qos(self, prefetch_count=0, callback=None, **_):
+        self.prefetch_count = prefetch_count
+        self._reply(callback, SimpleNamespace(method=SimpleNamespace(NAME="Basic.QosOk")))
+
+    def confirm_delivery(self, ack_nack_callback=None, callback=None):
+        self.confirming = True
+        self._confirm_callback = ack_nack_callback
+        self._reply(callback, SimpleNamespace(method=SimpleNamespace(NAME="Confirm.SelectOk")))
+
+    def add_on_close_callback(self, callback):
+        self._close_callbacks.append(callback)
+
+    def _reply(self, callback, frame):
+        if callback is not None:
+            if self.connection.loop is not None:
+                self.connection.loop.call_soon(callback, frame)
+            else:
+                callback(frame)
+        return frame
+
+    # ---- consume / ack ----
+    def basic_consume(self, queue, on_message_callback, auto_ack=False, **_):
+        consumer_tag = f"ctag{len(self._consumers) + 1}"
+        self.broker.declare_queue(queue)
+        self._consumers[consumer_tag] = (queue, on_message_callback)
+        self._schedule_dispatch()
+        return consumer_tag
+
+    def _can_deliver(self) -> bool:
+        return self.is_open and (self.prefetch_count == 0 or len(self._unacked) < self.prefetch_count)
+
+    def _dispatch_one(self) -> bool:
+        """Prefetch izin veriyorsa tek mesaj teslim eder; teslim ettiyse True döner."""
+        if not self._can_deliver():
+            return False
+        for queue_name, callback in self._consumers.values():
+            q = self.broker.queues[queue_name]
+            if q:
+                msg = q.popleft()
+                tag = next(self._tags)
+                self._unacked[tag] = (queue_name, msg)
+                method = SimpleNamespace(
+                    delivery_tag=tag, redelivered=msg.redelivered,
+                    routing_key=msg.routing_key, consumer_tag=None
+                )
+                callback(self, method, msg.properties, msg.body)
+                return True
+        return False
+
+    def _schedule_dispatch(self):
+        loop = self.connection.loop
+        if loop is None or self._dispatch_scheduled:
+            return
+        self._dispatch_scheduled = True
+        loop.call_soon(self._async_dispatch)
+
+    def _async_dispatch(self):
+        self._dispatch_scheduled = False
+        while self._dispatch_one():
+            pass
+
+    def _settle(self, delivery_tag, multiple):
+        if multiple:
+            tags = [t for t in self._unacked if t <= delivery_tag]
+        else:
+            tags = [delivery_tag]
+        settled = []
+        for tag in tags:
+            if tag not in self._unacked:
+                raise ValueError(f"PRECONDITION_FAILED - unknown delivery tag {tag}")
+            settled.append(self._unacked.pop(tag))
+        self._schedule_dispatch()
+        return settled
+
+    def basic_ack(self, delivery_tag=0, multiple=False):
+        self._settle(delivery_tag, multiple)
+
+    def basic_nack(self, delivery_tag=0, multiple=False, requeue=True):
+        for queue_name, msg in self._settle(delivery_tag, multiple):
+            if requeue:
+                msg.redelivered = True
+                self.broker.queues[queue_name].appendleft(msg)
+
+    def basic_reject(self, delivery_tag=0, requeue=True):
+        self.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+
+    # ---- publish ----
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        self.broker.publish(exchange, routing_key, body, properties)
+        if self.confirming and self._confirm_callback is not None:
+            seq = next(self._publish_seq)
+            frame = SimpleNamespace(method=SimpleNamespace(NAME="Basic.Ack", delivery_tag=seq, multiple=False))
+            if self.connection.loop is not None:
+                self.connection.loop.call_soon(self._confirm_callback, frame)
+            else:
+                self._confirm_callback(frame)
+
+    # ---- lifecycle ----
+    @property
+    def unacked_count(self) -> int:
+        return len(self._unacked)
+
+    def close(self, reply_code=200, reply_text="Normal shutdown"):
+        """Kanalı kapatır; ack'lenmemiş mesajlar redelivered olarak kuyruğa döner."""
+        if not self.is_open:
+            return
+        self.is_open = False
+        for tag in sorted(self._unacked, reverse=True):
+            queue_name, msg = self._unacked.pop(tag)
+            msg.redelivered = True
+            self.broker.queues[queue_name].appendleft(msg)
+        for callback in self._close_callbacks:
+            callback(self, Exception(f"({reply_code}) {reply_text}"))
+
+
+class FakeConnection:
+    """pika BlockingConnection/AsyncioConnection yüzeyinin taklidi."""
+
+    def __init__(self, broker: FakeBroker, loop=None):
+        self.broker = broker
+        self.loop = loop
+        self.is_open = True
+        self._channels = []
+        self._threadsafe_callbacks = queue.SimpleQueue()
+        self._timers = []
+        self._timer_ids = itertools.count(1)
+
+    def channel(self, on_open_callback=None):
+        ch = FakeChannel(self)
+        self._channels.append(ch)
+        if on_open_callback is not None:
+            if self.loop is not None:
+                self.loop.call_soon(on_open_callback, ch)
+            else:
+                on_open_callback(ch)
+        return ch
+
+    def add_callback_threadsafe(self, callback):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(callback)
+        else:
+            self._threadsafe_callbacks.put(callback)
+
+    def call_later(self, delay, callback):
+        timer_id = next(self._timer_ids)
+        self._timers.append((time.monotonic() + delay, timer_id, callback))
+        return timer_id
+
+    def remove_timeout(self, timer_id):
+        self._timers = [t for t in self._timers if t[1] != timer_id]
+
+    def process_data_events(self, time_limit=0):
+        """
+        BlockingConnection döngüsünün bir turunu taklit eder: thread-safe
+        callback'leri ve süresi dolan zamanlayıcıları çalıştırır, sonra prefetch
+        izin verdiği kadar mesaj teslim eder. İş yapıldıysa True döner.
+        """
+        deadline = time.monotonic() + (time_limit or 0)
+        while True:
+            did_work = False
+            while True:
+                try:
+                    callback = self._threadsafe_callbacks.get_nowait()
+                except queue.Empty:
+                    break
+                callback()
+                did_work = True
+
+            now = time.monotonic()
+            due = [t for t in self._timers if t[0] <= now]
+            for t in due:
+                self._timers.remove(t)
+                t[2]()
+                did_work = True
+
+            for ch in self._channels:
+                while ch._dispatch_one():
+                    did_work = True
+
+            if did_work or time.monotonic() >= deadline:
+                return did_work
+            time.sleep(0.001)
+
+    def close(self):
+        for ch in self._channels:
+            ch.close()
+        self.is_open = False
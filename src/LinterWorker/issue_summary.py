@@ -0,0 +1,52 @@
+"""
+Çok gürültülü lint sonuçlarını özetler.
+
+Aynı dosyada aynı kod eşik değerinden fazla tekrarlanırsa yalnızca ilk
+`keep` örnek sonuçlarda bırakılır; geri kalanı sayısı ve satır aralığıyla
+tek bir grup kaydına indirgenir. Severity toplamları özetlemeden önce
+hesaplandığı için event'teki sayılar her zaman kesindir.
+"""
+
+
+def summarize_issues(results, threshold: int, keep: int):
+    """
+    (kalan issue listesi, grup listesi) döner. `threshold` 0 ise ya da hiçbir
+    (dosya, kod) çifti eşiği aşmıyorsa sonuçlar olduğu gibi döner.
+    """
+    if not threshold or len(results) <= threshold:
+        return results, []
+
+    counts = {}
+    for issue in results:
+        key = (issue.get("file"), issue.get("code"))
+        counts[key] = counts.get(key, 0) + 1
+    if all(n <= threshold for n in counts.values()):
+        return results, []
+
+    kept = []
+    groups = {}
+    for issue in results:
+        key = (issue.get("file"), issue.get("code"))
+        if counts[key] <= threshold:
+            kept.append(issue)
+            continue
+        line = issue.get("line") or 0
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                "file": issue.get("file"),
+                "code": issue.get("code"),
+                "message": issue.get("message"),
+                "severity": issue.get("severity"),
+                "count": counts[key],
+                "shown": 0,
+                "firstLine": line,
+                "lastLine": line
+            }
+        group["firstLine"] = min(group["firstLine"], line)
+        group["lastLine"] = max(group["lastLine"], line)
+        if group["shown"] < keep:
+            group["shown"] += 1
+            kept.append(issue)
+
+    return kept, list(groups.values())
@@ -0,0 +1,190 @@
+"""
+Lint işleri için CPU, duvar saati ve bellek bütçeleri.
+
+Lint, worker'ın içinde değil denetlenen uzun ömürlü bir alt süreçte çalışır.
+Alt süreç ham sonuçları buldukça pipe'a yazar; bütçe aşılırsa üst süreç
+çocuğu öldürür, o ana kadar gelen sonuçları döner ve yeni bir çocuk başlatır.
+"""
+import multiprocessing
+import resource
+import signal
+import threading
+import time
+
+from lint_engine import DEFAULT_PROFILE, LintEngine
+
+# Ham sonuçlar pipe'a tek tek değil bu boyutta ya da bu aralıkta gruplanarak gönderilir.
+_CHUNK_SIZE = 256
+_CHUNK_INTERVAL_SEC = 0.1
+
+BUDGET_WALL_TIME = "wall_time"
+BUDGET_CPU_TIME = "cpu_time"
+BUDGET_MEMORY = "memory"
+
+
+def _cpu_seconds_used() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _child_main(conn, argv, memory_mb):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    engines = {}
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        file_path, has_source, cpu_seconds, profile, timed = job
+        # İçerik iş tuple'ından ayrı, ham bayt olarak gelir (bkz. SupervisedLinter.lint).
+        source = conn.recv_bytes() if has_source else None
+        engine = engines.get(profile)
+        if engine is None:
+            engine = engines[profile] = LintEngine.for_profile(profile, argv)
+
+        if cpu_seconds:
+            # RLIMIT_CPU süreç ömrü boyunca birikir; sınır bu işin başlangıcına göre kaydırılır.
+            soft = int(_cpu_seconds_used() + cpu_seconds) + 1
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+        chunk = []
+        last_flush = time.monotonic()
+
+        def sink(result):
+            nonlocal last_flush
+            chunk.append(result)
+            now = time.monotonic()
+            if len(chunk) >= _CHUNK_SIZE or now - last_flush >= _CHUNK_INTERVAL_SEC:
+                conn.send(("results", list(chunk)))
+                chunk.clear()
+                last_flush = now
+
+        timings = {} if timed else None
+        try:
+            engine.stream_raw(file_path, sink, timings, source)
+            if chunk:
+                conn.send(("results", chunk))
+            conn.send(("done", timings or {}))
+        except MemoryError:
+            chunk.clear()
+            conn.send(("error", BUDGET_MEMORY))
+            return
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class SupervisedLinter:
+    """
+    Bütçeli lint: `lint()` (ham sonuçlar, aşılan bütçe ya da None) döner.
+
+    - wall_seconds: iş başına duvar saati; aşılırsa çocuk SIGKILL ile öldürülür.
+    - cpu_seconds: iş başına CPU süresi; RLIMIT_CPU ile çocukta uygulanır (SIGXCPU).
+    - memory_mb: çocuğun adres alanı sınırı (RLIMIT_AS).
+    """
+
+    def __init__(self, wall_seconds: float = 0, cpu_seconds: int = 0, memory_mb: int = 0, argv=()):
+        self.wall_seconds = wall_seconds
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.argv = tuple(argv)
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _ensure_child(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        self._discard_child()
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_child_main,
+            args=(child_conn, self.argv, self.memory_mb),
+            name="lint-supervised",
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+    def _discard_child(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join(timeout=5)
+            self._process = None
+
+    def _death_reason(self) -> str:
+        self._process.join(timeout=1)
+        exitcode = self._process.exitcode
+        if exitcode == -signal.SIGXCPU:
+            return BUDGET_CPU_TIME
+        if exitcode == -signal.SIGKILL and self.memory_mb:
+            # Çekirdek OOM öldürmesi de SIGKILL ile gelir.
+            return BUDGET_MEMORY
+        raise RuntimeError(f"lint child exited unexpectedly (exit code {exitcode})")
+
+    def lint(self, file_path: str, profile: str = DEFAULT_PROFILE, timings: dict = None, source=None):
+        """
+        `timings` verilirse çocuk plugin sürelerini ölçer ve iş tamamlandığında oraya eklenir.
+        `source` (bytes/mmap) verilirse içerik pipe'a tampondan doğrudan yazılır
+        (pickle'lanmaz, kopyalanmaz); çocuk dosyayı okumaz.
+        """
+        with self._lock:
+            self._ensure_child()
+            self._conn.send((file_path, source is not None, self.cpu_seconds, profile, timings is not None))
+            if source is not None:
+                self._conn.send_bytes(source)
+            deadline = time.monotonic() + self.wall_seconds if self.wall_seconds else None
+
+            raw = []
+            exceeded = None
+            try:
+                while True:
+                    timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    if not self._conn.poll(timeout):
+                        exceeded = BUDGET_WALL_TIME
+                        break
+                    try:
+                        kind, payload = self._conn.recv()
+                    except EOFError:
+                        exceeded = self._death_reason()
+                        break
+                    if kind == "results":
+                        raw.extend(payload)
+                    elif kind == "done":
+                        if timings is not None:
+                            for name, seconds in payload.items():
+                                timings[name] = timings.get(name, 0.0) + seconds
+                        break
+                    elif payload == BUDGET_MEMORY:
+                        exceeded = BUDGET_MEMORY
+                        break
+                    else:
+                        raise RuntimeError(payload)
+            except BaseException:
+                self._discard_child()
+                raise
+
+            if exceeded is not None:
+                self._discard_child()
+            return raw, exceeded
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._process is not None and self._process.is_alive():
+                try:
+                    self._conn.send(None)
+                except OSError:
+                    pass
+            self._discard_child()
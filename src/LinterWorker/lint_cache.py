@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def make_cache_key(content: bytes, fingerprint: str, file_path: str = "") -> str:
+    """
+    Dosya içeriği ve lint motorunun parmak izinden içerik adresli anahtar üretir.
+    `file_path` yalnızca sonucu dosya adına bağlı olan config'lerde (ör.
+    per-file-ignores) verilmelidir.
+    """
+    h = hashlib.sha256()
+    h.update(fingerprint.encode("utf-8"))
+    h.update(b"\0")
+    h.update(file_path.encode("utf-8"))
+    h.update(b"\0")
+    h.update(content)
+    return h.hexdigest()
+
+
+class LintResultCache:
+    """
+    İki katmanlı lint sonuç önbelleği.
+
+    1. katman süreç içi bir LRU'dur. 2. katman `directory` altında anahtar başına
+    bir JSON dosyasıdır; container yeniden başlasa da korunur ve aynı volume'ü
+    paylaşan worker'lar arasında ortaktır. Sonuçlar dosya adından bağımsız
+    saklanır, `file` alanı okuma sırasında yeniden basılır.
+    """
+
+    def __init__(self, max_entries: int = 1024, directory: str = None):
+        self.max_entries = max_entries
+        self.directory = directory or None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                if not os.access(self.directory, os.W_OK):
+                    raise PermissionError(f"{self.directory} is not writable")
+            except OSError as e:
+                # Kalıcı katman olmadan da lint devam eder; yalnızca bellek içi LRU kullanılır.
+                print(f"⚠️ Lint cache directory unavailable ({e}); using in-memory cache only")
+                self.directory = None
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _remember(self, key: str, results: list):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str, file_name: str):
+        """Önbellekte varsa sonuçları `file_name` ile damgalanmış olarak döner, yoksa None."""
+        with self._lock:
+            results = self._entries.get(key)
+            if results is not None:
+                self._entries.move_to_end(key)
+
+        if results is None and self.directory:
+            try:
+                with open(self._path_for(key), "r", encoding="utf-8") as f:
+                    results = json.load(f)
+            except (OSError, ValueError):
+                results = None
+            if results is not None:
+                self._remember(key, results)
+
+        if results is None:
+            return None
+        return [{"file": file_name, **r} for r in results]
+
+    def put(self, key: str, results: list):
+        stored = [{k: v for k, v in r.items() if k != "file"} for r in results]
+        self._remember(key, stored)
+
+        if not self.directory:
+            return
+        path = self._path_for(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Aynı volume'ü paylaşan worker'lar yarım dosya görmesin diye atomik yazılır.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not persist lint cache entry {key}: {e}")
@@ -0,0 +1,332 @@
+import codecs
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import tokenize
+
+import flake8
+from flake8 import checker
+from flake8 import processor
+from flake8.formatting.base import BaseFormatter
+from flake8.main.application import Application
+from flake8.main.options import JobsArgument
+from flake8.options.parse_args import parse_args
+
+
+# Sonucu etkilemeyen (çıktı/çalıştırma ile ilgili) seçenekler parmak izine girmez.
+_RUNTIME_OPTIONS = frozenset({
+    "verbose", "quiet", "output_file", "color", "count", "filenames", "format",
+    "show_source", "statistics", "exit_zero", "jobs", "tee", "benchmark",
+    "bug_report", "stdin_display_name",
+})
+
+# ---- Lint profilleri ----
+# Profil adı -> (ek flake8 argümanları, çalışacak checker plugin'leri; None = hepsi).
+# "fast" yalnızca pyflakes'i çalıştırır; pycodestyle/mccabe hiç yüklenmez. Sözdizimi ve
+# okuma hataları (E999/E902) plugin'den değil flake8'in kendisinden gelir; E9 seçili
+# kalmalıdır, yoksa ayrıştırılamayan dosya "sorun yok" olarak raporlanır.
+LINT_PROFILES = {
+    "fast": (("--select=F,E9",), frozenset({"F"})),
+    "standard": ((), None),
+    "full": (("--max-complexity=10", "--ignore="), None),
+}
+DEFAULT_PROFILE = "standard"
+
+# ---- SEVERITY MAPPING ----
+def classify_severity(code: str) -> str:
+    """Flake8 hata koduna göre severity seviyesi döner."""
+    if not code:
+        return "info"
+    prefix = code[0].upper()
+    if prefix in ("F", "E"):
+        return "error"
+    elif prefix == "W":
+        return "warning"
+    elif prefix == "C":
+        return "convention"
+    elif prefix == "N":
+        return "naming"
+    else:
+        return "info"
+
+
+# ---- Sonuç toplayıcı formatter ----
+class _CollectingFormatter(BaseFormatter):
+    """
+    Flake8'in style guide'ından geçen (noqa/select/ignore uygulanmış) ihlalleri
+    stdout'a yazmak yerine doğrudan worker'ın issue sözlüklerine çevirir.
+    """
+
+    def after_init(self) -> None:
+        self.issues_by_file = {}
+
+    def start(self) -> None:
+        self.issues_by_file = {}
+
+    def handle(self, error) -> None:
+        code = error.code
+        self.issues_by_file.setdefault(error.filename, []).append({
+            "file": os.path.basename(error.filename),
+            "code": code,
+            "message": error.text,
+            "line": error.line_number,
+            "column": error.column_number,
+            "severity": classify_severity(code)
+        })
+
+    def format(self, error):
+        return None
+
+    def stop(self) -> None:
+        pass
+
+
+# ---- Bellekteki kaynak için checker ----
+def _readline_from(source):
+    """`tokenize.detect_encoding` için tamponun baştan satırlarını (yalnızca o satırı kopyalayarak) döner."""
+    pos = 0
+
+    def readline():
+        nonlocal pos
+        end = source.find(b"\n", pos)
+        end = len(source) if end < 0 else end + 1
+        line = source[pos:end]
+        pos = end
+        return line
+
+    return readline
+
+
+def source_lines(source):
+    """
+    Baytları (bytes, mmap…) flake8'in dosyadan okurken yaptığı gibi
+    (PEP 263 / latin-1 yedeği, evrensel satır sonları) satırlara böler.
+    Tampon bayt olarak kopyalanmaz; doğrudan metne çözülür.
+    """
+    view = memoryview(source)
+    try:
+        encoding, _ = tokenize.detect_encoding(_readline_from(source))
+        text = codecs.decode(view, encoding)
+    except (SyntaxError, UnicodeError):
+        text = codecs.decode(view, "latin-1")
+    finally:
+        view.release()
+    return io.StringIO(text, newline=None).readlines()
+
+
+class _SourceFileChecker(checker.FileChecker):
+    """Satırlar verilmişse dosyayı diskten okumak yerine onları kontrol eder."""
+
+    def __init__(self, *, lines=None, **kwargs):
+        self._lines = lines
+        super().__init__(**kwargs)
+
+    def _make_processor(self):
+        if self._lines is None:
+            return super()._make_processor()
+        return processor.FileProcessor(self.filename, self.options, lines=self._lines)
+
+
+# ---- Akış halinde raporlayan checker ----
+class _StreamingFileChecker(_SourceFileChecker):
+    """Her ham sonucu bulunduğu anda `sink`'e de iletir (kısmi sonuçlar için)."""
+
+    def __init__(self, *, sink, **kwargs):
+        self._sink = sink
+        super().__init__(**kwargs)
+
+    def report(self, error_code, line_number, column, text):
+        code = super().report(error_code, line_number, column, text)
+        self._sink(self.results[-1])
+        return code
+
+
+# ---- Plugin süre ölçümü ----
+def _timed_plugin(plugin, engine, kind):
+    """
+    Plugin'i, motorun o anki `_timings` sözlüğüne harcanan süreyi ekleyen bir
+    sarmalayıcıyla değiştirir. Üreteç döndüren plugin'ler (pyflakes/mccabe
+    `run()`, pycodestyle) ölçüm sırasında listeye açılır; böylece süre
+    sonuçların tüketildiği yere değil plugin'e yazılır.
+    """
+    obj = plugin.obj
+    name = plugin.display_name
+
+    def run(**kwargs):
+        timings = engine._timings
+        if timings is None:
+            return obj(**kwargs)
+        started = time.perf_counter()
+        result = obj(**kwargs)
+        if kind == "tree":
+            result = list(result.run() if hasattr(result, "run") else result)
+        elif result is not None and hasattr(result, "__next__"):
+            result = list(result)
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+        return result
+
+    return plugin._replace(obj=run)
+
+
+def _prepare_checkers(checkers, engine, enabled=None):
+    """Profilde olmayan plugin'leri çıkarır, kalanları süre ölçümüyle sarar."""
+    return checkers._replace(**{
+        kind: [
+            _timed_plugin(p, engine, kind)
+            for p in getattr(checkers, kind)
+            if enabled is None or p.entry_name in enabled
+        ]
+        for kind in ("tree", "logical_line", "physical_line")
+    })
+
+
+# ---- Kalıcı lint motoru ----
+class LintEngine:
+    """
+    Flake8 application/checker API'sini süreç içinde çalıştırır.
+
+    Plugin keşfi ve seçenek ayrıştırma yalnızca bir kez yapılır; her lint
+    çağrısı önceden yüklenmiş pyflakes/pycodestyle/mccabe plugin'lerini
+    yeniden kullanır. Çağrılar bir kilit ile sıraya alınır, çünkü flake8
+    application nesnesi thread-safe değildir.
+
+    `enabled` verilirse yalnızca bu entry adlarına (F, E, W, C90…) sahip
+    checker plugin'leri çalışır. Lint metotlarına `timings` sözlüğü verilirse
+    plugin başına harcanan süre (saniye) oraya eklenir.
+    """
+
+    def __init__(self, argv=(), enabled=None):
+        self._argv = ["--exit-zero", *argv]
+        self._enabled = frozenset(enabled) if enabled is not None else None
+        self._timings = None
+        self._app = Application()
+        plugins, self._app.options = parse_args(self._argv)
+        self._app.plugins = plugins._replace(
+            checkers=_prepare_checkers(plugins.checkers, self, self._enabled)
+        )
+        self._app.formatter = _CollectingFormatter(self._app.options)
+        self._lock = threading.Lock()
+        self.fingerprint = self._make_fingerprint()
+
+    @classmethod
+    def for_profile(cls, profile: str, argv=()):
+        """LINT_PROFILES'taki profil için motor kurar."""
+        if profile not in LINT_PROFILES:
+            raise ValueError(f"Unknown lint profile: {profile}")
+        extra, enabled = LINT_PROFILES[profile]
+        return cls([*argv, *extra], enabled=enabled)
+
+    @property
+    def options(self):
+        return self._app.options
+
+    def _make_fingerprint(self) -> str:
+        """
+        Flake8/plugin sürümleri ve etkin konfigürasyondan kararlı bir özet üretir.
+        Sonuç önbelleği anahtarlarının parçasıdır; sürüm ya da config değişirse
+        eski sonuçlar kendiliğinden geçersiz olur.
+        """
+        effective = {
+            k: v for k, v in sorted(vars(self._app.options).items())
+            if k not in _RUNTIME_OPTIONS
+        }
+        payload = {
+            "flake8": flake8.__version__,
+            "plugins": self._app.plugins.versions_str(),
+            "options": effective,
+        }
+        if self._enabled is not None:
+            payload["enabled"] = sorted(self._enabled)
+        payload = json.dumps(payload, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lint_many(self, file_paths, jobs=None, timings: dict = None):
+        """
+        Birden fazla dosyayı tek bir flake8 çalıştırmasında lint eder.
+
+        `jobs` verilirse flake8'in `--jobs` çok süreçli modu bu çalıştırma için
+        kullanılır. Dönüş değeri her dosya yolu için issue listesidir.
+        Çok süreçli modda plugin süreleri alt süreçlerde kalır, `timings`e yansımaz.
+        """
+        file_paths = list(file_paths)
+        with self._lock:
+            app = self._app
+            saved_jobs = app.options.jobs
+            app.options.filenames = file_paths
+            if jobs is not None:
+                app.options.jobs = JobsArgument(str(jobs))
+            self._timings = timings
+            try:
+                # Guide her çalıştırmada yenilenir; aksi halde istatistikleri
+                # worker ömrü boyunca birikir.
+                app.make_guide()
+                app.make_file_checker_manager(self._argv)
+                app.formatter.start()
+                app.run_checks()
+                app.report_errors()
+            finally:
+                app.options.jobs = saved_jobs
+                self._timings = None
+            by_file = app.formatter.issues_by_file
+            return {path: list(by_file.get(path, [])) for path in file_paths}
+
+    def stream_raw(self, file_path: str, sink, timings: dict = None, source=None):
+        """
+        Dosyayı lint eder ve style guide uygulanmamış ham sonuçları
+        (code, line, column, text, physical_line) bulundukça `sink`'e verir.
+        Denetimli alt süreçte kısmi sonuç toplamak için kullanılır.
+        `source` verilirse dosya diskten okunmaz.
+        """
+        lines = None if source is None else source_lines(source)
+        with self._lock:
+            self._timings = timings
+            try:
+                _StreamingFileChecker(
+                    sink=sink,
+                    lines=lines,
+                    filename=file_path,
+                    plugins=self._app.plugins.checkers,
+                    options=self._app.options,
+                ).run_checks()
+            finally:
+                self._timings = None
+
+    def check_source(self, display_name: str, source, timings: dict = None):
+        """
+        Bellekteki kaynağı (satır içi içerik, mmap'li dosya, arşiv girdisi)
+        diske yazmadan/yeniden okumadan lint eder.
+        """
+        lines = source_lines(source)
+        with self._lock:
+            self._timings = timings
+            try:
+                _, raw, _ = _SourceFileChecker(
+                    lines=lines,
+                    filename=display_name,
+                    plugins=self._app.plugins.checkers,
+                    options=self._app.options,
+                ).run_checks()
+            finally:
+                self._timings = None
+        return self.report_raw(display_name, raw)
+
+    def report_raw(self, file_path: str, raw_results):
+        """Ham sonuçlara noqa/select/ignore uygular ve issue listesine çevirir."""
+        with self._lock:
+            app = self._app
+            app.make_guide()
+            app.formatter.start()
+            with app.guide.processing_file(file_path):
+                for code, line, column, text, physical_line in sorted(raw_results, key=lambda r: (r[1], r[2])):
+                    app.guide.handle_error(
+                        code=code,
+                        filename=file_path,
+                        line_number=line,
+                        column_number=column,
+                        text=text,
+                        physical_line=physical_line,
+                    )
+            return list(app.formatter.issues_by_file.get(file_path, []))
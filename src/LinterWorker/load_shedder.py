@@ -0,0 +1,72 @@
+"""
+Kuyruk gecikmesine göre uyarlanan yük atma (load shedding).
+
+Worker kendi gecikmesini iki sinyalden ölçer: mesajların `SubmittedAtUtc`'den
+bu yana geçen yaşı (üstel hareketli ortalama) ve girdi kuyruğunun passive
+declare ile okunan derinliği. Eşiklerden biri aşılınca worker "degraded"
+moda geçer ve lint'leri daha ucuz bir profille yapar; iki sinyal de eşiğin
+`recover_ratio` katının altına inince normale döner (histerezis, modun
+eşikte sürekli gidip gelmesini önler).
+"""
+import threading
+
+import metrics
+
+
+class LoadShedder:
+    def __init__(self, age_threshold_sec: float = 0, depth_threshold: int = 0,
+                 recover_ratio: float = 0.5, smoothing: float = 0.2):
+        self.age_threshold_sec = age_threshold_sec
+        self.depth_threshold = depth_threshold
+        self.recover_ratio = recover_ratio
+        self.smoothing = smoothing
+        self.age_seconds = None
+        self.queue_depth = None
+        self.degraded = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.age_threshold_sec or self.depth_threshold)
+
+    def observe_age(self, age_seconds: float):
+        """Yeni gelen mesajın yaşını ortalamaya katar."""
+        if not self.age_threshold_sec:
+            return
+        with self._lock:
+            if self.age_seconds is None:
+                self.age_seconds = age_seconds
+            else:
+                self.age_seconds += self.smoothing * (age_seconds - self.age_seconds)
+            self._update()
+
+    def observe_depth(self, depth: int):
+        """Passive declare'den okunan kuyruk derinliğini kaydeder."""
+        metrics.QUEUE_DEPTH.set(depth)
+        if not self.depth_threshold:
+            return
+        with self._lock:
+            self.queue_depth = depth
+            self._update()
+
+    def _over(self, value, threshold, ratio=1.0) -> bool:
+        return bool(threshold) and value is not None and value > threshold * ratio
+
+    def _describe(self) -> str:
+        age = "-" if self.age_seconds is None else f"{self.age_seconds:.1f}s"
+        depth = "-" if self.queue_depth is None else self.queue_depth
+        return f"age: {age}, queue depth: {depth}"
+
+    def _update(self):
+        age_over = self._over(self.age_seconds, self.age_threshold_sec)
+        depth_over = self._over(self.queue_depth, self.depth_threshold)
+        if not self.degraded and (age_over or depth_over):
+            self.degraded = True
+            print(f"🐢 Load shedding ON ({self._describe()})")
+        elif self.degraded and not (
+            self._over(self.age_seconds, self.age_threshold_sec, self.recover_ratio)
+            or self._over(self.queue_depth, self.depth_threshold, self.recover_ratio)
+        ):
+            self.degraded = False
+            print(f"🐇 Load shedding OFF ({self._describe()})")
+        metrics.LOAD_SHEDDING.set(1 if self.degraded else 0)
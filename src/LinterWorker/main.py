@@ -3,9 +3,33 @@ import json
 import time
 import signal
 import sys
+import functools
+import hashlib
+import contextlib
+import random
+from collections import deque
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
-import subprocess
 import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+
+from claim_check import ResultStore, check_out
+from dedupe_index import DedupeIndex, make_dedupe_key
+from event_codec import check_content_type, encode_event
+from lint_cache import LintResultCache, make_cache_key
+from lint_budget import SupervisedLinter
+from issue_summary import summarize_issues
+from lanes import LANE_BULK, LANE_INTERACTIVE, WeightedLanes, classify_submission
+from lint_engine import LINT_PROFILES, LintEngine
+from load_shedder import LoadShedder
+from read_ahead import ReadAhead
+import metrics
+from publisher import ConfirmedPublisher, MultiAckTracker
+from submission_sources import (
+    ARCHIVE_SUFFIXES, decode_inline, is_multi_file, iter_sources, open_source, source_signature
+)
 
 # ---- Anında log çıktısı ----
 sys.stdout.reconfigure(line_buffering=True)
@@ -23,9 +47,118 @@ INPUT_QUEUE = os.getenv("INPUT_QUEUE", "linterworker.code.submitted")
 
 OUTPUT_EXCHANGE = os.getenv("OUTPUT_EXCHANGE", "code.events")
 OUTPUT_ROUTING_KEY = os.getenv("OUTPUT_ROUTING_KEY", "lint.completed")
+# lint.completed tel formatı: application/json (varsayılan) ya da event_codec'teki
+# kompakt sütunlu formatlar (...compact+json gzip'li / ...compact+msgpack).
+EVENT_CONTENT_TYPE = os.getenv("EVENT_CONTENT_TYPE", "application/json")
 
 PREFETCH_COUNT = int(os.getenv("PREFETCH_COUNT", "1"))
+
+# Öncelik şeritleri: mesajlar etkileşimli / toplu şeritlere ayrılır ve lint işleri
+# ağırlıklı round-robin ile seçilir. LANE_PREFETCH kadar mesaj tamponlanır ki küçük
+# gönderimler büyüklerin önüne geçebilsin. INTERACTIVE_QUEUE verilirse o kuyruktan
+# gelenler (INTERACTIVE_ROUTING_KEY ile bağlı) doğrudan etkileşimli şeride girer.
+PRIORITY_LANES = os.getenv("PRIORITY_LANES", "false").lower() in ("1", "true", "yes")
+LANE_PREFETCH = int(os.getenv("LANE_PREFETCH", "32"))
+INTERACTIVE_WEIGHT = int(os.getenv("INTERACTIVE_WEIGHT", "4"))
+BULK_WEIGHT = int(os.getenv("BULK_WEIGHT", "1"))
+INTERACTIVE_MAX_BYTES = int(os.getenv("INTERACTIVE_MAX_BYTES", str(64 * 1024)))
+INTERACTIVE_QUEUE = os.getenv("INTERACTIVE_QUEUE", "")
+INTERACTIVE_ROUTING_KEY = os.getenv("INTERACTIVE_ROUTING_KEY", "code.submitted.interactive")
+# "blocking": pika BlockingConnection; "asyncio": AsyncioConnection + executor.
+WORKER_MODE = os.getenv("WORKER_MODE", "blocking").lower()
 RETRY_DELAY_SEC = int(os.getenv("RETRY_DELAY_SEC", "5"))
+# 0: lint mesaj callback'i içinde yapılır; >0: bu kadar süreçlik havuzda yapılır.
+LINT_POOL_SIZE = int(os.getenv("LINT_POOL_SIZE", "0"))
+
+# Publisher confirm: lint.completed yayınlarının broker tarafından onaylanmasını bekler.
+# asyncio modunda confirm'ler boru hattı şeklinde toplanır ve girdiler CONFIRM_FLUSH_MS'de
+# bir (ya da CONFIRM_MAX_PENDING onay birikince) ack'lenir. "auto" (varsayılan) yalnızca
+# asyncio modunda açar: BlockingChannel'da her basic_publish kendi confirm'ini senkron
+# beklediği için blocking modda açıkça "true" verilmelidir.
+PUBLISHER_CONFIRMS = os.getenv("PUBLISHER_CONFIRMS", "auto").lower()
+CONFIRM_FLUSH_MS = int(os.getenv("CONFIRM_FLUSH_MS", "50"))
+CONFIRM_MAX_PENDING = int(os.getenv("CONFIRM_MAX_PENDING", "64"))
+
+# Mikro-batch modu (BATCH_SIZE > 1): en fazla BATCH_SIZE mesaj ya da BATCH_WINDOW_MS
+# kadar bekleyip tek flake8 çalıştırmasında BATCH_JOBS süreçle lint eder.
+# Açıkken LINT_POOL_SIZE yok sayılır.
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "0"))
+BATCH_WINDOW_MS = int(os.getenv("BATCH_WINDOW_MS", "200"))
+BATCH_JOBS = os.getenv("BATCH_JOBS", "auto")
+
+# İş başına lint bütçeleri (0 = sınırsız). Herhangi biri açıksa lint denetlenen bir alt
+# süreçte çalışır; bütçe aşılırsa o ana kadarki sonuçlarla kısmi event yayınlanır.
+# Mikro-batch modu tek flake8 çalıştırması kullandığı için bu bütçelere tabi değildir.
+LINT_TIMEOUT_SEC = float(os.getenv("LINT_TIMEOUT_SEC", "0"))
+LINT_CPU_SEC = int(os.getenv("LINT_CPU_SEC", "0"))
+LINT_MEMORY_MB = int(os.getenv("LINT_MEMORY_MB", "0"))
+
+# /metrics uç noktasının portu (0 = kapalı). Varsayılan kapalıdır; Docker imajı 9100'ü açar.
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+# Plugin başına süre ölçümü yapılan lint oranı (0 = kapalı, 1 = her lint). Ölçülen lint'te
+# plugin üreteçleri listeye açılıp zamanlanır; bu ek maliyet yüzünden örnekleme önerilir.
+PLUGIN_TIMING_RATE = float(os.getenv("PLUGIN_TIMING_RATE", "0"))
+
+# Sonuç önbelleği: bellek içi LRU kapasitesi ve kalıcı katman dizini (boş = kapalı).
+LINT_CACHE_SIZE = int(os.getenv("LINT_CACHE_SIZE", "1024"))
+LINT_CACHE_DIR = os.getenv("LINT_CACHE_DIR", os.path.join("storage", ".lint-cache"))
+
+# Mesajda `LintProfile` yoksa kullanılacak profil (fast | standard | full).
+LINT_PROFILE = os.getenv("LINT_PROFILE", "standard")
+
+# Yük atma: ortalama mesaj yaşı SHED_AGE_SEC'i ya da kuyruk derinliği SHED_QUEUE_DEPTH'i
+# aşarsa lint'ler SHED_PROFILE ile yapılır ve event `degraded` işaretlenir (0 = kapalı).
+# Ucuz profil yalnızca stil kontrollerini azaltır; sözdizimi hataları (E999) yine raporlanır.
+# Kuyruk derinliği SHED_PROBE_SEC saniyede bir passive declare ile okunur.
+SHED_AGE_SEC = float(os.getenv("SHED_AGE_SEC", "0"))
+SHED_QUEUE_DEPTH = int(os.getenv("SHED_QUEUE_DEPTH", "0"))
+SHED_PROFILE = os.getenv("SHED_PROFILE", "fast")
+SHED_PROBE_SEC = float(os.getenv("SHED_PROBE_SEC", "5"))
+
+# Gürültülü sonuçlar: aynı dosyada bir kod ISSUE_GROUP_THRESHOLD'dan fazla tekrarlanırsa
+# ilk ISSUE_GROUP_KEEP örnek tutulur, kalanı `issueGroups` altında sayılır (0 = kapalı).
+ISSUE_GROUP_THRESHOLD = int(os.getenv("ISSUE_GROUP_THRESHOLD", "200"))
+ISSUE_GROUP_KEEP = int(os.getenv("ISSUE_GROUP_KEEP", "20"))
+
+# Dizin / .zip / .tar.gz gönderimleri: paralel süreç sayısı (0 = CPU sayısı) ve girdi sınırları.
+ARCHIVE_JOBS = int(os.getenv("ARCHIVE_JOBS", "0")) or (os.cpu_count() or 1)
+ARCHIVE_MAX_FILES = int(os.getenv("ARCHIVE_MAX_FILES", "5000"))
+ARCHIVE_MAX_FILE_BYTES = int(os.getenv("ARCHIVE_MAX_FILE_BYTES", str(5 * 1024 * 1024)))
+# Gönderim başına okunacak toplam bayt (aşan girdiler atlanır) ve havuza verilip sonucu
+# beklenen en fazla girdi sayısı (0 = ARCHIVE_JOBS * 2); bellekte tutulan içerik buna bağlıdır.
+ARCHIVE_MAX_TOTAL_BYTES = int(os.getenv("ARCHIVE_MAX_TOTAL_BYTES", str(256 * 1024 * 1024)))
+ARCHIVE_IN_FLIGHT = int(os.getenv("ARCHIVE_IN_FLIGHT", "0")) or ARCHIVE_JOBS * 2
+
+# Mesajda satır içi gelen `Content` için üst sınır (çözülmüş bayt, 0 = sınırsız) ve
+# paylaşımlı depodaki dosyaların kopyalanmadan mmap ile okunacağı boyut eşiği (0 = kapalı).
+INLINE_MAX_BYTES = int(os.getenv("INLINE_MAX_BYTES", str(256 * 1024)))
+MMAP_MIN_BYTES = int(os.getenv("MMAP_MIN_BYTES", str(1024 * 1024)))
+
+# Read-ahead: prefetch ile gelen sonraki mesajların dosyaları bu kadar I/O thread'inde
+# önden okunur (0 = kapalı). Bellekte tutulan toplam ve dosya başına bayt sınırları.
+READ_AHEAD_THREADS = int(os.getenv("READ_AHEAD_THREADS", "4"))
+READ_AHEAD_MAX_BYTES = int(os.getenv("READ_AHEAD_MAX_BYTES", str(64 * 1024 * 1024)))
+READ_AHEAD_MAX_FILE_BYTES = int(os.getenv("READ_AHEAD_MAX_FILE_BYTES", str(8 * 1024 * 1024)))
+
+# Dedupe dizini: aynı submissionId + içerik tekrar gelirse saklanan sonuç lint yapılmadan
+# yeniden yayınlanır. sqlite dosyası (boş = kapalı), kayıt üst sınırı ve kayıt ömrü.
+# Dosya container'ın yerel diskinde olmalıdır (ör. /tmp/lint-dedupe.sqlite3); paylaşımlı
+# storage gibi bind-mount/ağ dosya sistemlerinde sqlite kilitleri güvenilir değildir.
+DEDUPE_DB = os.getenv("DEDUPE_DB", "")
+DEDUPE_MAX_ENTRIES = int(os.getenv("DEDUPE_MAX_ENTRIES", "100000"))
+DEDUPE_TTL_SEC = float(os.getenv("DEDUPE_TTL_SEC", str(24 * 3600)))
+
+# Claim-check: `results`/`issueGroups` JSON'u CLAIM_CHECK_BYTES'ı aşan event'lerin ayrıntısı
+# CLAIM_CHECK_DIR altına blob olarak yazılır, event'te `resultsRef` kalır (0 = kapalı).
+# Varsayılan kapalıdır: MetricsWorker `resultsRef` çözmez ve bu storage volume'üne erişemez;
+# yalnızca tüm tüketiciler blob'ları okuyabiliyorsa açılmalıdır (ör. 262144).
+CLAIM_CHECK_BYTES = int(os.getenv("CLAIM_CHECK_BYTES", "0"))
+CLAIM_CHECK_DIR = os.getenv("CLAIM_CHECK_DIR", os.path.join("storage", "lint-results"))
+
+def _publisher_confirms(mode: str) -> bool:
+    if PUBLISHER_CONFIRMS == "auto":
+        return mode == "asyncio"
+    return PUBLISHER_CONFIRMS in ("1", "true", "yes")
 
 # ---- Graceful shutdown ----
 _should_stop = False
@@ -35,94 +168,416 @@ def _handle_sigterm(_signo, _frame):
 signal.signal(signal.SIGTERM, _handle_sigterm)
 signal.signal(signal.SIGINT, _handle_sigterm)
 
-# ---- SEVERITY MAPPING ----
-def classify_severity(code: str) -> str:
-    """Flake8 hata koduna göre severity seviyesi döner."""
-    if not code:
-        return "info"
-    prefix = code[0].upper()
-    if prefix in ("F", "E"):
-        return "error"
-    elif prefix == "W":
-        return "warning"
-    elif prefix == "C":
-        return "convention"
-    elif prefix == "N":
-        return "naming"
-    else:
-        return "info"
-
 # ---- Linting işlemi ----
-def run_flake8(file_path: str):
+_lint_engines = {}
+
+def get_lint_engine(profile: str = None) -> LintEngine:
+    """Süreç başına profil başına tek bir flake8 motoru oluşturur ve onu yeniden kullanır."""
+    profile = profile or LINT_PROFILE
+    engine = _lint_engines.get(profile)
+    if engine is None:
+        engine = _lint_engines[profile] = LintEngine.for_profile(profile)
+    return engine
+
+_lint_cache = None
+
+def get_lint_cache() -> LintResultCache:
+    global _lint_cache
+    if _lint_cache is None:
+        _lint_cache = LintResultCache(max_entries=LINT_CACHE_SIZE, directory=LINT_CACHE_DIR)
+    return _lint_cache
+
+_supervised_linter = None
+
+def get_supervised_linter():
+    """Bütçe tanımlıysa süreç başına tek denetimli linter döner, değilse None."""
+    global _supervised_linter
+    if not (LINT_TIMEOUT_SEC or LINT_CPU_SEC or LINT_MEMORY_MB):
+        return None
+    if _supervised_linter is None:
+        _supervised_linter = SupervisedLinter(
+            wall_seconds=LINT_TIMEOUT_SEC,
+            cpu_seconds=LINT_CPU_SEC,
+            memory_mb=LINT_MEMORY_MB
+        )
+    return _supervised_linter
+
+def _cache_key_for(engine: LintEngine, file_path: str, content) -> str:
+    # per-file-ignores sonucu dosya adına bağlar; o durumda yol da anahtara girer.
+    scoped_path = file_path if engine.options.per_file_ignores else ""
+    return make_cache_key(content, engine.fingerprint, scoped_path)
+
+def _read_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+def _read_source(file_path: str, source=None):
+    """Satır içi içerik verilmişse onu, yoksa dosyayı (büyükse mmap ile) tek seferde okur."""
+    if source is not None:
+        return contextlib.nullcontext(source)
+    return open_source(file_path, MMAP_MIN_BYTES)
+
+def _plugin_timings():
+    """Bu lint plugin süresi için örneklendiyse boş bir sözlük, değilse None döner."""
+    if PLUGIN_TIMING_RATE and random.random() < PLUGIN_TIMING_RATE:
+        return {}
+    return None
+
+def _add_timings(stats: dict, timings: dict):
+    if not timings:
+        return
+    plugin_seconds = stats.setdefault("plugin_seconds", {})
+    for name, seconds in timings.items():
+        plugin_seconds[name] = plugin_seconds.get(name, 0.0) + seconds
+
+def _lint_exception_result(file_path: str, e: Exception):
+    return [{
+        "file": os.path.basename(file_path),
+        "code": "E999",
+        "message": f"Exception during linting: {e}",
+        "line": 0,
+        "column": 0,
+        "severity": "error"
+    }]
+
+def run_flake8(file_path: str, stats: dict = None, profile: str = None, source=None):
     """
-    Flake8'i JSON formatta çalıştırır ve tüm PEP8 hatalarını döndürür.
+    Flake8'i süreç içindeki kalıcı motor ile çalıştırır ve tüm PEP8 hatalarını döndürür.
     Syntax (E999) olsa bile --exit-zero sayesinde analiz devam eder.
+    Aynı içerik + flake8 sürümü + config daha önce lint edildiyse sonuç önbellekten gelir.
+    Dosya depodan yalnızca bir kez okunur; önbellek anahtarı ve lint aynı tampondan
+    yapılır. `source` (satır içi içerik) verilirse dosyaya hiç dokunulmaz.
+    `stats` verilirse okuma/lint/plugin süreleri ve önbellek durumu oraya yazılır.
     """
+    stats = {} if stats is None else stats
+    profile = profile or LINT_PROFILE
     try:
-        result = subprocess.run(
-            ["flake8", "--exit-zero", "--format=json", file_path],
-            capture_output=True,
-            text=True
-        )
+        engine = get_lint_engine(profile)
+        cache = get_lint_cache()
+        started = time.perf_counter()
+        with _read_source(file_path, source) as data:
+            # mmap sayfaları tembel okunur; okuma süresi anahtarın özeti alınınca kesinleşir.
+            key = _cache_key_for(engine, file_path, data)
+            if source is None:
+                stats["read_seconds"] = time.perf_counter() - started
+            stats["file_size"] = len(data)
+
+            cached = cache.get(key, os.path.basename(file_path))
+            if cached is not None:
+                print(f"♻️  Lint cache hit for {file_path} ({key[:12]})")
+                stats["cache_hit"] = True
+                return cached
+
+            started = time.perf_counter()
+            timings = _plugin_timings()
+            supervised = get_supervised_linter()
+            if supervised is None:
+                results = engine.check_source(file_path, data, timings)
+                exceeded = None
+            else:
+                raw, exceeded = supervised.lint(file_path, profile, timings, data)
+                results = engine.report_raw(file_path, raw)
+        _add_timings(stats, timings)
+        if exceeded:
+            stats["lint_seconds"] = time.perf_counter() - started
+            stats["budget_exceeded"] = exceeded
+            print(f"⏱️  Lint budget exceeded ({exceeded}) for {file_path}; "
+                  f"publishing {len(results)} partial issues")
+            # Kısmi sonuç önbelleğe yazılmaz.
+            return results
+        stats["lint_seconds"] = time.perf_counter() - started
+        cache.put(key, results)
+        return results
+    except Exception as e:
+        stats["lint_error"] = True
+        return _lint_exception_result(file_path, e)
 
-        stdout = (result.stdout or "").strip()
-        stderr = (result.stderr or "").strip()
-        output = stdout if stdout else stderr
+def run_flake8_batch(file_paths, stats_by_path: dict = None, profile: str = None, contents: dict = None):
+    """
+    Birden fazla dosyayı tek flake8 çalıştırmasında (`--jobs` ile paralel) lint eder.
+    Önbellekte olanlar atlanır; dönüş değeri dosya yolu -> issue listesidir.
+    `stats_by_path` verilirse her dosyanın istatistikleri oraya yazılır.
+    `contents` (dosya yolu -> bayt) çağıranın zaten okuduğu içeriktir; bu
+    dosyalar önbellek anahtarı için yeniden okunmaz.
+    """
+    contents = contents or {}
+    profile = profile or LINT_PROFILE
+    engine = get_lint_engine(profile)
+    cache = get_lint_cache()
+    stats_by_path = {} if stats_by_path is None else stats_by_path
+    results = {}
+    keys = {}
 
-        if not output:
-            print(f"ℹ️  No lint output for {file_path}, returning empty result.")
-            return []
+    for file_path in dict.fromkeys(file_paths):
+        stats = stats_by_path.setdefault(file_path, {})
+        stats["profile"] = profile
+        try:
+            content = contents.get(file_path)
+            if content is None:
+                started = time.perf_counter()
+                content = _read_file(file_path)
+                stats["read_seconds"] = time.perf_counter() - started
+            stats["file_size"] = len(content)
+            key = _cache_key_for(engine, file_path, content)
+        except Exception as e:
+            stats["lint_error"] = True
+            results[file_path] = _lint_exception_result(file_path, e)
+            continue
+        cached = cache.get(key, os.path.basename(file_path))
+        if cached is not None:
+            print(f"♻️  Lint cache hit for {file_path} ({key[:12]})")
+            stats["cache_hit"] = True
+            results[file_path] = cached
+        else:
+            keys[file_path] = key
 
+    if keys:
+        started = time.perf_counter()
+        timings = _plugin_timings()
         try:
-            parsed = json.loads(output)
-        except json.JSONDecodeError as je:
-            print(f"⚠️ JSON parse error for {file_path}: {je}\nRaw Output:\n{output}")
-            return [{
-                "file": os.path.basename(file_path),
-                "code": "E999",
-                "message": f"Invalid JSON output: {je}",
-                "line": 0,
-                "column": 0,
-                "severity": "error"
-            }]
-
-        flattened = []
-        for filename, issues in parsed.items():
-            for issue in issues:
-                code = issue.get("code", "E000")
-                flattened.append({
-                    "file": os.path.basename(filename),
-                    "code": code,
-                    "message": issue.get("text", "Unknown issue"),
-                    "line": issue.get("line_number", 0),
-                    "column": issue.get("column_number", 0),
-                    "severity": classify_severity(code)
-                })
-
-        return flattened
-
-    except FileNotFoundError:
-        return [{
-            "file": os.path.basename(file_path),
-            "code": "E998",
-            "message": "flake8 not found in container",
-            "line": 0,
-            "column": 0,
-            "severity": "error"
-        }]
+            linted = engine.lint_many(keys, jobs=BATCH_JOBS, timings=timings)
+        except Exception as e:
+            linted = {path: _lint_exception_result(path, e) for path in keys}
+            for path in keys:
+                stats_by_path[path]["lint_error"] = True
+        else:
+            for path, issues in linted.items():
+                cache.put(keys[path], issues)
+        # Tek çalıştırmanın süresi dosyalar arasında eşit paylaştırılır.
+        per_file = (time.perf_counter() - started) / len(keys)
+        for path in keys:
+            stats_by_path[path]["lint_seconds"] = per_file
+        if timings:
+            # Plugin süreleri çalıştırma başına bir kez sayılır.
+            _add_timings(stats_by_path[next(iter(keys))], timings)
+        results.update(linted)
+
+    return results
+
+# ---- Çok dosyalı gönderimler ----
+_archive_pool = None
+_in_pool_worker = False
+
+def get_archive_pool() -> ProcessPoolExecutor:
+    """Arşiv girdilerini paralel lint eden süreç havuzunu döner."""
+    global _archive_pool
+    if _archive_pool is None:
+        _archive_pool = ProcessPoolExecutor(max_workers=ARCHIVE_JOBS, initializer=_init_pool_worker)
+    return _archive_pool
+
+def _reset_archive_pool():
+    global _archive_pool
+    if _archive_pool is not None:
+        _archive_pool.shutdown(wait=False, cancel_futures=True)
+        _archive_pool = None
+
+class _ArchivePoolFeed:
+    """
+    Arşiv girdilerini okundukça arşiv havuzuna verir. Aynı anda en fazla
+    `limit` girdi (içeriğiyle birlikte) havuzda bekler; sınır doluysa biri
+    bitene kadar okuma durur. Havuz bozulursa (BrokenProcessPool) yenisi
+    kurulur ve bekleyen girdiler bir kez daha gönderilir; yine bozulursa kalan
+    girdiler başarısız (E999) döner ki gönderim sessizce düşmesin.
+    """
+
+    def __init__(self, profile: str, limit: int):
+        self.profile = profile
+        self.limit = max(1, limit)
+        self.in_flight = {}  # future -> (ad, içerik, önbellek anahtarı)
+        self.finished = []  # (ad, önbellek anahtarı, (issues, başarılı mı, plugin süreleri))
+        self._breaks = 0
+        self._error = None
+
+    def submit(self, entry):
+        while len(self.in_flight) >= self.limit:
+            self._collect()
+        self._submit(entry)
+
+    def finish(self):
+        """Bekleyen tüm girdilerin bitmesini bekler ve tamamlananları döner."""
+        while self.in_flight:
+            self._collect()
+        return self.finished
+
+    def _submit(self, entry):
+        name, data, key = entry
+        if self._breaks >= 2:
+            self.finished.append((name, key, (_lint_exception_result(name, self._error), False, None)))
+            return
+        try:
+            future = get_archive_pool().submit(_lint_source_job, name, data, self.profile)
+        except BrokenProcessPool as e:
+            self._on_broken(e, [entry])
+            return
+        self.in_flight[future] = entry
+
+    def _collect(self):
+        done, _ = wait(list(self.in_flight), return_when=FIRST_COMPLETED)
+        broken, error = [], None
+        for future in done:
+            entry = self.in_flight.pop(future)
+            try:
+                self.finished.append((entry[0], entry[2], future.result()))
+            except BrokenProcessPool as e:
+                broken.append(entry)
+                error = e
+        if broken:
+            self._on_broken(error, broken)
+
+    def _on_broken(self, error, entries):
+        # Bozulan havuzdaki diğer işler de başarısız olur; hepsi birlikte ele alınır.
+        entries = entries + list(self.in_flight.values())
+        self.in_flight.clear()
+        _reset_archive_pool()
+        self._breaks += 1
+        self._error = error
+        if self._breaks == 1:
+            print(f"⚠️ Archive pool broke ({error}); retrying {len(entries)} files on a fresh pool")
+        else:
+            print(f"❌ Archive pool broke again ({error}); reporting remaining files as failed")
+        for entry in entries:
+            self._submit(entry)
+
+def _lint_source_job(name: str, source: bytes, profile: str = None):
+    """Pool işi: bellekteki tek bir kaynağı lint eder; (issues, başarılı mı, plugin süreleri) döner."""
+    timings = _plugin_timings()
+    try:
+        return get_lint_engine(profile).check_source(name, source, timings), True, timings
     except Exception as e:
-        return [{
-            "file": os.path.basename(file_path),
-            "code": "E999",
-            "message": f"Exception during linting: {e}",
-            "line": 0,
-            "column": 0,
-            "severity": "error"
-        }]
+        return _lint_exception_result(name, e), False, timings
+
+def _file_too_large_result(name: str):
+    return [{
+        "file": name,
+        "code": "E413",
+        "message": f"File larger than {ARCHIVE_MAX_FILE_BYTES} bytes; not linted",
+        "line": 0,
+        "column": 0,
+        "severity": "error"
+    }]
+
+def run_flake8_multi(path: str, stats: dict = None, profile: str = None):
+    """
+    Dizin ya da arşivdeki tüm .py dosyalarını lint eder; dönüş değeri
+    (göreli ad, issue listesi) çiftleridir. Arşiv diske açılmaz. Önbellekte
+    olmayan girdiler okundukça ARCHIVE_JOBS süreçte paralel lint edilir (en
+    fazla ARCHIVE_IN_FLIGHT girdi bekler); zaten bir pool sürecinin içindeysek
+    (ya da lint edilecek tek girdi varsa) seri çalışılır.
+    Lint bütçeleri (LINT_*_SEC/MB) arşiv girdilerine uygulanmaz.
+    Lint edilemeyen girdiler E999 sonucu taşır; sayıları `stats["failed_files"]`
+    olarak yazılır ve `lint_error` işaretlenir (sonuç dedupe dizinine yazılmaz).
+    ARCHIVE_MAX_FILES / ARCHIVE_MAX_TOTAL_BYTES nedeniyle okunmayan girdilerin
+    sayısı `stats["skipped_files"]`'dır.
+    """
+    stats = {} if stats is None else stats
+    profile = profile or LINT_PROFILE
+    engine = get_lint_engine(profile)
+    cache = get_lint_cache()
+    serial = _in_pool_worker or ARCHIVE_JOBS <= 1
+    results = {}
+    names = []
+    linted = []
+    feed = None
+    # İlk lint edilecek girdi, ikincisi gelene kadar bekletilir; tek girdi için havuz açılmaz.
+    held = None
+    total_bytes = 0
+    read_seconds = 0.0
+    skipped = []
+
+    started = time.perf_counter()
+    sources = iter_sources(path, ARCHIVE_MAX_FILES, ARCHIVE_MAX_FILE_BYTES, skipped, ARCHIVE_MAX_TOTAL_BYTES)
+    while True:
+        read_started = time.perf_counter()
+        entry = next(sources, None)
+        read_seconds += time.perf_counter() - read_started
+        if entry is None:
+            break
+        name, data = entry
+        names.append(name)
+        if data is None:
+            results[name] = _file_too_large_result(name)
+            continue
+        total_bytes += len(data)
+        scoped_path = name if engine.options.per_file_ignores else ""
+        key = make_cache_key(data, engine.fingerprint, scoped_path)
+        cached = cache.get(key, name)
+        if cached is not None:
+            results[name] = cached
+        elif serial:
+            linted.append((name, key, _lint_source_job(name, data, profile)))
+        elif held is None and feed is None:
+            held = (name, data, key)
+        else:
+            if feed is None:
+                print(f"🗂️  Linting files from {path} on the archive pool")
+                feed = _ArchivePoolFeed(profile, ARCHIVE_IN_FLIGHT)
+                feed.submit(held)
+                held = None
+            feed.submit((name, data, key))
+    if held is not None:
+        linted.append((held[0], held[2], _lint_source_job(held[0], held[1], profile)))
+    if feed is not None:
+        linted.extend(feed.finish())
+
+    stats["read_seconds"] = read_seconds
+    stats["file_size"] = total_bytes
+    stats["cache_hit"] = bool(names) and not linted
+    if linted:
+        stats["lint_seconds"] = time.perf_counter() - started - read_seconds
+    if skipped:
+        stats["skipped_files"] = len(skipped)
+        print(f"⚠️ {path} exceeds ARCHIVE_MAX_FILES/ARCHIVE_MAX_TOTAL_BYTES; skipped {len(skipped)} files")
+
+    for name, key, (issues, ok, timings) in linted:
+        _add_timings(stats, timings)
+        # check_source `file` alanına yalnızca dosya adını yazar; göreli yol korunur.
+        for issue in issues:
+            issue["file"] = name
+        if ok:
+            cache.put(key, issues)
+        else:
+            stats["failed_files"] = stats.get("failed_files", 0) + 1
+            stats["lint_error"] = True
+        results[name] = issues
+
+    return [(name, results[name]) for name in names]
+
+def _severity_counts(results):
+    return (
+        sum(1 for r in results if r.get("severity") == "error"),
+        sum(1 for r in results if r.get("severity") == "warning"),
+        sum(1 for r in results if r.get("severity") == "info")
+    )
+
+def summarize_file(name: str, results) -> dict:
+    """Toplu event'teki `files` listesi için tek dosyanın özetini üretir."""
+    error_count, warning_count, info_count = _severity_counts(results)
+    return {
+        "file": name,
+        "issueCount": len(results),
+        "errorCount": error_count,
+        "warningCount": warning_count,
+        "infoCount": info_count
+    }
 
 # ---- Event inşası ----
-def build_lint_completed_event(submission_id, language, file_path, results):
-    if not results:
+def build_lint_completed_event(submission_id, language, file_path, results, budget_exceeded=None, files=None,
+                               profile=None, degraded_from=None, skipped_files=0):
+    """
+    `budget_exceeded` verilirse sonuçlar kısmidir; event `partial` ve
+    `budgetExceeded` (wall_time / cpu_time / memory) alanlarıyla işaretlenir.
+    `files` (summarize_file çıktıları) verilirse gönderim çok dosyalıdır:
+    `fileCount` dosya sayısı olur ve dosya başına özet `files` alanına eklenir.
+    `skipped_files`, dosya sayısı sınırı (ARCHIVE_MAX_FILES) yüzünden lint
+    edilmeyen dosyaların sayısıdır; sıfır değilse `skippedFiles` olarak yazılır.
+    Tekrarlı kodlar eşiği aşarsa `results` kırpılır (`truncated`, `issueGroups`);
+    sayaçlar kırpmadan önce hesaplandığı için kesindir.
+    `profile` verilirse kullanılan lint profili event'e yazılır. `degraded_from`
+    verilirse lint yük atma nedeniyle daha ucuz profille yapılmıştır; event
+    `degraded` ve istenen profil (`requestedProfile`) ile işaretlenir ki
+    sonradan tam profille yeniden lint edilebilsin.
+    """
+    if not results and not budget_exceeded:
         results = [{
             "file": os.path.basename(file_path),
             "code": "W000",
@@ -133,76 +588,789 @@ def build_lint_completed_event(submission_id, language, file_path, results):
         }]
 
     # Count by severity
-    error_count = sum(1 for r in results if r.get("severity") == "error")
-    warning_count = sum(1 for r in results if r.get("severity") == "warning")
-    info_count = sum(1 for r in results if r.get("severity") == "info")
+    error_count, warning_count, info_count = _severity_counts(results)
+    issue_count = len(results)
+    results, groups = summarize_issues(results, ISSUE_GROUP_THRESHOLD, ISSUE_GROUP_KEEP)
 
-    return {
+    event = {
         "submissionId": submission_id,
         "language": language,
         "errorCount": error_count,
         "warningCount": warning_count,
         "infoCount": info_count,
-        "issueCount": len(results),
-        "fileCount": 1,
+        "issueCount": issue_count,
+        "fileCount": 1 if files is None else len(files),
         "results": results,
         "calculatedAt": datetime.now(timezone.utc).isoformat(),
         "source": "LinterWorker",
         "filePath": file_path
     }
+    if profile:
+        event["profile"] = profile
+    if degraded_from:
+        event["degraded"] = True
+        event["requestedProfile"] = degraded_from
+    if files is not None:
+        event["files"] = files
+    if skipped_files:
+        event["skippedFiles"] = skipped_files
+    if groups:
+        event["truncated"] = True
+        event["omittedIssueCount"] = issue_count - len(results)
+        event["issueGroups"] = groups
+    if budget_exceeded:
+        event["partial"] = True
+        event["budgetExceeded"] = budget_exceeded
+    return event
+
+def _check_out(event: dict, stats: dict = None) -> dict:
+    """Ayrıntısı büyük olan event'in sonuçlarını storage'a taşır (bkz. claim_check); yazılamazsa event aynen kalır."""
+    if not CLAIM_CHECK_BYTES:
+        return event
+    try:
+        slim = check_out(event, ResultStore(CLAIM_CHECK_DIR), CLAIM_CHECK_BYTES)
+    except OSError as e:
+        print(f"⚠️ Could not offload results of {event.get('submissionId')}: {e}; publishing inline")
+        return event
+    if slim is not event:
+        print(f"🎫 Offloaded {event.get('issueCount')} issues of {event.get('submissionId')} "
+              f"to {slim['resultsRef']['key']}")
+        if stats is not None:
+            stats["claim_check"] = True
+    return slim
 
 # ---- Event yayınlama ----
-def publish_event(channel, event: dict):
-    channel.basic_publish(
-        exchange=OUTPUT_EXCHANGE,
-        routing_key=OUTPUT_ROUTING_KEY,
-        body=json.dumps(event).encode("utf-8"),
-        properties=pika.BasicProperties(
-            content_type="application/json",
-            delivery_mode=2
-        )
+def publish_event(channel, event: dict, publisher: ConfirmedPublisher = None, delivery_tag: int = None):
+    """
+    Event'i yayınlar. `publisher` verilirse yayın confirm boru hattından geçer ve
+    `delivery_tag`'li girdi, confirm geldiğinde publisher tarafından ack'lenir.
+    """
+    started = time.perf_counter()
+    body, content_type, content_encoding = encode_event(event, EVENT_CONTENT_TYPE)
+    properties = pika.BasicProperties(
+        content_type=content_type,
+        content_encoding=content_encoding,
+        delivery_mode=2
     )
+    if publisher is not None:
+        publisher.publish(OUTPUT_EXCHANGE, OUTPUT_ROUTING_KEY, body, properties, delivery_tag)
+    else:
+        channel.basic_publish(
+            exchange=OUTPUT_EXCHANGE,
+            routing_key=OUTPUT_ROUTING_KEY,
+            body=body,
+            properties=properties
+        )
+    metrics.PUBLISH_TIME.observe(time.perf_counter() - started)
     print(f"✅ Published `{OUTPUT_ROUTING_KEY}` for {event.get('submissionId')} "
           f"({event.get('issueCount')} issues | Errors: {event.get('errorCount')} | "
           f"Warnings: {event.get('warningCount')} | Info: {event.get('infoCount')})")
 
 # ---- Mesaj işleme ----
+def _loggable(msg) -> dict:
+    """Log için mesajın kopyası; satır içi içerik yerine yalnızca uzunluğu yazılır."""
+    if isinstance(msg, dict) and msg.get("Content") is not None:
+        return {**msg, "Content": f"<{len(str(msg['Content']))} chars>"}
+    return msg
+
+def _parse_submission(msg: dict):
+    """
+    (submissionId, dosya yolu, dil, profil) döner. Satır içi `Content` taşıyan
+    mesajlarda FilePath yalnızca görünen addır; yoksa `<SubmissionId>.py` kullanılır.
+    """
+    submission_id = msg.get("SubmissionId")
+    file_path = msg.get("FilePath")
+    language = msg.get("Language", "python")
+    profile = msg.get("LintProfile") or LINT_PROFILE
+    inline = msg.get("Content") is not None
+
+    if not submission_id or not (file_path or inline):
+        raise ValueError("SubmissionId veya FilePath/Content eksik.")
+    if profile not in LINT_PROFILES:
+        raise ValueError(f"Bilinmeyen lint profili: {profile}")
+    return submission_id, file_path or f"{submission_id}.py", language, profile
+
+def _inline_source(msg: dict):
+    """Mesaj satır içi `Content` (`ContentEncoding`: utf-8 | base64) taşıyorsa baytlarını döner, yoksa None."""
+    content = msg.get("Content")
+    if content is None:
+        return None
+    source = decode_inline(content, msg.get("ContentEncoding"))
+    if INLINE_MAX_BYTES and len(source) > INLINE_MAX_BYTES:
+        raise ValueError(f"Satır içi içerik {INLINE_MAX_BYTES} baytı aşıyor; FilePath kullanılmalı.")
+    return source
+
+# ---- Dedupe dizini ----
+_dedupe_index = None
+
+def get_dedupe_index():
+    """DEDUPE_DB tanımlıysa süreç başına tek DedupeIndex döner, değilse None."""
+    global _dedupe_index
+    if not DEDUPE_DB:
+        return None
+    if _dedupe_index is None:
+        _dedupe_index = DedupeIndex(DEDUPE_DB, DEDUPE_MAX_ENTRIES, DEDUPE_TTL_SEC)
+    return _dedupe_index
+
+def _dedupe_key(submission_id: str, profile: str, file_path: str, content: bytes = None):
+    """
+    (submissionId, istenen profilin motor parmak izi, dosya yolu, içerik imzası) anahtarı.
+    Tek dosyalarda imza, lint yolunun zaten okuduğu `content` tamponunun
+    sha256 özetidir; dosya yalnızca anahtar için okunmaz. Dizin ve arşivlerde
+    boyut/mtime imzası kullanılır (bkz. `source_signature`). Dizin kapalıysa,
+    dosya yoksa ya da tek dosyanın içeriği verilmemişse None.
+    """
+    if get_dedupe_index() is None:
+        return None
+    try:
+        if content is not None:
+            signature = hashlib.sha256(content).hexdigest()
+        elif is_multi_file(file_path):
+            signature = source_signature(file_path)
+        else:
+            return None
+    except OSError:
+        return None
+    return make_dedupe_key(submission_id, get_lint_engine(profile).fingerprint, file_path, signature)
+
+def _stored_outcome(key: str):
+    return get_dedupe_index().get(key) if key is not None else None
+
+def _remember_outcome(key: str, event: dict, stats: dict):
+    """
+    Kesin sonucu dedupe dizinine yazar. Kısmi, degraded, E404 ve lint hatası
+    sonuçları saklanmaz; yeniden denemede farklı (tam) sonuç çıkabilir.
+    """
+    if key is None or stats.get("not_found") or stats.get("lint_error"):
+        return
+    if event.get("partial") or event.get("degraded"):
+        return
+    get_dedupe_index().put(key, event["submissionId"], event)
+
+# ---- Önden okuma (read-ahead) ----
+_read_ahead = None
+
+def get_read_ahead():
+    """Read-ahead açıksa süreç başına tek ReadAhead döner; kapalıyken ve pool süreçlerinde None."""
+    global _read_ahead
+    if READ_AHEAD_THREADS <= 0 or _in_pool_worker:
+        return None
+    if _read_ahead is None:
+        _read_ahead = ReadAhead(READ_AHEAD_THREADS, READ_AHEAD_MAX_BYTES, READ_AHEAD_MAX_FILE_BYTES)
+    return _read_ahead
+
+def _reset_read_ahead():
+    global _read_ahead
+    if _read_ahead is not None:
+        _read_ahead.close()
+        _read_ahead = None
+
+def _prefetch_source(msg: dict):
+    """Mesajın dosyasını I/O havuzunda okumaya başlar; okuma Future'ını ya da None döner."""
+    read_ahead = get_read_ahead()
+    if read_ahead is None or msg.get("Content") is not None:
+        return None
+    try:
+        _, file_path, _, _ = _parse_submission(msg)
+    except ValueError:
+        return None
+    if file_path.lower().endswith(ARCHIVE_SUFFIXES):
+        # Arşivler akış halinde okunur; dizinleri `schedule` zaten atlar.
+        return None
+    return read_ahead.schedule(file_path)
+
+def _prefetch_body(body):
+    """Ham mesaj gövdesi için `_prefetch_source`; çözülemeyen gövdeler sessizce atlanır."""
+    try:
+        return _prefetch_source(json.loads(body))
+    except Exception:
+        return None
+
+def _release_prefetched(msg: dict):
+    """Lint edilmeden bırakılan (nack'lenen, kanalı kapanmış) mesajın önden okunmuş içeriğini serbest bırakır."""
+    if _read_ahead is None or not isinstance(msg, dict):
+        return
+    file_path = msg.get("FilePath")
+    if file_path and msg.get("Content") is None:
+        _read_ahead.discard(file_path)
+
+def _release_prefetched_body(body):
+    """Ham mesaj gövdesi için `_release_prefetched`."""
+    try:
+        _release_prefetched(json.loads(body))
+    except Exception:
+        pass
+
+def _take_prefetched(file_path: str, stats: dict = None, wait: bool = True):
+    """
+    Önden okunmuş içeriği alır (okuma sürüyorsa `wait` ile bekler). `stats`'a
+    bekleme süresi okuma süresi olarak yazılır: lint aşamasının depoda kaldığı süre.
+    """
+    if _read_ahead is None or _in_pool_worker:
+        return None
+    started = time.perf_counter()
+    data = _read_ahead.take(file_path, wait)
+    if data is not None and stats is not None:
+        stats["read_seconds"] = time.perf_counter() - started
+        stats["read_ahead"] = True
+    return data
+
+def _ready_prefetched(msg: dict):
+    """Okuması bitmiş içeriği beklemeden alır; pool süreçlerine argüman olarak gönderilir."""
+    file_path = msg.get("FilePath")
+    if not file_path or msg.get("Content") is not None:
+        return None
+    return _take_prefetched(file_path, wait=False)
+
+def _file_not_found_result(file_path: str):
+    return [{
+        "file": os.path.basename(file_path or ""),
+        "code": "E404",
+        "message": "File not found",
+        "line": 0,
+        "column": 0,
+        "severity": "error"
+    }]
+
+def _shed_profile(profile: str, shed_to: str = None):
+    """Yük atma etkinse istenen profilden daha ucuzsa `shed_to`'yu seçer: (profil, degraded_from)."""
+    order = list(LINT_PROFILES)
+    if shed_to and order.index(shed_to) < order.index(profile):
+        return shed_to, profile
+    return profile, None
+
+def lint_submission(msg: dict, stats: dict = None, shed_to: str = None, prefetched: bytes = None) -> dict:
+    """
+    `code.submitted` mesajını doğrular, dosyayı lint eder ve `lint.completed`
+    event'ini döner. Kanal erişimi yoktur; pool süreçlerinde de çalışabilir.
+    `shed_to` yük atma sırasında kullanılacak ucuz profildir (bkz. `current_shed_profile`).
+    `prefetched` dosyanın önden okunmuş içeriğidir; verilmezse read-ahead'e bakılır.
+    Aynı gönderim daha önce işlendiyse (bkz. `_dedupe_key`) saklanan event döner.
+    """
+    stats = {} if stats is None else stats
+    submission_id, file_path, language, profile = _parse_submission(msg)
+    source = _inline_source(msg)
+    if source is not None:
+        stats["inline"] = True
+    elif prefetched is not None:
+        source = prefetched
+        stats["read_ahead"] = True
+    elif not file_path.lower().endswith(ARCHIVE_SUFFIXES):
+        source = _take_prefetched(file_path, stats)
+
+    with contextlib.ExitStack() as buffers:
+        if (source is None and get_dedupe_index() is not None
+                and os.path.isfile(file_path) and not is_multi_file(file_path)):
+            # Dedupe anahtarı içeriğin özetidir: dosya bir kez okunur, lint de aynı tampondan yapılır.
+            started = time.perf_counter()
+            try:
+                source = buffers.enter_context(_read_source(file_path))
+                stats["read_seconds"] = time.perf_counter() - started
+            except OSError:
+                pass
+        return _lint_parsed_submission(
+            stats, submission_id, file_path, language, profile, shed_to, source
+        )
+
+def _lint_parsed_submission(stats, submission_id, file_path, language, profile, shed_to, source):
+    """`lint_submission`'ın içerik hazırlandıktan sonraki kısmı: dedupe, lint ve event inşası."""
+    dedupe_key = _dedupe_key(submission_id, profile, file_path, source)
+    stored = _stored_outcome(dedupe_key)
+    if stored is not None:
+        print(f"🔁 Duplicate submission {submission_id}; republishing stored result")
+        stats["duplicate"] = True
+        return stored
+
+    profile, degraded_from = _shed_profile(profile, shed_to)
+    stats["profile"] = profile
+    stats["degraded_from"] = degraded_from
+
+    if source is not None:
+        results = run_flake8(file_path, stats, profile, source)
+    elif not os.path.exists(file_path):
+        stats["not_found"] = True
+        results = _file_not_found_result(file_path)
+    elif is_multi_file(file_path):
+        per_file = run_flake8_multi(file_path, stats, profile)
+        results = [issue for _, issues in per_file for issue in issues]
+        event = _check_out(build_lint_completed_event(
+            submission_id, language, file_path, results,
+            files=[summarize_file(name, issues) for name, issues in per_file],
+            profile=profile,
+            degraded_from=degraded_from,
+            skipped_files=stats.get("skipped_files", 0)
+        ), stats)
+        _remember_outcome(dedupe_key, event, stats)
+        return event
+    else:
+        results = run_flake8(file_path, stats, profile)
+
+    event = _check_out(build_lint_completed_event(
+        submission_id, language, file_path, results,
+        budget_exceeded=stats.get("budget_exceeded"),
+        profile=profile,
+        degraded_from=degraded_from
+    ), stats)
+    _remember_outcome(dedupe_key, event, stats)
+    return event
+
+def _lint_job(msg: dict, shed_to: str = None, prefetched: bytes = None):
+    """Executor/pool işi: event'i ve metrikler için istatistikleri birlikte döner."""
+    stats = {}
+    event = lint_submission(msg, stats, shed_to, prefetched)
+    return event, stats
+
+def message_age_seconds(msg: dict):
+    """`SubmittedAtUtc`'den bu yana geçen süre (saniye); alan yoksa None."""
+    submitted = msg.get("SubmittedAtUtc")
+    if not submitted:
+        return None
+    try:
+        ts = datetime.fromisoformat(submitted)
+    except (TypeError, ValueError):
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - ts).total_seconds()
+
+# ---- Yük atma ----
+load_shedder = LoadShedder(age_threshold_sec=SHED_AGE_SEC, depth_threshold=SHED_QUEUE_DEPTH)
+
+def current_shed_profile():
+    """Worker degraded moddaysa kullanılacak ucuz profil, değilse None."""
+    return SHED_PROFILE if load_shedder.degraded else None
+
+def _probe_queue_depth(channel):
+    """BlockingChannel üzerinde passive declare ile girdi kuyruğunun derinliğini okur."""
+    frame = channel.queue_declare(queue=INPUT_QUEUE, passive=True)
+    load_shedder.observe_depth(frame.method.message_count)
+
+def _schedule_depth_probe(connection, channel):
+    def _probe():
+        if not channel.is_open:
+            return
+        try:
+            _probe_queue_depth(channel)
+        except Exception as e:
+            print(f"⚠️ Queue depth probe failed: {e}")
+        _schedule_depth_probe(connection, channel)
+
+    connection.call_later(SHED_PROBE_SEC, _probe)
+
+def _observe_received(msg: dict):
+    metrics.MESSAGES.inc()
+    age = message_age_seconds(msg)
+    if age is not None:
+        metrics.QUEUE_WAIT.observe(max(age, 0.0))
+        load_shedder.observe_age(max(age, 0.0))
+
 def process_message(ch, method, properties, body):
     try:
         msg = json.loads(body)
-        print(f"📨 Received `{INPUT_ROUTING_KEY}`: {msg}")
-
-        submission_id = msg.get("SubmissionId")
-        file_path = msg.get("FilePath")
-        language = msg.get("Language", "python")
-
-        if not submission_id or not file_path:
-            raise ValueError("SubmissionId veya FilePath eksik.")
-
-        if not os.path.exists(file_path):
-            results = [{
-                "file": os.path.basename(file_path or ""),
-                "code": "E404",
-                "message": "File not found",
-                "line": 0,
-                "column": 0,
-                "severity": "error"
-            }]
-        else:
-            results = run_flake8(file_path)
+        print(f"📨 Received `{INPUT_ROUTING_KEY}`: {_loggable(msg)}")
+        _observe_received(msg)
 
-        event = build_lint_completed_event(submission_id, language, file_path, results)
+        stats = {}
+        event = lint_submission(msg, stats, current_shed_profile())
+        metrics.record_lint_stats(stats)
         publish_event(ch, event)
         ch.basic_ack(delivery_tag=method.delivery_tag)
 
+    except pika.exceptions.NackError as e:
+        print(f"⚠️ Broker rejected `{OUTPUT_ROUTING_KEY}` publish: {e}. Requeueing message.")
+        metrics.NACKS.inc()
+        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
     except Exception as e:
         print(f"❌ Processing error: {e}")
+        metrics.NACKS.inc()
         ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
+# ---- Süreç havuzu ile lint ----
+_lint_pool = None
+
+def _init_pool_worker():
+    """Pool süreci açılırken flake8 motorunu önceden ısıtır."""
+    global _in_pool_worker
+    _in_pool_worker = True
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    get_lint_engine()
+
+def get_lint_pool() -> ProcessPoolExecutor:
+    """Yeniden bağlanmalar arasında korunan lint süreç havuzunu döner."""
+    global _lint_pool
+    if _lint_pool is None:
+        _lint_pool = ProcessPoolExecutor(max_workers=LINT_POOL_SIZE, initializer=_init_pool_worker)
+    return _lint_pool
+
+def _reset_lint_pool():
+    global _lint_pool
+    if _lint_pool is not None:
+        _lint_pool.shutdown(wait=False, cancel_futures=True)
+        _lint_pool = None
+
+def _complete_pooled(ch, delivery_tag, future):
+    """Pool'dan dönen sonucu pika I/O thread'inde yayınlar ve ack'ler."""
+    if not ch.is_open:
+        # Kanal kapandı; broker mesajı yeniden teslim edecek.
+        return
+    try:
+        event, stats = future.result()
+        metrics.record_lint_stats(stats)
+        publish_event(ch, event)
+        ch.basic_ack(delivery_tag=delivery_tag)
+    except pika.exceptions.NackError as e:
+        print(f"⚠️ Broker rejected `{OUTPUT_ROUTING_KEY}` publish: {e}. Requeueing message.")
+        metrics.NACKS.inc()
+        ch.basic_nack(delivery_tag=delivery_tag, requeue=True)
+    except BrokenProcessPool as e:
+        print(f"⚠️ Lint pool crashed: {e}. Requeueing message.")
+        _reset_lint_pool()
+        metrics.NACKS.inc()
+        ch.basic_nack(delivery_tag=delivery_tag, requeue=True)
+    except Exception as e:
+        print(f"❌ Processing error: {e}")
+        metrics.NACKS.inc()
+        ch.basic_nack(delivery_tag=delivery_tag, requeue=False)
+
+def process_message_pooled(connection, ch, method, properties, body):
+    """
+    Mesajı lint pool'una gönderir ve hemen döner; böylece pika I/O thread'i
+    heartbeat'leri işlemeye devam eder. Tamamlanan işler
+    `add_callback_threadsafe` ile I/O thread'ine geri taşınır.
+    Read-ahead açıksa mesaj, dosyası I/O havuzunda okunduktan sonra içeriğiyle
+    birlikte pool'a verilir; pool süreçleri depoyu beklemez.
+    """
+    delivery_tag = method.delivery_tag
+    try:
+        msg = json.loads(body)
+        print(f"📨 Received `{INPUT_ROUTING_KEY}`: {_loggable(msg)}")
+        _observe_received(msg)
+    except Exception as e:
+        print(f"❌ Processing error: {e}")
+        metrics.NACKS.inc()
+        ch.basic_nack(delivery_tag=delivery_tag, requeue=False)
+        return
+
+    read = _prefetch_source(msg)
+    if read is None:
+        _submit_pooled(connection, ch, delivery_tag, msg)
+        return
+
+    def _on_read(_f):
+        try:
+            connection.add_callback_threadsafe(functools.partial(_submit_pooled, connection, ch, delivery_tag, msg))
+        except Exception as e:
+            print(f"⚠️ Could not hand prefetched file back to connection: {e}")
+            _release_prefetched(msg)
+
+    read.add_done_callback(_on_read)
+
+def _submit_pooled(connection, ch, delivery_tag, msg):
+    """Mesajı (varsa önden okunmuş içeriğiyle) lint pool'una verir; sonucu I/O thread'ine taşır."""
+    if not ch.is_open:
+        # Kanal kapandı; broker mesajı yeniden teslim edecek.
+        _release_prefetched(msg)
+        return
+    try:
+        future = get_lint_pool().submit(_lint_job, msg, current_shed_profile(), _ready_prefetched(msg))
+    except BrokenProcessPool as e:
+        print(f"⚠️ Lint pool crashed: {e}. Requeueing message.")
+        _reset_lint_pool()
+        metrics.NACKS.inc()
+        ch.basic_nack(delivery_tag=delivery_tag, requeue=True)
+        return
+    except Exception as e:
+        print(f"❌ Processing error: {e}")
+        metrics.NACKS.inc()
+        ch.basic_nack(delivery_tag=delivery_tag, requeue=False)
+        return
+
+    def _on_done(f):
+        try:
+            connection.add_callback_threadsafe(functools.partial(_complete_pooled, ch, delivery_tag, f))
+        except Exception as e:
+            # Bağlantı kapandıysa mesaj ack'lenmemiş kalır ve yeniden teslim edilir.
+            print(f"⚠️ Could not hand lint result back to connection: {e}")
+
+    future.add_done_callback(_on_done)
+
+# ---- Mikro-batch lint ----
+def lint_submissions_batch(msgs, shed_to: str = None):
+    """
+    Mesaj listesini tek flake8 geçişinde lint eder. Her mesaj için ya
+    `lint.completed` event'i ya da o mesaja ait hatayı (Exception) döner.
+    """
+    parsed = []
+    for msg in msgs:
+        try:
+            submission_id, file_path, language, profile = _parse_submission(msg)
+            parsed.append((submission_id, file_path, language, *_shed_profile(profile, shed_to)))
+        except Exception as e:
+            parsed.append(e)
+
+    # Tek dosyalı gönderimler için dedupe; satır içi ve çok dosyalılar lint_submission'da bakar.
+    dedupe_keys = [None] * len(msgs)
+    stored = [None] * len(msgs)
+    existing_by_profile = {}
+    # Dedupe anahtarı için okunan içerik; run_flake8_batch aynı baytları kullanır.
+    contents = {}
+    dedupe = get_dedupe_index() is not None
+    for i, (msg, p) in enumerate(zip(msgs, parsed)):
+        if isinstance(p, Exception) or msg.get("Content") is not None:
+            continue
+        if os.path.isfile(p[1]) and not is_multi_file(p[1]):
+            submission_id, file_path, _, profile, degraded_from = p
+            if dedupe:
+                try:
+                    if file_path not in contents:
+                        contents[file_path] = _read_file(file_path)
+                    dedupe_keys[i] = _dedupe_key(submission_id, degraded_from or profile, file_path,
+                                                 contents[file_path])
+                except OSError:
+                    pass
+                stored[i] = _stored_outcome(dedupe_keys[i])
+            if stored[i] is None:
+                existing_by_profile.setdefault(profile, []).append(file_path)
+    results_by_profile = {}
+    stats_by_profile = {}
+    for profile, paths in existing_by_profile.items():
+        stats_by_path = stats_by_profile[profile] = {}
+        results_by_profile[profile] = run_flake8_batch(paths, stats_by_path, profile, contents)
+        for stats in stats_by_path.values():
+            metrics.record_lint_stats(stats)
+
+    outcomes = []
+    for i, (msg, p) in enumerate(zip(msgs, parsed)):
+        if isinstance(p, Exception):
+            outcomes.append(p)
+            continue
+        if stored[i] is not None:
+            print(f"🔁 Duplicate submission {p[0]}; republishing stored result")
+            metrics.DUPLICATES.inc()
+            outcomes.append(stored[i])
+            continue
+        submission_id, file_path, language, profile, degraded_from = p
+        if msg.get("Content") is not None or (os.path.exists(file_path) and is_multi_file(file_path)):
+            # Satır içi içerik ve dizin/arşiv gönderimleri kendi yollarından geçer.
+            try:
+                stats = {}
+                outcomes.append(lint_submission(msg, stats, shed_to))
+                metrics.record_lint_stats(stats)
+            except Exception as e:
+                outcomes.append(e)
+            continue
+        results = results_by_profile.get(profile, {}).get(file_path)
+        if results is None:
+            metrics.FILE_NOT_FOUND.inc()
+            results = _file_not_found_result(file_path)
+        if degraded_from:
+            metrics.DEGRADED_RESULTS.inc()
+        stats = {}
+        event = _check_out(build_lint_completed_event(
+            submission_id, language, file_path, results,
+            profile=profile, degraded_from=degraded_from
+        ), stats)
+        if stats.get("claim_check"):
+            metrics.CLAIM_CHECKS.inc()
+        _remember_outcome(dedupe_keys[i], event, stats_by_profile.get(profile, {}).get(file_path, {}))
+        outcomes.append(event)
+    return outcomes
+
+class BatchConsumer:
+    """
+    Gelen mesajları BATCH_SIZE adede ya da BATCH_WINDOW_MS süresine kadar biriktirir,
+    sonra hepsini tek flake8 çalıştırmasında lint edip her birini ayrı yayınlar/ack'ler.
+    Zamanlayıcı `connection.call_later` ile pika I/O döngüsünde çalışır.
+    """
+
+    def __init__(self, connection, channel):
+        self.connection = connection
+        self.channel = channel
+        self.pending = []
+        self._timer = None
+        # Başarılı girdiler tek tek değil, batch sonunda multi-ack ile onaylanır.
+        self.acks = MultiAckTracker()
+
+    def on_message(self, ch, method, properties, body):
+        try:
+            msg = json.loads(body)
+            print(f"📨 Received `{INPUT_ROUTING_KEY}`: {_loggable(msg)}")
+            _observe_received(msg)
+        except Exception as e:
+            print(f"❌ Processing error: {e}")
+            metrics.NACKS.inc()
+            self.acks.discard(method.delivery_tag)
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+
+        self.pending.append((method.delivery_tag, msg))
+        if len(self.pending) >= BATCH_SIZE:
+            self.flush()
+        elif self._timer is None:
+            self._timer = self.connection.call_later(BATCH_WINDOW_MS / 1000.0, self.flush)
+
+    def flush(self):
+        if self._timer is not None:
+            self.connection.remove_timeout(self._timer)
+            self._timer = None
+        if not self.pending:
+            return
+
+        batch, self.pending = self.pending, []
+        print(f"📦 Linting batch of {len(batch)} submissions")
+        outcomes = lint_submissions_batch([msg for _, msg in batch], current_shed_profile())
+
+        acks = self.acks
+        for (delivery_tag, _), outcome in zip(batch, outcomes):
+            try:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                publish_event(self.channel, outcome)
+                acks.mark_done(delivery_tag)
+            except pika.exceptions.NackError as e:
+                print(f"⚠️ Broker rejected `{OUTPUT_ROUTING_KEY}` publish: {e}. Requeueing message.")
+                acks.discard(delivery_tag)
+                metrics.NACKS.inc()
+                self.channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+            except Exception as e:
+                print(f"❌ Processing error: {e}")
+                acks.discard(delivery_tag)
+                metrics.NACKS.inc()
+                self.channel.basic_nack(delivery_tag=delivery_tag, requeue=False)
+
+        multi, singles = acks.pop_ackable()
+        if multi is not None:
+            self.channel.basic_ack(delivery_tag=multi, multiple=True)
+        for delivery_tag in singles:
+            self.channel.basic_ack(delivery_tag=delivery_tag)
+
+# ---- Öncelik şeritleri ----
+def _new_lanes() -> WeightedLanes:
+    return WeightedLanes({LANE_INTERACTIVE: INTERACTIVE_WEIGHT, LANE_BULK: BULK_WEIGHT})
+
+def _lane_for_body(body) -> str:
+    """Ham mesaj gövdesinin şeridi; çözülemeyen mesajlar hızlıca nack'lensin diye etkileşimli sayılır."""
+    try:
+        return classify_submission(json.loads(body), INTERACTIVE_MAX_BYTES)
+    except Exception:
+        return LANE_INTERACTIVE
+
+class LaneConsumer:
+    """
+    BlockingConnection için öncelik şeritli tüketici. Teslim alınan mesajlar
+    şeritlere konur; executor'da aynı anda en fazla `concurrency` lint işi
+    çalışır ve boşalan her yer için sıradaki iş ağırlıklı olarak seçilir.
+    Tamamlanan işler `add_callback_threadsafe` ile I/O thread'ine döner.
+    """
+
+    def __init__(self, connection, channel, concurrency: int):
+        self.connection = connection
+        self.channel = channel
+        self.concurrency = concurrency
+        self.lanes = _new_lanes()
+        self.in_flight = 0
+
+    def on_message(self, ch, method, properties, body, lane=None):
+        try:
+            msg = json.loads(body)
+            print(f"📨 Received `{INPUT_ROUTING_KEY}`: {_loggable(msg)}")
+            _observe_received(msg)
+        except Exception as e:
+            print(f"❌ Processing error: {e}")
+            metrics.NACKS.inc()
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+
+        lane = lane or classify_submission(msg, INTERACTIVE_MAX_BYTES)
+        metrics.LANE_MESSAGES.inc(lane)
+        _prefetch_source(msg)
+        self.lanes.push(lane, (method.delivery_tag, msg))
+        self._pump()
+
+    def on_interactive_message(self, ch, method, properties, body):
+        self.on_message(ch, method, properties, body, lane=LANE_INTERACTIVE)
+
+    def _pump(self):
+        while self.in_flight < self.concurrency:
+            item = self.lanes.pop()
+            if item is None:
+                return
+            _, (delivery_tag, msg) = item
+            # Lint thread'i içeriği kendisi alır (gerekirse bekler); pool süreçlerine hazırsa gönderilir.
+            prefetched = _ready_prefetched(msg) if LINT_POOL_SIZE > 0 else None
+            try:
+                future = _get_lint_executor().submit(_lint_job, msg, current_shed_profile(), prefetched)
+            except BrokenProcessPool as e:
+                print(f"⚠️ Lint pool crashed: {e}. Requeueing message.")
+                _reset_lint_pool()
+                metrics.NACKS.inc()
+                self.channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+                continue
+            self.in_flight += 1
+            future.add_done_callback(functools.partial(self._on_done, delivery_tag))
+
+    def _on_done(self, delivery_tag, future):
+        try:
+            self.connection.add_callback_threadsafe(functools.partial(self._complete, delivery_tag, future))
+        except Exception as e:
+            # Bağlantı kapandıysa mesaj ack'lenmemiş kalır ve yeniden teslim edilir.
+            print(f"⚠️ Could not hand lint result back to connection: {e}")
+
+    def _complete(self, delivery_tag, future):
+        self.in_flight -= 1
+        _complete_pooled(self.channel, delivery_tag, future)
+        if self.channel.is_open:
+            self._pump()
+
+    def drain(self):
+        """Bağlantı biterken şeritte bekleyen mesajların önden okunmuş içeriğini bırakır (broker yeniden teslim eder)."""
+        for _, msg in self.lanes.drain():
+            _release_prefetched(msg)
+
+# ---- Senkron read-ahead tüketici ----
+class ReadAheadConsumer:
+    """
+    Senkron mod için: teslim alınan mesaj hemen lint edilmez; dosyası I/O
+    havuzunda okunmaya başlanır ve mesaj yerel kuyruğa konur. Lint, pika
+    döngüsünün sonraki turunda (`call_later(0)`) sırayla `process_message`
+    ile yapılır. Böylece prefetch ile gelmiş sonraki mesajların dosyaları,
+    mevcut dosya lint edilirken okunur.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.pending = deque()
+        self._scheduled = False
+
+    def on_message(self, ch, method, properties, body):
+        _prefetch_body(body)
+        self.pending.append((ch, method, properties, body))
+        self._schedule()
+
+    def _schedule(self):
+        if not self._scheduled and self.pending:
+            self._scheduled = True
+            self.connection.call_later(0, self._process_next)
+
+    def _process_next(self):
+        self._scheduled = False
+        ch, method, properties, body = self.pending.popleft()
+        if ch.is_open:
+            process_message(ch, method, properties, body)
+        else:
+            _release_prefetched_body(body)
+        # Sıradaki mesaj için önce döngüye dönülür; yeni teslimatlar da önden okunmaya başlar.
+        self._schedule()
+
+    def drain(self):
+        """Bağlantı biterken işlenmemiş mesajların önden okunmuş içeriğini bırakır (broker yeniden teslim eder)."""
+        while self.pending:
+            _release_prefetched_body(self.pending.popleft()[3])
+
 # ---- RabbitMQ bağlantısı ve dinleme ----
-def connect_and_consume():
+def _connection_params():
     credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASS)
-    params = pika.ConnectionParameters(
+    return pika.ConnectionParameters(
         host=RABBITMQ_HOST,
         port=RABBITMQ_PORT,
         virtual_host=RABBITMQ_VHOST,
@@ -211,24 +1379,69 @@ def connect_and_consume():
         blocked_connection_timeout=60
     )
 
-    connection = pika.BlockingConnection(params)
+def connect_and_consume():
+    connection = pika.BlockingConnection(_connection_params())
     channel = connection.channel()
 
     channel.exchange_declare(exchange=INPUT_EXCHANGE, exchange_type="topic", durable=True)
     channel.exchange_declare(exchange=OUTPUT_EXCHANGE, exchange_type="topic", durable=True)
     channel.queue_declare(queue=INPUT_QUEUE, durable=True)
     channel.queue_bind(exchange=INPUT_EXCHANGE, queue=INPUT_QUEUE, routing_key=INPUT_ROUTING_KEY)
+    if PRIORITY_LANES and INTERACTIVE_QUEUE:
+        channel.queue_declare(queue=INTERACTIVE_QUEUE, durable=True)
+        channel.queue_bind(exchange=INPUT_EXCHANGE, queue=INTERACTIVE_QUEUE, routing_key=INTERACTIVE_ROUTING_KEY)
 
-    channel.basic_qos(prefetch_count=PREFETCH_COUNT)
-    channel.basic_consume(queue=INPUT_QUEUE, on_message_callback=process_message, auto_ack=False)
+    if _publisher_confirms("blocking"):
+        # BlockingChannel'da her basic_publish confirm gelene kadar bekler; nack'te NackError fırlatır.
+        channel.confirm_delivery()
 
-    print(f"🎧 Waiting messages on '{INPUT_QUEUE}' (bind: {INPUT_EXCHANGE}:{INPUT_ROUTING_KEY})")
+    # Bağlantı bitince elde bekleyen mesajları bırakacak tüketici (şeritler / read-ahead).
+    buffered = None
+    if BATCH_SIZE > 1:
+        # Batch en az BATCH_SIZE mesaj biriktirebilsin diye prefetch buna göre yükseltilir.
+        prefetch_count = max(PREFETCH_COUNT, BATCH_SIZE)
+        on_message = BatchConsumer(connection, channel).on_message
+    elif PRIORITY_LANES:
+        # Şeritler arası seçim yapılabilmesi için çalışan işlerden fazlası tamponlanır.
+        prefetch_count = max(PREFETCH_COUNT, LANE_PREFETCH)
+        lane_consumer = buffered = LaneConsumer(connection, channel, concurrency=max(1, LINT_POOL_SIZE))
+        on_message = lane_consumer.on_message
+        if INTERACTIVE_QUEUE:
+            channel.basic_consume(
+                queue=INTERACTIVE_QUEUE,
+                on_message_callback=lane_consumer.on_interactive_message,
+                auto_ack=False
+            )
+    elif LINT_POOL_SIZE > 0:
+        # Pool'daki her süreç meşgul kalabilsin diye prefetch en az havuz boyutu kadar olmalı.
+        prefetch_count = max(PREFETCH_COUNT, LINT_POOL_SIZE)
+        on_message = functools.partial(process_message_pooled, connection)
+        get_lint_pool()
+    elif READ_AHEAD_THREADS > 0 and PREFETCH_COUNT > 1:
+        prefetch_count = PREFETCH_COUNT
+        buffered = ReadAheadConsumer(connection)
+        on_message = buffered.on_message
+    else:
+        prefetch_count = PREFETCH_COUNT
+        on_message = process_message
+
+    channel.basic_qos(prefetch_count=prefetch_count)
+    channel.basic_consume(queue=INPUT_QUEUE, on_message_callback=on_message, auto_ack=False)
+    if SHED_QUEUE_DEPTH:
+        _schedule_depth_probe(connection, channel)
+
+    print(f"🎧 Waiting messages on '{INPUT_QUEUE}' (bind: {INPUT_EXCHANGE}:{INPUT_ROUTING_KEY}, "
+          f"prefetch: {prefetch_count}, lint pool: {LINT_POOL_SIZE or 'off'}, "
+          f"batch: {BATCH_SIZE if BATCH_SIZE > 1 else 'off'}, lanes: {'on' if PRIORITY_LANES else 'off'}, "
+          f"read-ahead: {READ_AHEAD_THREADS or 'off'})")
 
     try:
         channel.start_consuming()
     except KeyboardInterrupt:
         print("🛑 Interrupted by user.")
     finally:
+        if buffered is not None:
+            buffered.drain()
         if channel.is_open:
             try:
                 channel.close()
@@ -240,17 +1453,279 @@ def connect_and_consume():
             except Exception:
                 pass
 
+# ---- asyncio tüketici ----
+_lint_executor = None
+
+def _get_lint_executor():
+    """
+    asyncio ve öncelik şeridi modlarında lint işlerinin çalışacağı executor:
+    LINT_POOL_SIZE>0 ise süreç havuzu, değilse tek thread.
+    """
+    global _lint_executor
+    if LINT_POOL_SIZE > 0:
+        return get_lint_pool()
+    if _lint_executor is None:
+        # Lint motoru kilitli çalıştığı için birden fazla thread hız kazandırmaz.
+        _lint_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lint")
+    return _lint_executor
+
+def _amqp_call(fn, *args, callback_name="callback", **kwargs):
+    """Callback tabanlı bir pika çağrısını await edilebilir bir Future'a çevirir."""
+    future = asyncio.get_running_loop().create_future()
+
+    def _done(result):
+        if not future.done():
+            future.set_result(result)
+
+    kwargs[callback_name] = _done
+    fn(*args, **kwargs)
+    return future
+
+class AsyncLinterConsumer:
+    """
+    Açık bir pika kanalı (AsyncioConnection ya da fake_broker taklidi) üzerinde
+    asyncio ile tüketim yapar. Her mesaj bir task olur; lint işi executor'da
+    çalışırken döngü yeni teslimatları, yayınları ve ack'leri işlemeye devam
+    eder. Aynı anda işlenen mesaj sayısını broker'daki prefetch sınırlar.
+    """
+
+    def __init__(self, channel, executor, prefetch_count: int = PREFETCH_COUNT):
+        self.channel = channel
+        self.executor = executor
+        self.prefetch_count = prefetch_count
+        self.loop = asyncio.get_running_loop()
+        self.closed = self.loop.create_future()
+        self.publisher = None
+        self._tasks = set()
+        self._probe_task = None
+        # Şeritler açıkken aynı anda en fazla `concurrency` mesaj işlenir, kalanı şeritte bekler.
+        self.lanes = _new_lanes() if PRIORITY_LANES else None
+        self.concurrency = max(1, LINT_POOL_SIZE)
+        self._draining = False
+
+    async def start(self):
+        ch = self.channel
+        ch.add_on_close_callback(self._on_channel_closed)
+        await _amqp_call(ch.exchange_declare, exchange=INPUT_EXCHANGE, exchange_type="topic", durable=True)
+        await _amqp_call(ch.exchange_declare, exchange=OUTPUT_EXCHANGE, exchange_type="topic", durable=True)
+        await _amqp_call(ch.queue_declare, queue=INPUT_QUEUE, durable=True)
+        await _amqp_call(ch.queue_bind, exchange=INPUT_EXCHANGE, queue=INPUT_QUEUE, routing_key=INPUT_ROUTING_KEY)
+        interactive_queue = INTERACTIVE_QUEUE if self.lanes is not None else ""
+        if interactive_queue:
+            await _amqp_call(ch.queue_declare, queue=interactive_queue, durable=True)
+            await _amqp_call(ch.queue_bind, exchange=INPUT_EXCHANGE, queue=interactive_queue,
+                             routing_key=INTERACTIVE_ROUTING_KEY)
+        if _publisher_confirms("asyncio"):
+            self.publisher = ConfirmedPublisher(
+                ch, self.loop.call_later,
+                flush_delay=CONFIRM_FLUSH_MS / 1000.0,
+                max_pending=CONFIRM_MAX_PENDING
+            )
+            await _amqp_call(ch.confirm_delivery, ack_nack_callback=self.publisher.on_confirm)
+        await _amqp_call(ch.basic_qos, prefetch_count=self.prefetch_count)
+        ch.basic_consume(queue=INPUT_QUEUE, on_message_callback=self._on_message, auto_ack=False)
+        if interactive_queue:
+            ch.basic_consume(
+                queue=interactive_queue,
+                on_message_callback=functools.partial(self._on_message, lane=LANE_INTERACTIVE),
+                auto_ack=False
+            )
+        if SHED_QUEUE_DEPTH:
+            self._probe_task = self.loop.create_task(self._probe_depth())
+
+    async def _probe_depth(self):
+        """Kanal açık kaldıkça girdi kuyruğunun derinliğini SHED_PROBE_SEC aralıkla okur."""
+        while self.channel.is_open:
+            await asyncio.sleep(SHED_PROBE_SEC)
+            try:
+                frame = await _amqp_call(self.channel.queue_declare, queue=INPUT_QUEUE, passive=True)
+                load_shedder.observe_depth(frame.method.message_count)
+            except Exception as e:
+                print(f"⚠️ Queue depth probe failed: {e}")
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def _on_message(self, ch, method, properties, body, lane=None):
+        read = _prefetch_body(body)
+        if self.lanes is None:
+            self._start(ch, method.delivery_tag, body, read)
+            return
+        lane = lane or _lane_for_body(body)
+        metrics.LANE_MESSAGES.inc(lane)
+        self.lanes.push(lane, (ch, method.delivery_tag, body, read))
+        self._pump()
+
+    def _start(self, ch, delivery_tag, body, read=None):
+        task = self.loop.create_task(self._handle(ch, delivery_tag, body, read))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task):
+        self._tasks.discard(task)
+        if self.lanes is not None and self.channel.is_open:
+            self._pump()
+
+    def _pump(self):
+        while not self._draining and len(self._tasks) < self.concurrency:
+            item = self.lanes.pop()
+            if item is None:
+                return
+            self._start(*item[1])
+
+    async def _handle(self, ch, delivery_tag, body, read=None):
+        try:
+            msg = json.loads(body)
+            print(f"📨 Received `{INPUT_ROUTING_KEY}`: {_loggable(msg)}")
+            _observe_received(msg)
+            prefetched = None
+            if read is not None:
+                # Okuma döngüde beklenir; executor'a iş, içeriği hazır olarak gider.
+                await asyncio.wait([asyncio.wrap_future(read)])
+                prefetched = _ready_prefetched(msg)
+            event, stats = await self.loop.run_in_executor(
+                self.executor, _lint_job, msg, current_shed_profile(), prefetched
+            )
+            metrics.record_lint_stats(stats)
+            if not ch.is_open:
+                # Kanal kapandı; broker mesajı yeniden teslim edecek.
+                return
+            if self.publisher is not None:
+                publish_event(ch, event, self.publisher, delivery_tag)
+            else:
+                publish_event(ch, event)
+                ch.basic_ack(delivery_tag=delivery_tag)
+        except Exception as e:
+            print(f"❌ Processing error: {e}")
+            if not ch.is_open:
+                return
+            metrics.NACKS.inc()
+            if self.publisher is not None:
+                self.publisher.reject(delivery_tag)
+            else:
+                ch.basic_nack(delivery_tag=delivery_tag, requeue=False)
+
+    def _on_channel_closed(self, _channel, reason):
+        if not self.closed.done():
+            self.closed.set_result(reason)
+
+    def drop_pending(self):
+        """
+        Şeritte bekleyen (başlamamış) mesajları bırakır ve önden okunmuş içeriklerini
+        serbest bırakır. Mesajlar ack'lenmez; bağlantı kapanınca broker yeniden teslim eder.
+        """
+        if self.lanes is None:
+            return
+        self._draining = True
+        for _, _, body, read in self.lanes.drain():
+            if read is not None:
+                _release_prefetched_body(body)
+
+    async def drain(self):
+        """Elde kalan mesaj task'larının bitmesini ve bekleyen confirm'lerin ack'lenmesini bekler."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+        self.drop_pending()
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        if self.publisher is not None:
+            for _ in range(100):
+                if not self.publisher.unconfirmed_count or not self.channel.is_open:
+                    break
+                await asyncio.sleep(0.05)
+            self.publisher.flush()
+
+async def _wait_for_stop():
+    while not _should_stop:
+        await asyncio.sleep(0.5)
+
+async def consume_async():
+    """`connect_and_consume`'un asyncio karşılığı (WORKER_MODE=asyncio)."""
+    loop = asyncio.get_running_loop()
+    opened = loop.create_future()
+    closed = loop.create_future()
+
+    def _on_open_error(_conn, err):
+        if not opened.done():
+            opened.set_exception(err if isinstance(err, Exception) else pika.exceptions.AMQPConnectionError(err))
+
+    def _on_close(_conn, reason):
+        if not closed.done():
+            closed.set_result(reason)
+
+    connection = AsyncioConnection(
+        _connection_params(),
+        on_open_callback=lambda conn: opened.done() or opened.set_result(conn),
+        on_open_error_callback=_on_open_error,
+        on_close_callback=_on_close,
+        custom_ioloop=loop
+    )
+    await opened
+
+    consumer = None
+    stop = loop.create_task(_wait_for_stop())
+    try:
+        channel = await _amqp_call(connection.channel, callback_name="on_open_callback")
+        prefetch_count = max(PREFETCH_COUNT, LINT_POOL_SIZE)
+        if PRIORITY_LANES:
+            prefetch_count = max(prefetch_count, LANE_PREFETCH)
+        consumer = AsyncLinterConsumer(channel, _get_lint_executor(), prefetch_count)
+        await consumer.start()
+
+        print(f"🎧 Waiting messages on '{INPUT_QUEUE}' (bind: {INPUT_EXCHANGE}:{INPUT_ROUTING_KEY}, "
+              f"asyncio, prefetch: {prefetch_count}, lint pool: {LINT_POOL_SIZE or 'off'})")
+
+        await asyncio.wait([closed, consumer.closed, stop], return_when=asyncio.FIRST_COMPLETED)
+        if not stop.done():
+            reason = closed.result() if closed.done() else consumer.closed.result()
+            raise pika.exceptions.AMQPConnectionError(reason)
+        await consumer.drain()
+    finally:
+        stop.cancel()
+        if consumer is not None:
+            consumer.drop_pending()
+        if connection.is_open:
+            connection.close()
+            await asyncio.wait([closed], timeout=5)
+
 # ---- Ana döngü ----
+def _start_metrics_server():
+    """METRICS_PORT açıksa /metrics sunucusunu başlatır; port alınamazsa worker metriksiz devam eder."""
+    if not METRICS_PORT:
+        return None
+    try:
+        server = metrics.start_metrics_server(METRICS_PORT)
+    except OSError as e:
+        print(f"⚠️ Could not expose metrics on :{METRICS_PORT} ({e}); continuing without /metrics")
+        return None
+    print(f"📈 Metrics exposed on :{METRICS_PORT}/metrics")
+    return server
+
 def main():
     print("🐍 LinterWorker starting…")
+    check_content_type(EVENT_CONTENT_TYPE)
+    print(f"📦 Publishing `{OUTPUT_ROUTING_KEY}` as {EVENT_CONTENT_TYPE}")
+    _start_metrics_server()
     while not _should_stop:
         try:
-            connect_and_consume()
+            if WORKER_MODE == "asyncio":
+                asyncio.run(consume_async())
+            else:
+                connect_and_consume()
         except Exception as e:
             if _should_stop:
                 break
             print(f"⚠️ LinterWorker disconnected/crashed: {e}. Retrying in {RETRY_DELAY_SEC}s…")
+            metrics.RECONNECTS.inc()
             time.sleep(RETRY_DELAY_SEC)
+    _reset_lint_pool()
+    _reset_archive_pool()
+    _reset_read_ahead()
+    if _supervised_linter is not None:
+        _supervised_linter.close()
+    if _dedupe_index is not None:
+        _dedupe_index.close()
     print("🛑 LinterWorker stopped.")
 
 
@@ -0,0 +1,305 @@
+"""
+Prometheus text exposition formatında küçük bir metrik yüzeyi.
+
+Harici bağımlılık gerektirmez: sayaçlar ve histogramlar süreç içinde tutulur,
+`start_metrics_server` ile açılan HTTP thread'i `/metrics` isteğinde hepsini
+metin olarak döner.
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _fmt(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        yield f"{self.name} {_fmt(self._value)}"
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._value = 0
+
+    def set(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} gauge"
+        yield f"{self.name} {_fmt(self._value)}"
+
+
+class LabeledCounter:
+    """Tek etiketli sayaç ailesi (ör. plugin="pyflakes[F]")."""
+
+    def __init__(self, name: str, documentation: str, label: str):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value: str, amount=1):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def value(self, label_value: str):
+        return self._values.get(label_value, 0)
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for label_value, value in values:
+            escaped = label_value.replace("\\", "\\\\").replace('"', '\\"')
+            yield f'{self.name}{{{self.label}="{escaped}"}} {_fmt(value)}'
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, buckets=TIME_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def render(self):
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        cumulative = 0
+        for bound, c in zip(self.buckets + (float("inf"),), counts):
+            cumulative += c
+            yield f'{self.name}_bucket{{le="{_fmt(float(bound))}"}} {cumulative}'
+        yield f"{self.name}_sum {_fmt(total)}"
+        yield f"{self.name}_count {count}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        metric = Counter(name, documentation)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        metric = Gauge(name, documentation)
+        self._metrics.append(metric)
+        return metric
+
+    def labeled_counter(self, name: str, documentation: str, label: str) -> LabeledCounter:
+        metric = LabeledCounter(name, documentation, label)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, buckets=TIME_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+QUEUE_WAIT = REGISTRY.histogram(
+    "linterworker_queue_wait_seconds",
+    "Time between SubmittedAtUtc and the worker receiving the message.",
+    WAIT_BUCKETS
+)
+FILE_READ = REGISTRY.histogram(
+    "linterworker_file_read_seconds",
+    "Time spent reading the submitted file from storage."
+)
+LINT_TIME = REGISTRY.histogram(
+    "linterworker_lint_seconds",
+    "Time spent running flake8 checks for one file (cache hits excluded)."
+)
+PUBLISH_TIME = REGISTRY.histogram(
+    "linterworker_publish_seconds",
+    "Time spent publishing one lint.completed event."
+)
+FILE_SIZE = REGISTRY.histogram(
+    "linterworker_file_size_bytes",
+    "Size of submitted files.",
+    SIZE_BUCKETS
+)
+MESSAGES = REGISTRY.counter(
+    "linterworker_messages_total",
+    "code.submitted messages received."
+)
+CACHE_HITS = REGISTRY.counter(
+    "linterworker_cache_hits_total",
+    "Lint results served from the result cache."
+)
+FILE_NOT_FOUND = REGISTRY.counter(
+    "linterworker_file_not_found_total",
+    "Submissions whose file was missing (E404)."
+)
+NACKS = REGISTRY.counter(
+    "linterworker_nacks_total",
+    "Input messages negatively acknowledged."
+)
+BUDGET_EXCEEDED = REGISTRY.counter(
+    "linterworker_budget_exceeded_total",
+    "Lint jobs stopped by a CPU, wall-clock or memory budget (partial results)."
+)
+RECONNECTS = REGISTRY.counter(
+    "linterworker_reconnects_total",
+    "Broker reconnect attempts after a disconnect or crash."
+)
+INLINE_SUBMISSIONS = REGISTRY.counter(
+    "linterworker_inline_submissions_total",
+    "Submissions whose source came inline in the message (no storage read)."
+)
+CLAIM_CHECKS = REGISTRY.counter(
+    "linterworker_claim_checks_total",
+    "lint.completed events whose per-issue details were offloaded to a storage blob."
+)
+DUPLICATES = REGISTRY.counter(
+    "linterworker_duplicates_total",
+    "Redelivered or resubmitted submissions answered from the dedupe index without linting."
+)
+DEGRADED_RESULTS = REGISTRY.counter(
+    "linterworker_degraded_results_total",
+    "Submissions linted with a cheaper profile because of load shedding."
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "linterworker_input_queue_depth",
+    "Ready messages in the input queue at the last passive declare."
+)
+LOAD_SHEDDING = REGISTRY.gauge(
+    "linterworker_load_shedding",
+    "1 while the worker is shedding load (degraded profile), 0 otherwise."
+)
+LANE_MESSAGES = REGISTRY.labeled_counter(
+    "linterworker_lane_messages_total",
+    "Messages scheduled per priority lane.",
+    "lane"
+)
+PROFILE_LINTS = REGISTRY.labeled_counter(
+    "linterworker_profile_lints_total",
+    "Submissions linted per lint profile.",
+    "profile"
+)
+PLUGIN_SECONDS = REGISTRY.labeled_counter(
+    "linterworker_plugin_seconds_total",
+    "Time spent inside each flake8 checker plugin (sampled lints only, see PLUGIN_TIMING_RATE).",
+    "plugin"
+)
+READ_AHEAD = REGISTRY.labeled_counter(
+    "linterworker_read_ahead_total",
+    "Read-ahead outcomes: ready, waited (read still in flight), miss, skipped (budget full), evicted.",
+    "result"
+)
+
+
+def record_lint_stats(stats: dict):
+    """`lint_submission`'ın doldurduğu istatistik sözlüğünü metriklere işler."""
+    if "file_size" in stats:
+        FILE_SIZE.observe(stats["file_size"])
+    if "read_seconds" in stats:
+        FILE_READ.observe(stats["read_seconds"])
+    if "lint_seconds" in stats:
+        LINT_TIME.observe(stats["lint_seconds"])
+    if stats.get("cache_hit"):
+        CACHE_HITS.inc()
+    if stats.get("not_found"):
+        FILE_NOT_FOUND.inc()
+    if stats.get("inline"):
+        INLINE_SUBMISSIONS.inc()
+    if stats.get("duplicate"):
+        DUPLICATES.inc()
+    if stats.get("claim_check"):
+        CLAIM_CHECKS.inc()
+    if stats.get("budget_exceeded"):
+        BUDGET_EXCEEDED.inc()
+    if stats.get("degraded_from"):
+        DEGRADED_RESULTS.inc()
+    if stats.get("profile"):
+        PROFILE_LINTS.inc(stats["profile"])
+    for plugin, seconds in stats.get("plugin_seconds", {}).items():
+        PLUGIN_SECONDS.inc(plugin, seconds)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0", registry: Registry = REGISTRY):
+    """`/metrics` uç noktasını daemon thread'de açar ve sunucuyu döner."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    return server
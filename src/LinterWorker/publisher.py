@@ -0,0 +1,154 @@
+from collections import OrderedDict
+
+import metrics
+
+
+class MultiAckTracker:
+    """
+    Bir kanaldaki girdi mesajlarının hangilerinin ack'lenebileceğini izler.
+
+    Broker delivery tag'lerini kanal başına 1'den başlayarak artan sırada
+    verir. Baştan itibaren her tag'i tamamlanmış ya da zaten sonuçlanmış
+    (tek başına ack/nack'lenmiş) olan önek tek bir `basic_ack(multiple=True)`
+    ile onaylanır. Önekten sonra tamamlanan tag'ler (arada hâlâ işlenen ya da
+    şeritte bekleyen bir mesaj varsa) tek tek ack'lenir; böylece yavaş bir iş
+    arkasında bitmiş mesajları ve prefetch penceresini tutmaz.
+
+    Yalnızca sonuçlar kaydedilir: teslim alınıp henüz bitmemiş bir tag
+    sadece önekin ilerlemesini durdurur.
+    """
+
+    def __init__(self):
+        # Bu tag'e kadar (dahil) her tag ack/nack'lendi.
+        self._settled_through = 0
+        self._done = set()
+        # Önekin ötesinde tek başına ack/nack'lenmiş tag'ler.
+        self._settled = set()
+
+    def mark_done(self, delivery_tag: int):
+        if delivery_tag > self._settled_through and delivery_tag not in self._settled:
+            self._done.add(delivery_tag)
+
+    def discard(self, delivery_tag: int):
+        """Tek başına nack'lenen girdiyi sonuçlanmış sayar."""
+        self._done.discard(delivery_tag)
+        if delivery_tag > self._settled_through:
+            self._settled.add(delivery_tag)
+
+    def pop_ackable(self):
+        """
+        (multi_tag, single_tags) döner: `multi_tag` (yoksa None) multiple=True
+        ile, `single_tags` ise tek tek ack'lenmelidir. Dönen tag'ler sonuçlanmış sayılır.
+        """
+        multi = None
+        tag = self._settled_through + 1
+        while tag in self._done or tag in self._settled:
+            if tag in self._done:
+                self._done.remove(tag)
+                multi = tag
+            else:
+                self._settled.remove(tag)
+            tag += 1
+        self._settled_through = tag - 1
+        singles = sorted(self._done)
+        self._settled.update(singles)
+        self._done.clear()
+        return multi, singles
+
+
+class ConfirmedPublisher:
+    """
+    Publisher confirm açık bir kanal üzerinde boru hattı şeklinde yayın yapar.
+
+    Yayınlar confirm beklenmeden art arda gönderilir; broker'dan gelen
+    (çoğunlukla `multiple=True`) Basic.Ack/Basic.Nack çerçeveleri yayın sıra
+    numarasından girdi mesajına eşlenir. Çıktısı onaylanan girdiler biriktirilir
+    ve `flush_delay` saniyede bir (ya da `max_pending` dolunca) ack'lenir:
+    kesintisiz önek tek bir `basic_ack(multiple=True)` ile, bitmemiş bir
+    mesajın arkasında kalanlar tek tek. Nack'lenen yayınların girdileri
+    yeniden kuyruğa alınır.
+
+    Kanaldaki tüm yayınlar bu sınıf üzerinden yapılmalıdır; aksi halde sıra
+    numaraları broker'ınkiyle uyuşmaz. `schedule(delay, fn)` asyncio'nun
+    `loop.call_later`'ı ya da pika'nın `connection.call_later`'ı olabilir.
+    """
+
+    def __init__(self, channel, schedule, flush_delay: float = 0.05, max_pending: int = 64):
+        self.channel = channel
+        self.schedule = schedule
+        self.flush_delay = flush_delay
+        self.max_pending = max_pending
+        self.acks = MultiAckTracker()
+        self._unconfirmed = OrderedDict()
+        self._next_seq = 1
+        self._confirmed_since_flush = 0
+        self._flush_scheduled = False
+
+    @property
+    def unconfirmed_count(self) -> int:
+        return len(self._unconfirmed)
+
+    def publish(self, exchange: str, routing_key: str, body: bytes, properties, delivery_tag: int):
+        """Girdi `delivery_tag`'in çıktısını yayınlar; ack confirm gelince yapılır."""
+        self.channel.basic_publish(
+            exchange=exchange,
+            routing_key=routing_key,
+            body=body,
+            properties=properties
+        )
+        self._unconfirmed[self._next_seq] = delivery_tag
+        self._next_seq += 1
+
+    def reject(self, delivery_tag: int, requeue: bool = False):
+        """İşlenemeyen girdiyi tek başına nack'ler."""
+        self.acks.discard(delivery_tag)
+        self.channel.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+        # Baştaki girdi çıkarıldıysa arkasında bekleyen onaylılar artık ack'lenebilir.
+        self._schedule_flush()
+
+    def on_confirm(self, frame):
+        """`confirm_delivery` için ack_nack_callback."""
+        method = frame.method
+        if method.multiple:
+            seqs = []
+            while self._unconfirmed and next(iter(self._unconfirmed)) <= method.delivery_tag:
+                seqs.append(self._unconfirmed.popitem(last=False))
+        elif method.delivery_tag in self._unconfirmed:
+            seqs = [(method.delivery_tag, self._unconfirmed.pop(method.delivery_tag))]
+        else:
+            seqs = []
+
+        if method.NAME == "Basic.Nack":
+            for seq, delivery_tag in seqs:
+                print(f"⚠️ Broker nacked publish #{seq}; requeueing input {delivery_tag}")
+                if self.channel.is_open:
+                    metrics.NACKS.inc()
+                    self.reject(delivery_tag, requeue=True)
+                else:
+                    self.acks.discard(delivery_tag)
+        else:
+            for _, delivery_tag in seqs:
+                self.acks.mark_done(delivery_tag)
+            self._confirmed_since_flush += len(seqs)
+
+        if self._confirmed_since_flush >= self.max_pending:
+            self.flush()
+        elif self._confirmed_since_flush:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.schedule(self.flush_delay, self.flush)
+
+    def flush(self):
+        """Onaylanmış girdileri ack'ler: kesintisiz önek tek multi-ack ile, kalanlar tek tek."""
+        self._flush_scheduled = False
+        self._confirmed_since_flush = 0
+        multi, singles = self.acks.pop_ackable()
+        if not self.channel.is_open:
+            return
+        if multi is not None:
+            self.channel.basic_ack(delivery_tag=multi, multiple=True)
+        for tag in singles:
+            self.channel.basic_ack(delivery_tag=tag)
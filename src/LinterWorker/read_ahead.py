@@ -0,0 +1,116 @@
+"""
+Gönderim dosyalarının önden okunması (read-ahead).
+
+Prefetch ile teslim alınan ama henüz lint edilmeyen mesajların dosyaları
+sınırlı bir I/O thread havuzunda okunmaya başlanır. Lint sırası gelen iş
+dosyayı paylaşımlı depodan okumak yerine hazır baytları alır; böylece
+depo gecikmesi ile lint CPU'su üst üste biner.
+
+Bellekte tutulan toplam bayt `max_bytes` ile sınırlıdır. Bütçe dolunca en
+eski tamamlanmış okumalar atılır (o işler dosyayı kendisi okur); yine de
+yer yoksa yeni okuma başlatılmaz.
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class ReadAhead:
+    def __init__(self, threads: int = 4, max_bytes: int = 64 * 1024 * 1024, max_file_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="read-ahead")
+        # yol -> [future, boyut, bekleyen alıcı sayısı]; eklenme sırasıyla.
+        self._entries = OrderedDict()
+        self._held_bytes = 0
+        self._lock = threading.Lock()
+
+    def _evict_done(self, needed: int):
+        """Bütçede `needed` bayt yer açılana kadar en eski tamamlanmış okumaları atar."""
+        for path in list(self._entries):
+            if self._held_bytes + needed <= self.max_bytes:
+                return
+            future, size, _ = self._entries[path]
+            if future.done():
+                del self._entries[path]
+                self._held_bytes -= size
+                metrics.READ_AHEAD.inc("evicted")
+
+    def schedule(self, path: str):
+        """
+        Dosyanın okunmasını başlatır ve okuma Future'ını döner. Dosya yoksa,
+        düzenli bir dosya değilse ya da sınırlara sığmıyorsa None döner.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        size = st.st_size
+        if not os.path.isfile(path) or (self.max_file_bytes and size > self.max_file_bytes):
+            return None
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                entry[2] += 1
+                return entry[0]
+            if self._held_bytes + size > self.max_bytes:
+                self._evict_done(size)
+                if self._held_bytes + size > self.max_bytes:
+                    metrics.READ_AHEAD.inc("skipped")
+                    return None
+            future = self._executor.submit(_read, path)
+            self._entries[path] = [future, size, 1]
+            self._held_bytes += size
+            return future
+
+    def _pop(self, path: str):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            entry[2] -= 1
+            if entry[2] <= 0:
+                del self._entries[path]
+                self._held_bytes -= entry[1]
+            return entry[0]
+
+    def take(self, path: str, wait: bool = True):
+        """
+        Önden okunmuş içeriği alır ve kaydı bırakır. Okuma hiç başlatılmadıysa,
+        başarısız olduysa ya da `wait=False` iken henüz bitmediyse None döner;
+        çağıran dosyayı kendisi okur.
+        """
+        future = self._pop(path)
+        if future is None:
+            metrics.READ_AHEAD.inc("miss")
+            return None
+        if not future.done():
+            if not wait:
+                metrics.READ_AHEAD.inc("miss")
+                return None
+            metrics.READ_AHEAD.inc("waited")
+        else:
+            metrics.READ_AHEAD.inc("ready")
+        try:
+            return future.result()
+        except OSError:
+            return None
+
+    def discard(self, path: str):
+        """Lint edilmeyecek (nack'lenen) mesajın kaydını bırakır."""
+        self._pop(path)
+
+    def close(self):
+        with self._lock:
+            self._entries.clear()
+            self._held_bytes = 0
+        self._executor.shutdown(wait=False, cancel_futures=True)
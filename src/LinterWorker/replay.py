@@ -0,0 +1,280 @@
+"""
+Gerçek `code.submitted` trafiğini kaydedip LinterWorker'a çevrimdışı yeniden oynatır.
+
+record: Broker'a geçici (exclusive) bir kuyrukla bağlanır; worker'ın
+mesajlarını çalmadan `code.submitted` ve `lint.completed` trafiğini dinler.
+Her gönderimin dosyası mesaj geldiği anda kopyalanır. Sonuç tek bir
+.tar.gz arşividir:
+    manifest.jsonl   {"offset": sn, "message": {...}, "snapshot": "files/..." | null}
+    baseline.jsonl   kayıt sırasında yayınlanan lint.completed event'leri
+    files/<sha256>/<özgün ad>   dosya anlık görüntüleri (dizinler .zip olarak)
+
+replay: Arşivi açar, mesajları fake broker üzerinden özgün zamanlamayla
+(`--speed`) ya da olabildiğince hızlı (`--fast`) worker'a verir; gecikme
+ölçümlerini ve sonuçların baseline'dan farklarını raporlar.
+
+Örnek:
+    python replay.py record --out traffic.tar.gz --duration 600
+    python replay.py replay traffic.tar.gz --fast --pool-size 2 --save-events new.jsonl
+    python replay.py replay traffic.tar.gz --baseline new.jsonl
+"""
+import argparse
+import collections
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+
+import pika
+
+import bench
+import main
+from claim_check import RESULTS_REF, resolve
+from event_codec import decode_event
+
+MANIFEST = "manifest.jsonl"
+BASELINE = "baseline.jsonl"
+
+
+# ---- Kayıt ----
+def _snapshot(file_path: str, files_dir: str):
+    """Gönderimin dosyasını (dizinse .py dosyalarının zip'ini) kopyalar; arşivdeki yolu döner."""
+    if not file_path or not os.path.exists(file_path):
+        return None
+    name = os.path.basename(os.path.normpath(file_path))
+    if os.path.isdir(file_path):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for root, dirs, files in os.walk(file_path):
+                dirs.sort()
+                for f in sorted(files):
+                    if f.endswith(".py"):
+                        full = os.path.join(root, f)
+                        zf.write(full, os.path.relpath(full, file_path).replace(os.sep, "/"))
+        data = buffer.getvalue()
+        name += ".zip"
+    else:
+        with open(file_path, "rb") as f:
+            data = f.read()
+
+    digest = hashlib.sha256(data).hexdigest()
+    relative = f"files/{digest}/{name}"
+    target = os.path.join(files_dir, digest, name)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(data)
+    return relative
+
+
+def record(out_path: str, duration: float = 300, max_messages: int = 0):
+    """Canlı trafiği `duration` saniye (ya da `max_messages` mesaj) boyunca kaydeder."""
+    workdir = tempfile.mkdtemp(prefix="linterworker-record-")
+    files_dir = os.path.join(workdir, "files")
+    os.makedirs(files_dir)
+    manifest = open(os.path.join(workdir, MANIFEST), "w", encoding="utf-8")
+    baseline = open(os.path.join(workdir, BASELINE), "w", encoding="utf-8")
+    counts = {"messages": 0, "events": 0}
+    first_at = None
+
+    connection = pika.BlockingConnection(main._connection_params())
+    channel = connection.channel()
+    channel.exchange_declare(exchange=main.INPUT_EXCHANGE, exchange_type="topic", durable=True)
+    channel.exchange_declare(exchange=main.OUTPUT_EXCHANGE, exchange_type="topic", durable=True)
+    # Sunucu adlı, exclusive kuyruk: worker'ın kuyruğundan mesaj almaz, kopyasını dinler.
+    queue = channel.queue_declare(queue="", exclusive=True, auto_delete=True).method.queue
+    channel.queue_bind(exchange=main.INPUT_EXCHANGE, queue=queue, routing_key=main.INPUT_ROUTING_KEY)
+    channel.queue_bind(exchange=main.OUTPUT_EXCHANGE, queue=queue, routing_key=main.OUTPUT_ROUTING_KEY)
+
+    def on_message(ch, method, properties, body):
+        nonlocal first_at
+        try:
+            if method.routing_key == main.OUTPUT_ROUTING_KEY:
+                event = decode_event(body, properties.content_type, properties.content_encoding)
+                if RESULTS_REF in event:
+                    # Claim-check'li sonuçlar kayda gömülür; arşiv production storage'ı olmadan açılabilsin.
+                    try:
+                        event = resolve(event)
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️ Could not resolve results of {event.get('submissionId')}: {e}")
+                baseline.write(json.dumps(event) + "\n")
+                counts["events"] += 1
+                return
+            msg = json.loads(body)
+            now = time.monotonic()
+            first_at = now if first_at is None else first_at
+            entry = {
+                "offset": round(now - first_at, 6),
+                "message": msg,
+                "snapshot": _snapshot(msg.get("FilePath"), files_dir),
+            }
+            manifest.write(json.dumps(entry) + "\n")
+            counts["messages"] += 1
+            print(f"🎙️  Recorded {msg.get('SubmissionId')} ({entry['snapshot'] or 'missing file'})")
+        except Exception as e:
+            print(f"⚠️ Could not record message: {e}")
+
+    channel.basic_consume(queue=queue, on_message_callback=on_message, auto_ack=True)
+    print(f"🎧 Recording `{main.INPUT_ROUTING_KEY}` + `{main.OUTPUT_ROUTING_KEY}` for {duration}s…")
+    deadline = time.monotonic() + duration
+    try:
+        while time.monotonic() < deadline and not (max_messages and counts["messages"] >= max_messages):
+            connection.process_data_events(time_limit=0.5)
+        # Son gönderimlerin sonuçları da baseline'a girsin diye kısa bir süre daha dinlenir.
+        connection.process_data_events(time_limit=2)
+    except KeyboardInterrupt:
+        print("🛑 Recording interrupted; writing archive.")
+    finally:
+        manifest.close()
+        baseline.close()
+        if connection.is_open:
+            connection.close()
+
+    with tarfile.open(out_path, "w:gz") as tf:
+        for name in (MANIFEST, BASELINE, "files"):
+            tf.add(os.path.join(workdir, name), arcname=name)
+    shutil.rmtree(workdir, ignore_errors=True)
+    print(f"💾 Wrote {out_path} ({counts['messages']} messages, {counts['events']} baseline events)")
+    return counts
+
+
+# ---- Yeniden oynatma ----
+def _read_jsonl(path: str):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _issue_key(issue: dict):
+    return issue.get("file"), issue.get("code"), issue.get("line"), issue.get("column")
+
+
+def _summary(event: dict):
+    counts = tuple(event.get(k) for k in ("issueCount", "errorCount", "warningCount", "infoCount"))
+    # W000 yer tutucusu dosya adını taşır; dizin anlık görüntülerinde ad değiştiği için karşılaştırılmaz.
+    issues = collections.Counter(_issue_key(i) for i in event.get("results", ()) if i.get("code") != "W000")
+    return counts, issues
+
+
+def compare_events(baseline: dict, replayed: dict, limit: int = 20) -> dict:
+    """submissionId -> event sözlüklerini karşılaştırır ve fark özetini döner."""
+    report = {"matched": 0, "different": 0, "missing_baseline": 0, "missing_replay": 0, "diffs": []}
+    for sid, event in replayed.items():
+        expected = baseline.get(sid)
+        if expected is None:
+            report["missing_baseline"] += 1
+            continue
+        (exp_counts, exp_issues), (got_counts, got_issues) = _summary(expected), _summary(event)
+        if exp_counts == got_counts and exp_issues == got_issues:
+            report["matched"] += 1
+            continue
+        report["different"] += 1
+        if len(report["diffs"]) < limit:
+            report["diffs"].append({
+                "submissionId": sid,
+                "baseline": exp_counts,
+                "replay": got_counts,
+                "added": [list(k) for k in (got_issues - exp_issues)][:5],
+                "removed": [list(k) for k in (exp_issues - got_issues)][:5],
+            })
+    report["missing_replay"] = sum(1 for sid in baseline if sid not in replayed)
+    return report
+
+
+def load_schedule(archive_path: str, workdir: str, speed: float = 1.0, fast: bool = False):
+    """Arşivi `workdir`'e açar ve bench.run_schedule için mesaj listesini döner."""
+    with tarfile.open(archive_path, "r:gz") as tf:
+        tf.extractall(workdir, filter="data")
+    schedule = []
+    for entry in _read_jsonl(os.path.join(workdir, MANIFEST)):
+        msg = dict(entry["message"])
+        if entry.get("snapshot"):
+            msg["FilePath"] = os.path.join(workdir, entry["snapshot"])
+        elif msg.get("FilePath"):
+            # Kayıtta da dosya yoktu; yeniden oynatmada da E404 beklenir.
+            msg["FilePath"] = os.path.join(workdir, "missing", os.path.basename(msg["FilePath"]))
+        # FilePath'siz (satır içi Content) mesajlar olduğu gibi oynatılır; görünen ad kayıttakiyle aynı kalır.
+        offset = 0.0 if fast else entry["offset"] / speed
+        schedule.append((offset, msg.get("SubmissionId"), msg))
+    return schedule
+
+
+def replay(archive_path: str, speed: float = 1.0, fast: bool = False, prefetch: int = 1,
+           pool_size: int = 0, mode: str = "blocking", baseline_path: str = None,
+           save_events: str = None, diff_limit: int = 20, timeout: float = 3600) -> dict:
+    workdir = tempfile.mkdtemp(prefix="linterworker-replay-")
+    try:
+        schedule = load_schedule(archive_path, workdir, speed, fast)
+        baseline_events = _read_jsonl(baseline_path or os.path.join(workdir, BASELINE))
+        result, broker = bench.run_schedule(schedule, prefetch, pool_size, mode, timeout)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = {e.get("submissionId"): e for e in baseline_events}
+    result["speed"] = "fast" if fast else speed
+    result["comparison"] = compare_events(baseline, broker.events, diff_limit)
+    if save_events:
+        with open(save_events, "w", encoding="utf-8") as f:
+            for event in broker.events.values():
+                f.write(json.dumps(event) + "\n")
+    return result
+
+
+def _print_report(result: dict):
+    c = result["comparison"]
+    print(f"▶️  Replayed {result['completed']}/{result['messages']} messages in {result['seconds']}s "
+          f"({result['msgs_per_sec']} msg/s, speed: {result['speed']}, mode: {result['mode']}, "
+          f"prefetch: {result['prefetch']}, pool: {result['pool_size']})")
+    print(f"⏱️  Latency p50 {result['p50_ms']} ms | p95 {result['p95_ms']} ms | p99 {result['p99_ms']} ms")
+    print(f"🔍 Results: {c['matched']} identical, {c['different']} different, "
+          f"{c['missing_baseline']} without baseline, {c['missing_replay']} not replayed")
+    for d in c["diffs"]:
+        print(f"   ≠ {d['submissionId']}: counts {d['baseline']} -> {d['replay']}, "
+              f"+{d['added']} -{d['removed']}")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Record and replay LinterWorker traffic.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="canlı code.submitted trafiğini arşive kaydet")
+    rec.add_argument("--out", required=True)
+    rec.add_argument("--duration", type=float, default=300, help="saniye")
+    rec.add_argument("--max-messages", type=int, default=0)
+
+    rep = sub.add_parser("replay", help="arşivi fake broker üzerinden worker'a yeniden oynat")
+    rep.add_argument("archive")
+    rep.add_argument("--speed", type=float, default=1.0, help="özgün zamanlamanın katı (2 = iki kat hızlı)")
+    rep.add_argument("--fast", action="store_true", help="zamanlamayı yok say, hepsini hemen kuyruğa koy")
+    rep.add_argument("--prefetch", type=int, default=main.PREFETCH_COUNT)
+    rep.add_argument("--pool-size", type=int, default=main.LINT_POOL_SIZE)
+    rep.add_argument("--mode", choices=("blocking", "asyncio"), default="blocking")
+    rep.add_argument("--baseline", help="arşivdeki yerine bu lint.completed JSONL ile karşılaştır")
+    rep.add_argument("--save-events", help="yeniden oynatmanın event'lerini JSONL olarak yaz")
+    rep.add_argument("--diff-limit", type=int, default=20)
+    rep.add_argument("--json", dest="json_path", help="raporu JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        return record(args.out, args.duration, args.max_messages)
+
+    result = replay(
+        args.archive, speed=args.speed, fast=args.fast, prefetch=args.prefetch,
+        pool_size=args.pool_size, mode=args.mode, baseline_path=args.baseline,
+        save_events=args.save_events, diff_limit=args.diff_limit
+    )
+    _print_report(result)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,161 @@
+"""
+Gönderimlerin kaynaklarını okur: mesajda satır içi gelen içerik, tek dosya
+ve çok dosyalı gönderimler (dizin, .zip, .tar.gz).
+
+Arşivler diske açılmaz: girdiler sırayla akış halinde okunup bellekte
+(ad, bayt) çiftleri olarak döndürülür.
+"""
+import base64
+import binascii
+import contextlib
+import hashlib
+import mmap
+import os
+import tarfile
+import zipfile
+
+ARCHIVE_SUFFIXES = (".zip", ".tar.gz", ".tgz")
+INLINE_ENCODINGS = ("utf-8", "base64")
+
+
+def decode_inline(content: str, encoding: str = "utf-8") -> bytes:
+    """Mesajın `Content` alanını kaynak baytlarına çevirir (UTF-8 metin ya da base64)."""
+    encoding = (encoding or "utf-8").lower()
+    if encoding not in INLINE_ENCODINGS:
+        raise ValueError(f"Bilinmeyen ContentEncoding: {encoding}")
+    if not isinstance(content, str):
+        raise ValueError("Content bir string olmalı.")
+    if encoding == "base64":
+        try:
+            return base64.b64decode(content, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Geçersiz base64 Content: {e}") from e
+    return content.encode("utf-8")
+
+
+@contextlib.contextmanager
+def open_source(path: str, mmap_min_bytes: int = 0):
+    """
+    Dosyayı tek seferde okur ve içeriğini bytes benzeri bir tampon olarak verir.
+    `mmap_min_bytes` (0 = kapalı) ve üstündeki dosyalar kopyalanmadan salt okunur
+    mmap edilir; tampon yalnızca `with` bloğu içinde geçerlidir.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not mmap_min_bytes or size < mmap_min_bytes or size == 0:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise"):
+                # Tokenizer dosyayı baştan sona bir kez tarar; çekirdek ileriyi okusun.
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapped
+
+
+def is_multi_file(path: str) -> bool:
+    """Yol bir dizin ya da desteklenen bir arşiv ise True döner."""
+    return os.path.isdir(path) or path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _is_python(name: str) -> bool:
+    return name.lower().endswith(".py")
+
+
+def _iter_directory(path: str):
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            if _is_python(name):
+                full = os.path.join(root, name)
+                yield os.path.relpath(full, path).replace(os.sep, "/"), full
+
+
+def source_signature(path: str) -> str:
+    """
+    Depodaki gönderim için dosya okumadan içerik imzası üretir: dosya ve
+    arşivlerde boyut + mtime, dizinlerde her .py dosyasının göreli adı,
+    boyutu ve mtime'ı. Depodaki yüklemeler yerinde değiştirilmez; yeniden
+    yazılan bir dosya en azından mtime'ını değiştirir.
+    """
+    h = hashlib.sha256()
+    if os.path.isdir(path):
+        for name, full in _iter_directory(path):
+            st = os.stat(full)
+            h.update(f"{name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    else:
+        st = os.stat(path)
+        h.update(f"{st.st_size}\0{st.st_mtime_ns}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def iter_sources(path: str, max_files: int = 0, max_file_bytes: int = 0, skipped: list = None,
+                 max_total_bytes: int = 0):
+    """
+    Gönderimdeki .py dosyalarını (göreli ad, içerik baytları) olarak üretir.
+
+    `max_files` girdi ya da `max_total_bytes` toplam okunan bayt aşılacaksa
+    kalan girdiler atlanır; `skipped` listesi verilirse okunmadan adları
+    eklenir, verilmezse gezinti orada biter. `max_file_bytes`'tan büyük
+    girdiler okunmadan atlanır (0 = sınırsız); bunlar için içerik None olur.
+    """
+    count = 0
+    total = 0
+
+    def _admit(name, size):
+        """Girdi okunacaksa True, tek başına büyükse False, sınır dolduysa None (atlanır)."""
+        nonlocal count, total
+        if (max_files and count >= max_files) or (max_total_bytes and total + size > max_total_bytes):
+            if skipped is not None:
+                skipped.append(name)
+            return None
+        count += 1
+        if max_file_bytes and size > max_file_bytes:
+            return False
+        total += size
+        return True
+
+    if os.path.isdir(path):
+        for name, full in _iter_directory(path):
+            admitted = _admit(name, os.path.getsize(full))
+            if admitted is None:
+                if skipped is None:
+                    return
+                continue
+            if not admitted:
+                yield name, None
+                continue
+            with open(full, "rb") as f:
+                yield name, f.read()
+
+    elif path.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not _is_python(info.filename):
+                    continue
+                admitted = _admit(info.filename, info.file_size)
+                if admitted is None:
+                    if skipped is None:
+                        return
+                    continue
+                if not admitted:
+                    yield info.filename, None
+                    continue
+                with zf.open(info) as f:
+                    yield info.filename, f.read()
+
+    else:
+        # "r|gz" akış modudur: arşiv baştan sona tek geçişte okunur, geri sarılmaz.
+        with tarfile.open(path, mode="r|gz") as tf:
+            for member in tf:
+                if not member.isfile() or not _is_python(member.name):
+                    continue
+                admitted = _admit(member.name, member.size)
+                if admitted is None:
+                    if skipped is None:
+                        return
+                    continue
+                if not admitted:
+                    yield member.name, None
+                    continue
+                f = tf.extractfile(member)
+                yield member.name, f.read()
@@ -0,0 +1,80 @@
+"""
+LinterWorker testleri. Canlı RabbitMQ gerekmez; tüketiciler fake_broker ile sürülür.
+
+    cd src/LinterWorker && python -m pytest -q tests
+"""
+import os
+import sys
+
+# Testler birbirinin sonucunu önbellekten/dedupe dizininden okumasın, storage'a yazılmasın.
+os.environ.setdefault("LINT_CACHE_SIZE", "0")
+os.environ.setdefault("LINT_CACHE_DIR", "")
+os.environ.setdefault("DEDUPE_DB", "")
+os.environ.setdefault("CLAIM_CHECK_BYTES", "0")
+os.environ.setdefault("METRICS_PORT", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+SYNTAX_ERROR_SOURCE = "def f(:\n    pass\n"
+
+
+@pytest.fixture
+def write_source(tmp_path):
+    """tmp_path altına .py dosyası yazan ve yolunu dönen yardımcı."""
+    def _write(name, text):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return str(path)
+    return _write
+
+
+@pytest.fixture
+def broker():
+    """Worker'ın girdi/çıktı topolojisi kurulmuş bir FakeBroker."""
+    import main
+    from fake_broker import FakeBroker
+
+    fake = FakeBroker()
+    fake.declare_queue(main.INPUT_QUEUE)
+    fake.bind(main.OUTPUT_EXCHANGE, "lint.completed.test", main.OUTPUT_ROUTING_KEY)
+    return fake
+
+
+def submission(submission_id, file_path=None, **fields):
+    """`code.submitted` mesaj gövdesi (bytes)."""
+    import json
+
+    msg = {"SubmissionId": submission_id, "Language": "python", **fields}
+    if file_path is not None:
+        msg["FilePath"] = file_path
+    return json.dumps(msg).encode("utf-8")
+
+
+def published_events(fake):
+    """Yayınlanan `lint.completed` event'lerini submissionId -> event olarak döner."""
+    from event_codec import decode_event
+
+    events = {}
+    for p in fake.published:
+        props = p.properties
+        event = decode_event(p.body, getattr(props, "content_type", None), getattr(props, "content_encoding", None))
+        events[event["submissionId"]] = event
+    return events
+
+
+def consume_blocking(fake, on_message, prefetch=1, rounds=200):
+    """Blocking tüketiciyi kuyruk boşalıp ack'lenmemiş mesaj kalmayana kadar çalıştırır; kanalı döner."""
+    import main
+
+    conn = fake.connection()
+    ch = conn.channel()
+    ch.basic_qos(prefetch_count=prefetch)
+    ch.basic_consume(queue=main.INPUT_QUEUE, on_message_callback=on_message)
+    for _ in range(rounds):
+        conn.process_data_events(time_limit=0.05)
+        if not fake.queues[main.INPUT_QUEUE] and not ch.unacked_count:
+            break
+    return ch
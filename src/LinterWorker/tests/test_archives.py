@@ -0,0 +1,111 @@
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def archive(tmp_path):
+    def _make(count):
+        path = tmp_path / "upload.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            for i in range(count):
+                zf.writestr(f"pkg/m{i}.py", f"x=1\nv{i} = {i}\n")
+        return str(path)
+    return _make
+
+
+class CountingPool:
+    """Aynı anda bekleyen iş sayısının en yüksek değerini kaydeden thread havuzu."""
+
+    def __init__(self, broken_submits=0):
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._lock = threading.Lock()
+        self.outstanding = 0
+        self.peak = 0
+        self.broken_submits = broken_submits
+
+    def submit(self, fn, *args):
+        if self.broken_submits:
+            self.broken_submits -= 1
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+        with self._lock:
+            self.outstanding += 1
+            self.peak = max(self.peak, self.outstanding)
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future):
+        with self._lock:
+            self.outstanding -= 1
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pools = []
+
+    def _get(broken_submits=0):
+        p = CountingPool(broken_submits)
+        pools.append(p)
+        monkeypatch.setattr(main, "_archive_pool", p)
+        return p
+
+    monkeypatch.setattr(main, "ARCHIVE_JOBS", 2)
+    monkeypatch.setattr(main, "get_archive_pool", lambda: main._archive_pool or _get())
+    yield _get
+    for p in pools:
+        p.shutdown()
+
+
+def test_entries_are_streamed_with_bounded_in_flight(archive, pool, monkeypatch):
+    monkeypatch.setattr(main, "ARCHIVE_IN_FLIGHT", 3)
+    p = pool()
+    stats = {}
+    per_file = main.run_flake8_multi(archive(20), stats)
+
+    assert [name for name, _ in per_file] == [f"pkg/m{i}.py" for i in range(20)]
+    assert all([i["code"] for i in issues] == ["E225"] for _, issues in per_file)
+    assert 1 <= p.peak <= 3
+    assert "lint_error" not in stats
+
+
+def test_limits_report_skipped_files(archive, monkeypatch):
+    monkeypatch.setattr(main, "ARCHIVE_MAX_FILES", 3)
+    event = main.lint_submission({"SubmissionId": "a1", "FilePath": archive(5)})
+    assert event["fileCount"] == 3
+    assert event["skippedFiles"] == 2
+
+    monkeypatch.setattr(main, "ARCHIVE_MAX_FILES", 0)
+    monkeypatch.setattr(main, "ARCHIVE_MAX_TOTAL_BYTES", 30)
+    event = main.lint_submission({"SubmissionId": "a2", "FilePath": archive(5)})
+    assert event["fileCount"] == 2
+    assert event["skippedFiles"] == 3
+
+
+def test_broken_pool_is_rebuilt_and_retried_once(archive, pool, monkeypatch):
+    monkeypatch.setattr(main, "_archive_pool", None)
+    pool(broken_submits=1)
+    stats = {}
+    per_file = main.run_flake8_multi(archive(4), stats)
+
+    assert all([i["code"] for i in issues] == ["E225"] for _, issues in per_file)
+    assert "lint_error" not in stats
+
+
+def test_pool_broken_twice_reports_failed_files(archive, pool, monkeypatch):
+    monkeypatch.setattr(main, "get_archive_pool", lambda: CountingPool(broken_submits=1000))
+    stats = {}
+    per_file = main.run_flake8_multi(archive(4), stats)
+
+    assert [i["code"] for _, issues in per_file for i in issues] == ["E999"] * 4
+    assert stats["failed_files"] == 4 and stats["lint_error"]
@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+import pytest
+
+import main
+from conftest import published_events, submission
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """FakeChannel'daki basic_ack / basic_nack çağrıları (sırasıyla)."""
+    from fake_broker import FakeChannel
+
+    recorded = []
+    real_ack, real_nack = FakeChannel.basic_ack, FakeChannel.basic_nack
+
+    def basic_ack(self, delivery_tag=0, multiple=False):
+        recorded.append(("ack", delivery_tag, multiple))
+        real_ack(self, delivery_tag, multiple)
+
+    def basic_nack(self, delivery_tag=0, multiple=False, requeue=True):
+        recorded.append(("nack", delivery_tag, requeue))
+        real_nack(self, delivery_tag, multiple, requeue)
+
+    monkeypatch.setattr(FakeChannel, "basic_ack", basic_ack)
+    monkeypatch.setattr(FakeChannel, "basic_nack", basic_nack)
+    monkeypatch.setattr(main, "READ_AHEAD_THREADS", 0)
+    return recorded
+
+
+def run_async(fake, prefetch=8, on_start=None):
+    """AsyncLinterConsumer'ı girdi kuyruğu boşalana kadar çalıştırır; (consumer, kanal) döner."""
+    async def _run():
+        loop = asyncio.get_running_loop()
+        conn = fake.connection(loop=loop)
+        ch = await main._amqp_call(conn.channel, callback_name="on_open_callback")
+        consumer = main.AsyncLinterConsumer(ch, main._get_lint_executor(), prefetch)
+        await consumer.start()
+        if on_start is not None:
+            on_start(consumer, ch)
+        for _ in range(500):
+            waiting = len(consumer.lanes) if consumer.lanes is not None else 0
+            if not fake.queues[main.INPUT_QUEUE] and not consumer.in_flight and not waiting:
+                break
+            await asyncio.sleep(0.01)
+        await consumer.drain()
+        return consumer, ch
+
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize("confirms", ["false", "true"])
+def test_async_consumer_publishes_and_acks_every_submission(broker, write_source, calls, monkeypatch, confirms):
+    monkeypatch.setattr(main, "PUBLISHER_CONFIRMS", confirms)
+    for i in range(5):
+        path = write_source(f"m{i}.py", "import os\n" if i % 2 else "x = 1\n")
+        broker.enqueue(main.INPUT_QUEUE, submission(f"a{i}", path))
+
+    consumer, ch = run_async(broker)
+
+    events = published_events(broker)
+    assert sorted(events) == [f"a{i}" for i in range(5)]
+    assert [r["code"] for r in events["a1"]["results"]] == ["F401"]
+    assert [r["code"] for r in events["a0"]["results"]] == ["W000"]
+    assert (consumer.publisher is not None) == (confirms == "true")
+    assert ch.unacked_count == 0
+    assert not [c for c in calls if c[0] == "nack"]
+    if confirms == "true":
+        # Confirm'ler biriktirilip önek tek bir multiple=True ack ile onaylanır.
+        assert any(multiple for kind, _, multiple in calls if kind == "ack")
+        assert consumer.publisher.unconfirmed_count == 0
+
+
+def test_async_consumer_rejects_malformed_message(broker, calls, monkeypatch):
+    monkeypatch.setattr(main, "PUBLISHER_CONFIRMS", "true")
+    broker.enqueue(main.INPUT_QUEUE, b"{not json")
+
+    _, ch = run_async(broker)
+
+    assert broker.published == []
+    assert calls == [("nack", 1, False)]
+    assert ch.unacked_count == 0
+    assert not broker.queues[main.INPUT_QUEUE]
+
+
+def test_broker_nack_requeues_input_and_redelivery_is_published(broker, write_source, calls, monkeypatch):
+    monkeypatch.setattr(main, "PUBLISHER_CONFIRMS", "true")
+    broker.enqueue(main.INPUT_QUEUE, submission("n1", write_source("n1.py", "x = 1\n")))
+
+    def nack_first_publish(consumer, ch):
+        confirm = ch._confirm_callback
+        frames = iter(["Basic.Nack"])
+
+        def _on_confirm(frame):
+            frame.method.NAME = next(frames, frame.method.NAME)
+            confirm(frame)
+
+        ch._confirm_callback = _on_confirm
+
+    _, ch = run_async(broker, on_start=nack_first_publish)
+
+    assert [json.loads(p.body)["submissionId"] for p in broker.published] == ["n1", "n1"]
+    assert calls[0] == ("nack", 1, True)
+    assert calls[1][:2] == ("ack", 2)
+    assert ch.unacked_count == 0
+    assert not broker.queues[main.INPUT_QUEUE]
+
+
+def test_async_lanes_run_interactive_before_queued_bulk(broker, write_source, calls, monkeypatch):
+    monkeypatch.setattr(main, "PRIORITY_LANES", True)
+    monkeypatch.setattr(main, "PUBLISHER_CONFIRMS", "true")
+    for i in range(6):
+        broker.enqueue(main.INPUT_QUEUE, submission(f"b{i}", write_source(f"b{i}.py", "x = 1\n"), Priority="low"))
+    broker.enqueue(main.INPUT_QUEUE, submission("i0", write_source("i0.py", "x = 1\n"), Priority="high"))
+
+    consumer, ch = run_async(broker, prefetch=16)
+
+    order = [json.loads(p.body)["submissionId"] for p in broker.published]
+    assert sorted(order) == ["b0", "b1", "b2", "b3", "b4", "b5", "i0"]
+    # Tek lint yuvası: ilk bulk iş zaten başlamıştır, etkileşimli mesaj hemen arkasından gelir.
+    assert order.index("i0") == 1
+    assert len(consumer.lanes) == 0
+    assert ch.unacked_count == 0
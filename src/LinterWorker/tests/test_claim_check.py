@@ -0,0 +1,81 @@
+import pytest
+
+import main
+from claim_check import RESULTS_REF, ResultStore, check_out, load_details, resolve
+from conftest import consume_blocking, published_events, submission
+from event_codec import CONTENT_TYPE_COMPACT_MSGPACK
+
+NOISY_SOURCE = "".join(f"v{i}=1\n" for i in range(50))
+
+
+@pytest.fixture
+def offload(tmp_path, monkeypatch):
+    directory = tmp_path / "lint-results"
+    monkeypatch.setattr(main, "CLAIM_CHECK_BYTES", 256)
+    monkeypatch.setattr(main, "CLAIM_CHECK_DIR", str(directory))
+    monkeypatch.setattr(main, "READ_AHEAD_THREADS", 0)
+    return directory
+
+
+def test_small_event_is_not_offloaded(tmp_path):
+    event = {"submissionId": "k1", "results": [{"code": "F401"}]}
+    assert check_out(event, ResultStore(str(tmp_path)), 4096) is event
+
+
+def test_check_out_and_resolve_round_trip(tmp_path):
+    results = [{"file": "a.py", "code": "E225", "line": i} for i in range(100)]
+    event = {"submissionId": "k2", "issueCount": 100, "results": results}
+
+    slim = check_out(event, ResultStore(str(tmp_path)), 256)
+
+    assert "results" not in slim and slim["issueCount"] == 100
+    assert slim[RESULTS_REF]["key"].startswith(slim[RESULTS_REF]["sha256"][:2] + "/")
+    assert resolve(slim) == event
+    # Aynı içerik aynı blob'a yazılır; referanslı event yeniden taşınmaz.
+    assert check_out(event, ResultStore(str(tmp_path)), 256)[RESULTS_REF] == slim[RESULTS_REF]
+    assert check_out(slim, ResultStore(str(tmp_path)), 256) is slim
+
+
+def test_tampered_blob_is_rejected(tmp_path):
+    import gzip
+
+    event = {"submissionId": "k3", "results": [{"code": "E225", "line": i} for i in range(100)]}
+    slim = check_out(event, ResultStore(str(tmp_path)), 256)
+    with open(slim[RESULTS_REF]["path"], "wb") as f:
+        f.write(gzip.compress(b'{"results": []}'))
+
+    with pytest.raises(ValueError):
+        load_details(slim)
+
+
+@pytest.mark.parametrize("content_type", ["application/json", CONTENT_TYPE_COMPACT_MSGPACK])
+def test_published_event_references_offloaded_results(broker, write_source, offload, monkeypatch, content_type):
+    monkeypatch.setattr(main, "EVENT_CONTENT_TYPE", content_type)
+    path = write_source("noisy.py", NOISY_SOURCE)
+    broker.enqueue(main.INPUT_QUEUE, submission("k4", path))
+
+    ch = consume_blocking(broker, main.process_message)
+
+    event = published_events(broker)["k4"]
+    assert "results" not in event
+    assert event["issueCount"] == event["errorCount"] == 50
+    assert event[RESULTS_REF]["path"].startswith(str(offload))
+    details = load_details(event, base_dir=str(offload))
+    assert [r["code"] for r in details["results"]] == ["E225"] * 50
+    assert ch.unacked_count == 0
+
+
+def test_unwritable_store_publishes_inline(broker, write_source, tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(main, "CLAIM_CHECK_BYTES", 256)
+    monkeypatch.setattr(main, "CLAIM_CHECK_DIR", str(blocker / "lint-results"))
+    monkeypatch.setattr(main, "READ_AHEAD_THREADS", 0)
+    broker.enqueue(main.INPUT_QUEUE, submission("k5", write_source("noisy.py", NOISY_SOURCE)))
+
+    ch = consume_blocking(broker, main.process_message)
+
+    event = published_events(broker)["k5"]
+    assert RESULTS_REF not in event
+    assert len(event["results"]) == 50
+    assert ch.unacked_count == 0
@@ -0,0 +1,71 @@
+import builtins
+import os
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def dedupe(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DEDUPE_DB", str(tmp_path / "dedupe.sqlite3"))
+    monkeypatch.setattr(main, "_dedupe_index", None)
+    monkeypatch.setattr(main, "READ_AHEAD_THREADS", 0)
+    yield
+    if main._dedupe_index is not None:
+        main._dedupe_index.close()
+
+
+@pytest.fixture
+def opens(monkeypatch):
+    """Yol -> builtins.open ile açılma sayısı."""
+    counts = {}
+    real_open = builtins.open
+
+    def counting_open(file, *args, **kwargs):
+        if isinstance(file, str):
+            counts[file] = counts.get(file, 0) + 1
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    return counts
+
+
+def test_stored_file_is_read_once_and_replayed(dedupe, write_source, opens):
+    path = write_source("a.py", "x=1\n")
+    msg = {"SubmissionId": "d1", "FilePath": path}
+
+    first = main.lint_submission(msg, {})
+    assert opens[path] == 1
+
+    stats = {}
+    assert main.lint_submission(msg, stats) == first
+    assert stats["duplicate"]
+
+
+def test_same_size_rewrite_with_same_mtime_is_linted_again(dedupe, write_source):
+    path = write_source("a.py", "x=1\n")
+    msg = {"SubmissionId": "d2", "FilePath": path}
+    main.lint_submission(msg, {})
+
+    st = os.stat(path)
+    with open(path, "w") as f:
+        f.write("y = 1\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    stats = {}
+    event = main.lint_submission(msg, stats)
+    assert not stats.get("duplicate")
+    assert [r["code"] for r in event["results"]] == ["W000"]
+
+
+def test_batch_reads_each_file_once_for_key_and_cache(dedupe, write_source, opens):
+    paths = [write_source(f"b{i}.py", f"v{i}=1\n") for i in range(3)]
+    msgs = [{"SubmissionId": f"b{i}", "FilePath": p} for i, p in enumerate(paths)]
+
+    events = main.lint_submissions_batch(msgs)
+    assert [[r["code"] for r in e["results"]] for e in events] == [["E225"]] * 3
+    assert all(opens[p] == 1 for p in paths)
+
+    again = main.lint_submissions_batch(msgs)
+    assert again == events
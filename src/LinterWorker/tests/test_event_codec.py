@@ -0,0 +1,68 @@
+import pytest
+
+import main
+from conftest import consume_blocking, published_events, submission
+from event_codec import (
+    CONTENT_TYPE_COMPACT_JSON,
+    CONTENT_TYPE_COMPACT_MSGPACK,
+    CONTENT_TYPE_JSON,
+    decode_event,
+    encode_event,
+    from_columnar,
+    to_columnar,
+)
+
+ALL_TYPES = [CONTENT_TYPE_JSON, CONTENT_TYPE_COMPACT_JSON, CONTENT_TYPE_COMPACT_MSGPACK]
+
+RESULTS = [
+    {"file": "a.py", "code": "F401", "message": "'os' imported but unused", "line": 1, "column": 1,
+     "severity": "error"},
+    {"file": "a.py", "code": "E225", "message": "missing whitespace around operator", "line": 3, "column": 2,
+     "severity": "warning"},
+    {"file": "b.py", "code": "E225", "message": "missing whitespace around operator", "line": 7, "column": 4,
+     "severity": "warning"},
+]
+
+
+def test_columnar_interns_strings_and_round_trips():
+    table = to_columnar(RESULTS)
+    assert table["strings"].count("E225") == 1
+    assert table["strings"].count("a.py") == 1
+    assert from_columnar(table) == RESULTS
+    assert from_columnar(to_columnar([])) == []
+
+
+def test_columnar_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        from_columnar({"format": "rows-v0"})
+
+
+@pytest.mark.parametrize("content_type", ALL_TYPES)
+def test_event_round_trips(content_type):
+    event = {"submissionId": "c1", "issueCount": 3, "results": RESULTS}
+    body, ctype, encoding = encode_event(event, content_type)
+    assert decode_event(body, ctype, encoding) == event
+
+
+@pytest.mark.parametrize("content_type", ALL_TYPES)
+def test_event_without_results_stays_without_results(content_type):
+    event = {"submissionId": "c2", "issueCount": 3, "resultsRef": {"key": "ab/ab.json.gz"}}
+    body, ctype, encoding = encode_event(event, content_type)
+    assert "results" not in decode_event(body, ctype, encoding)
+
+
+@pytest.mark.parametrize("content_type", ALL_TYPES)
+def test_published_events_carry_their_format(broker, write_source, monkeypatch, content_type):
+    monkeypatch.setattr(main, "EVENT_CONTENT_TYPE", content_type)
+    monkeypatch.setattr(main, "READ_AHEAD_THREADS", 0)
+    broker.enqueue(main.INPUT_QUEUE, submission("c3", write_source("c3.py", "import os\nx=1\n")))
+
+    ch = consume_blocking(broker, main.process_message)
+
+    (published,) = broker.published
+    assert published.properties.content_type == content_type
+    assert published.properties.content_encoding == ("gzip" if content_type == CONTENT_TYPE_COMPACT_JSON else None)
+    event = published_events(broker)["c3"]
+    assert [r["code"] for r in event["results"]] == ["F401", "E225"]
+    assert event["issueCount"] == 2
+    assert ch.unacked_count == 0
@@ -0,0 +1,44 @@
+import main
+from conftest import consume_blocking, published_events, submission
+from issue_summary import summarize_issues
+
+
+def issue(code, line, file="a.py"):
+    return {"file": file, "code": code, "message": code, "line": line, "column": 1, "severity": "warning"}
+
+
+def test_results_below_threshold_are_untouched():
+    results = [issue("E225", i) for i in range(5)]
+    assert summarize_issues(results, threshold=5, keep=2) == (results, [])
+    assert summarize_issues(results, threshold=0, keep=2) == (results, [])
+
+
+def test_only_codes_over_threshold_are_grouped():
+    results = [issue("E225", i) for i in range(10, 0, -1)] + [issue("F401", 1), issue("E225", 4, file="b.py")]
+
+    kept, groups = summarize_issues(results, threshold=3, keep=2)
+
+    assert kept == results[:2] + results[-2:]
+    assert groups == [{
+        "file": "a.py", "code": "E225", "message": "E225", "severity": "warning",
+        "count": 10, "shown": 2, "firstLine": 1, "lastLine": 10,
+    }]
+
+
+def test_published_event_counts_are_exact_after_grouping(broker, write_source, monkeypatch):
+    monkeypatch.setattr(main, "ISSUE_GROUP_THRESHOLD", 3)
+    monkeypatch.setattr(main, "ISSUE_GROUP_KEEP", 2)
+    monkeypatch.setattr(main, "READ_AHEAD_THREADS", 0)
+    source = "import os\n" + "".join(f"v{i}=1\n" for i in range(10))
+    broker.enqueue(main.INPUT_QUEUE, submission("g1", write_source("g1.py", source)))
+
+    ch = consume_blocking(broker, main.process_message)
+
+    event = published_events(broker)["g1"]
+    assert event["issueCount"] == 11
+    assert [r["code"] for r in event["results"]] == ["F401", "E225", "E225"]
+    assert event["truncated"] is True
+    assert event["omittedIssueCount"] == 8
+    (group,) = event["issueGroups"]
+    assert (group["code"], group["count"], group["firstLine"], group["lastLine"]) == ("E225", 10, 2, 11)
+    assert ch.unacked_count == 0
@@ -0,0 +1,57 @@
+import json
+
+import main
+from lanes import LANE_BULK, LANE_INTERACTIVE, WeightedLanes, classify_submission
+
+
+def test_classify_prefers_explicit_priority_then_size(write_source):
+    small = write_source("small.py", "x = 1\n")
+    assert classify_submission({"FilePath": small}, 1024) == LANE_INTERACTIVE
+    assert classify_submission({"FilePath": small, "Priority": "low"}, 1024) == LANE_BULK
+    assert classify_submission({"FilePath": small}, 2) == LANE_BULK
+    assert classify_submission({"Content": "x = 1\n", "Priority": "high"}, 2) == LANE_INTERACTIVE
+    assert classify_submission({"FilePath": "/missing/file.py"}, 1024) == LANE_BULK
+
+
+def test_weighted_round_robin_interleaves_lanes():
+    lanes = WeightedLanes({LANE_INTERACTIVE: 4, LANE_BULK: 1})
+    for i in range(10):
+        lanes.push(LANE_INTERACTIVE, f"i{i}")
+        lanes.push(LANE_BULK, f"b{i}")
+
+    picked = [lanes.pop()[0] for _ in range(10)]
+
+    assert picked.count(LANE_INTERACTIVE) == 8
+    assert picked.count(LANE_BULK) == 2
+    # Tek dolu şerit kalınca tüm kapasite onundur.
+    rest = [lanes.pop() for _ in range(10)]
+    assert [lane for lane, _ in rest] == [LANE_INTERACTIVE, LANE_INTERACTIVE] + [LANE_BULK] * 8
+    assert lanes.pop() is None
+
+
+def test_lane_consumer_lints_interactive_before_queued_bulk(broker, write_source, monkeypatch):
+    monkeypatch.setattr(main, "READ_AHEAD_THREADS", 0)
+    for i in range(5):
+        broker.enqueue(main.INPUT_QUEUE, json.dumps({
+            "SubmissionId": f"b{i}", "FilePath": write_source(f"b{i}.py", "x = 1\n"), "Priority": "low"
+        }).encode())
+    broker.enqueue(main.INPUT_QUEUE, b"{not json")
+    broker.enqueue(main.INPUT_QUEUE, json.dumps({
+        "SubmissionId": "i0", "FilePath": write_source("i0.py", "x = 1\n")
+    }).encode())
+
+    conn = broker.connection()
+    ch = conn.channel()
+    consumer = main.LaneConsumer(conn, ch, concurrency=1)
+    ch.basic_consume(queue=main.INPUT_QUEUE, on_message_callback=consumer.on_message)
+    for _ in range(200):
+        conn.process_data_events(time_limit=0.05)
+        if not ch.unacked_count:
+            break
+
+    order = [json.loads(p.body)["submissionId"] for p in broker.published]
+    assert order.index("i0") == 1
+    assert sorted(order) == ["b0", "b1", "b2", "b3", "b4", "i0"]
+    assert len(consumer.lanes) == 0 and consumer.in_flight == 0
+    assert ch.unacked_count == 0
+    assert not broker.queues[main.INPUT_QUEUE]
@@ -0,0 +1,34 @@
+import os
+
+import main
+from lint_cache import LintResultCache, make_cache_key
+
+
+def test_unwritable_directory_falls_back_to_memory(tmp_path, capsys):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    cache = LintResultCache(max_entries=8, directory=str(blocker / "cache"))
+
+    assert cache.directory is None
+    assert "in-memory cache only" in capsys.readouterr().out
+    cache.put("k", [{"file": "a.py", "code": "E225"}])
+    assert cache.get("k", "b.py") == [{"file": "b.py", "code": "E225"}]
+
+
+def test_batch_and_single_lint_survive_unwritable_cache_dir(tmp_path, write_source, monkeypatch):
+    blocker = tmp_path / "storage"
+    blocker.write_text("")
+    monkeypatch.setattr(main, "LINT_CACHE_DIR", str(blocker / ".lint-cache"))
+    monkeypatch.setattr(main, "_lint_cache", None)
+    path = write_source("a.py", "x=1\n")
+
+    assert [r["code"] for r in main.run_flake8(path)] == ["E225"]
+    assert [r["code"] for r in main.run_flake8_batch([path])[path]] == ["E225"]
+    assert main.get_lint_cache() is main.get_lint_cache()
+
+
+def test_results_persist_across_instances(tmp_path):
+    key = make_cache_key(b"x=1\n", "fp")
+    LintResultCache(directory=str(tmp_path)).put(key, [{"file": "a.py", "code": "E225"}])
+    assert os.path.exists(tmp_path / key[:2] / f"{key}.json")
+    assert LintResultCache(directory=str(tmp_path)).get(key, "c.py") == [{"file": "c.py", "code": "E225"}]
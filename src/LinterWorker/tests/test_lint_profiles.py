@@ -0,0 +1,18 @@
+import pytest
+
+import main
+from conftest import SYNTAX_ERROR_SOURCE
+
+
+@pytest.mark.parametrize("profile", ["fast", "standard", "full"])
+def test_syntax_error_is_reported_under_every_profile(write_source, profile):
+    path = write_source("broken.py", SYNTAX_ERROR_SOURCE)
+    event = main.lint_submission({"SubmissionId": "s1", "FilePath": path, "LintProfile": profile})
+    assert [r["code"] for r in event["results"]] == ["E999"]
+    assert event["errorCount"] == 1
+
+
+def test_fast_profile_runs_only_pyflakes(write_source):
+    path = write_source("a.py", "import os\nx=1\n")
+    results = main.run_flake8(path, profile="fast")
+    assert [r["code"] for r in results] == ["F401"]
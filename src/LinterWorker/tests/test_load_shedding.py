@@ -0,0 +1,46 @@
+import pytest
+
+import main
+from conftest import SYNTAX_ERROR_SOURCE, consume_blocking, published_events, submission
+from load_shedder import LoadShedder
+
+
+@pytest.fixture
+def degraded(monkeypatch):
+    shedder = LoadShedder(depth_threshold=10)
+    shedder.observe_depth(50)
+    assert shedder.degraded
+    monkeypatch.setattr(main, "load_shedder", shedder)
+    return shedder
+
+
+def test_shed_syntax_error_submission_still_reports_e999(broker, write_source, degraded):
+    path = write_source("broken.py", SYNTAX_ERROR_SOURCE)
+    broker.enqueue(main.INPUT_QUEUE, submission("s1", path, LintProfile="full"))
+
+    ch = consume_blocking(broker, main.process_message)
+
+    event = published_events(broker)["s1"]
+    assert event["degraded"] is True
+    assert event["profile"] == main.SHED_PROFILE
+    assert event["requestedProfile"] == "full"
+    assert [r["code"] for r in event["results"]] == ["E999"]
+    assert ch.unacked_count == 0
+
+
+def test_shed_batch_reports_e999(write_source, degraded):
+    broken = write_source("broken.py", SYNTAX_ERROR_SOURCE)
+    clean = write_source("clean.py", "x = 1\n")
+    msgs = [{"SubmissionId": "b1", "FilePath": broken}, {"SubmissionId": "b2", "FilePath": clean}]
+
+    broken_event, clean_event = main.lint_submissions_batch(msgs, main.current_shed_profile())
+
+    assert [r["code"] for r in broken_event["results"]] == ["E999"]
+    assert broken_event["degraded"] is True
+    assert [r["code"] for r in clean_event["results"]] == ["W000"]
+
+
+def test_shedding_recovers_below_threshold(degraded):
+    degraded.observe_depth(2)
+    assert not degraded.degraded
+    assert main.current_shed_profile() is None
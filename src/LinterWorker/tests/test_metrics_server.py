@@ -0,0 +1,35 @@
+import socket
+import urllib.request
+
+import main
+
+
+def test_metrics_server_is_off_by_default(monkeypatch):
+    monkeypatch.setattr(main, "METRICS_PORT", 0)
+    assert main._start_metrics_server() is None
+
+
+def test_taken_port_does_not_stop_the_worker(monkeypatch, capsys):
+    with socket.socket() as taken:
+        taken.bind(("0.0.0.0", 0))
+        taken.listen()
+        monkeypatch.setattr(main, "METRICS_PORT", taken.getsockname()[1])
+
+        assert main._start_metrics_server() is None
+
+    assert "continuing without /metrics" in capsys.readouterr().out
+
+
+def test_metrics_are_served_on_a_free_port(monkeypatch):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    monkeypatch.setattr(main, "METRICS_PORT", port)
+
+    server = main._start_metrics_server()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert response.status == 200
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+
+from fake_broker import FakeBroker
+from publisher import ConfirmedPublisher, MultiAckTracker
+
+
+def confirm(tag, multiple=False, name="Basic.Ack"):
+    return SimpleNamespace(method=SimpleNamespace(NAME=name, delivery_tag=tag, multiple=multiple))
+
+
+def test_tracker_acks_prefix_once_and_done_tags_past_a_gap_singly():
+    acks = MultiAckTracker()
+    for tag in (1, 2, 4, 5):
+        acks.mark_done(tag)
+
+    assert acks.pop_ackable() == (2, [4, 5])
+
+    acks.mark_done(3)
+    # 4 ve 5 zaten tek tek ack'lendi; önek 5'e kadar ilerler ama yeniden ack'lenmez.
+    assert acks.pop_ackable() == (3, [])
+    acks.mark_done(6)
+    assert acks.pop_ackable() == (6, [])
+
+
+def test_tracker_discarded_head_does_not_block_prefix():
+    acks = MultiAckTracker()
+    acks.discard(1)
+    acks.mark_done(2)
+    assert acks.pop_ackable() == (2, [])
+    # Sonuçlanmış bir tag'in ikinci kez işaretlenmesi yok sayılır.
+    acks.mark_done(2)
+    assert acks.pop_ackable() == (None, [])
+
+
+@pytest.fixture
+def channel():
+    """Dört teslimatı ack'lenmemiş bekleyen, confirm çerçeveleri elle verilen bir kanal."""
+    fake = FakeBroker()
+    for i in range(4):
+        fake.enqueue("in", f"m{i}".encode())
+    conn = fake.connection()
+    ch = conn.channel()
+    ch.frames = []
+    ch.confirm_delivery(ack_nack_callback=ch.frames.append)
+    ch.basic_consume(queue="in", on_message_callback=lambda *_: None)
+    conn.process_data_events()
+    assert ch.unacked_count == 4
+
+    ch.acked = []
+    real_ack = ch.basic_ack
+
+    def basic_ack(delivery_tag=0, multiple=False):
+        ch.acked.append((delivery_tag, multiple))
+        real_ack(delivery_tag=delivery_tag, multiple=multiple)
+
+    ch.basic_ack = basic_ack
+    ch.fake = fake
+    return ch
+
+
+def test_publisher_acks_inputs_only_after_confirm(channel):
+    scheduled = []
+    publisher = ConfirmedPublisher(channel, lambda delay, fn: scheduled.append(fn), max_pending=64)
+
+    # Girdi 1 hâlâ işleniyor; 2 ve 3'ün çıktıları yayınlandı.
+    publisher.publish("out", "lint.completed", b"2", None, delivery_tag=2)
+    publisher.publish("out", "lint.completed", b"3", None, delivery_tag=3)
+    assert channel.acked == []
+    assert publisher.unconfirmed_count == 2
+
+    publisher.on_confirm(confirm(2, multiple=True))
+    assert publisher.unconfirmed_count == 0
+    assert len(scheduled) == 1
+    scheduled.pop()()
+    assert channel.acked == [(2, False), (3, False)]
+
+    publisher.publish("out", "lint.completed", b"1", None, delivery_tag=1)
+    publisher.publish("out", "lint.completed", b"4", None, delivery_tag=4)
+    publisher.on_confirm(confirm(3))
+    publisher.on_confirm(confirm(4))
+    scheduled.pop()()
+    assert channel.acked[2:] == [(4, True)]
+    assert channel.unacked_count == 0
+    assert [p.body for p in channel.fake.published] == [b"2", b"3", b"1", b"4"]
+
+
+def test_publisher_flushes_when_max_pending_reached(channel):
+    scheduled = []
+    publisher = ConfirmedPublisher(channel, lambda delay, fn: scheduled.append(fn), max_pending=2)
+    for tag in (1, 2):
+        publisher.publish("out", "lint.completed", b"x", None, delivery_tag=tag)
+
+    publisher.on_confirm(confirm(2, multiple=True))
+
+    assert channel.acked == [(2, True)]
+    assert scheduled == []
+
+
+def test_broker_nack_requeues_the_input(channel):
+    publisher = ConfirmedPublisher(channel, lambda delay, fn: fn())
+    publisher.publish("out", "lint.completed", b"1", None, delivery_tag=1)
+    publisher.publish("out", "lint.completed", b"2", None, delivery_tag=2)
+
+    publisher.on_confirm(confirm(1, name="Basic.Nack"))
+    publisher.on_confirm(confirm(2))
+
+    assert channel.acked == [(2, True)]
+    assert channel.unacked_count == 2
+    requeued = channel.fake.queues["in"][0]
+    assert requeued.body == b"m0" and requeued.redelivered
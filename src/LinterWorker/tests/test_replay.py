@@ -0,0 +1,57 @@
+import json
+import os
+import tarfile
+
+import pytest
+
+import main
+import replay
+
+
+@pytest.fixture
+def archive(tmp_path, write_source):
+    """Satır içi, anlık görüntülü ve dosyası kayıp üç gönderim ile baseline'ı olan bir kayıt arşivi."""
+    stored = write_source("stored/app.py", "import os\n")
+    messages = [
+        {"SubmissionId": "inline", "Language": "python", "Content": "import sys\nx=1\n"},
+        {"SubmissionId": "stored", "Language": "python", "FilePath": stored},
+        {"SubmissionId": "gone", "Language": "python", "FilePath": "/app/storage/gone.py"},
+    ]
+    root = tmp_path / "recording"
+    (root / "files").mkdir(parents=True)
+    manifest, baseline = [], []
+    for i, msg in enumerate(messages):
+        snapshot = replay._snapshot(msg.get("FilePath"), str(root / "files"))
+        manifest.append({"offset": i * 0.01, "message": msg, "snapshot": snapshot})
+        baseline.append(main.lint_submission(dict(msg), {}))
+    (root / replay.MANIFEST).write_text("".join(json.dumps(e) + "\n" for e in manifest))
+    (root / replay.BASELINE).write_text("".join(json.dumps(e) + "\n" for e in baseline))
+
+    path = tmp_path / "traffic.tar.gz"
+    with tarfile.open(path, "w:gz") as tf:
+        for name in (replay.MANIFEST, replay.BASELINE, "files"):
+            tf.add(root / name, arcname=name)
+    return str(path)
+
+
+def test_inline_message_is_replayed_without_file_path(archive, tmp_path):
+    workdir = str(tmp_path / "replay")
+    schedule = {sid: msg for _, sid, msg in replay.load_schedule(archive, workdir, fast=True)}
+
+    assert "FilePath" not in schedule["inline"]
+    assert schedule["stored"]["FilePath"].startswith(os.path.join(workdir, "files"))
+    assert schedule["gone"]["FilePath"] == os.path.join(workdir, "missing", "gone.py")
+
+
+def test_replay_matches_baseline(archive, monkeypatch):
+    monkeypatch.setattr(main, "READ_AHEAD_THREADS", 0)
+    # run_schedule bu ayarları değiştirir; sonraki testler için geri alınsın.
+    monkeypatch.setattr(main, "PREFETCH_COUNT", main.PREFETCH_COUNT)
+    monkeypatch.setattr(main, "LINT_POOL_SIZE", main.LINT_POOL_SIZE)
+
+    result = replay.replay(archive, fast=True, timeout=60)
+
+    assert result["completed"] == 3
+    comparison = result["comparison"]
+    assert comparison["matched"] == 3, comparison["diffs"]
+    assert comparison["different"] == 0